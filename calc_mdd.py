@@ -1,11 +1,10 @@
-import yfinance as yf
 import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime
+from data_source import ticker_frame
+from ohlcv_store import OHLCVStore
 
-# 한글 폰트 설정 (macOS)
-import matplotlib
-matplotlib.rc('font', family='AppleGothic')
+from plot_style import setup_fonts
 
 
 def calc_mdd(series):
@@ -36,8 +35,7 @@ def yearly_mdd(series):
 
 def main():
     ticker = input('티커를 입력하세요: ').strip()
-    stock = yf.Ticker(ticker)
-    hist = stock.history(period="max")
+    hist = ticker_frame(OHLCVStore().panel([ticker]), ticker)
     if hist.empty:
         print('데이터가 없습니다.')
         return
@@ -57,6 +55,7 @@ def main():
     print(f"최고점(최대 낙폭) MDD: {max_mdd:.2f}%")
 
     # 일별 MDD 선그래프 시각화 및 이미지 저장
+    setup_fonts()
     plt.figure(figsize=(12,6))
     plt.plot(mdd_daily.index, mdd_daily.values, color='#1976d2', linewidth=1.5, label='일별 MDD')
     plt.axhline(avg_mdd, color='#ffa726', linestyle='--', linewidth=1.2, label=f'평균 MDD ({avg_mdd:.2f}%)')
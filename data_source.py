@@ -0,0 +1,229 @@
+import contextlib
+import os
+import threading
+import time
+import pandas as pd
+
+# ==========================================
+# [설정] 시세 데이터 소스
+# DATA_SOURCE=yfinance (기본) | fixture
+# FIXTURE_DIR=fixture CSV 폴더 (fixture 모드에서만 사용)
+# ==========================================
+PRICE_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+DOWNLOAD_CHUNK_SIZE = 50   # yf.download 1회에 묶어서 요청할 최대 티커 수
+REQUEST_TIMEOUT = 20       # yf.download HTTP 요청 타임아웃(초): 조회 스레드가 멈춰 있지 않고 반드시 돌아오도록
+# ==========================================
+
+# yfinance period 문자열 → 기간(pandas offset)
+_PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+
+def period_start(period, end=None):
+    """yfinance period 문자열을 시작일로 변환 ('max'면 None)"""
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.now().normalize()
+    if period in (None, 'max'):
+        return None
+    if period == 'ytd':
+        return pd.Timestamp(end.year, 1, 1)
+    return end - _PERIOD_OFFSETS[period]
+
+
+def normalize_panel(df, tickers):
+    """다운로드 결과를 (필드, 티커) 2단 컬럼 + tz 없는 날짜 인덱스 패널로 정리"""
+    tickers = list(tickers)
+    if df is None or df.empty:
+        columns = pd.MultiIndex.from_product([PRICE_FIELDS, tickers])
+        return pd.DataFrame(columns=columns, index=pd.DatetimeIndex([]), dtype=float)
+
+    if not isinstance(df.columns, pd.MultiIndex):
+        # 단일 티커 다운로드는 1단 컬럼으로 올 수 있음
+        df = pd.concat({tickers[0]: df}, axis=1).swaplevel(0, 1, axis=1)
+    elif not df.columns.get_level_values(0).isin(PRICE_FIELDS + ['Adj Close']).any():
+        # group_by='ticker' 형태 → (필드, 티커)로 뒤집기
+        df = df.swaplevel(0, 1, axis=1)
+
+    df.index = pd.DatetimeIndex(df.index)
+    if df.index.tz is not None:
+        df.index = df.index.tz_localize(None)
+    df.index = df.index.normalize()
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+
+    columns = pd.MultiIndex.from_product([PRICE_FIELDS, tickers])
+    panel = df.reindex(columns=columns)
+    panel.columns.names = [None, None]
+    # 모든 티커가 비어 있는 날짜(휴장일 등)는 제거
+    return panel.dropna(how='all')
+
+
+class DataSourceError(Exception):
+    """다운로드 실패 (status: HTTP 상태코드, 알 수 없으면 None)"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class DataSource:
+    """여러 티커의 OHLCV를 한 번의 요청으로 받아 (필드, 티커) 패널로 돌려주는 인터페이스"""
+    name = 'base'
+    rate_limited = True   # 원격 요청 한도를 지켜야 하는 소스인지 (False 면 스케줄러 토큰 버킷 없이 조회)
+
+    def __init__(self):
+        self.request_count = 0
+
+    def download(self, tickers, period=None, start=None, end=None):
+        raise NotImplementedError
+
+    def info(self, ticker):
+        """종목 메타데이터 dict (실패는 예외로 올림)"""
+        raise NotImplementedError
+
+
+_yf_lock = threading.Lock()
+
+
+def _download_lock(yf):
+    """yf.download 동시 호출 잠금
+
+    yfinance 1.x 는 호출마다 결과/오류를 따로 모으지만(multi._DownloadCtx), 그 이전 버전은 모듈 전역(_DFS/_ERRORS)을
+    호출마다 초기화해 함께 쓰므로 여러 스레드가 동시에 부르면 서로의 결과가 섞임 → 그때만 한 번에 하나씩
+    """
+    if hasattr(getattr(yf, 'multi', None), '_DownloadCtx'):
+        return contextlib.nullcontext()
+    return _yf_lock
+
+
+class YFinanceSource(DataSource):
+    """yf.download 한 번으로 여러 티커를 받아오는 기본 소스"""
+    name = 'yfinance'
+
+    def download(self, tickers, period=None, start=None, end=None):
+        import yfinance as yf
+        tickers = list(tickers)
+        self.request_count += 1
+        kwargs = {'start': start, 'end': end} if start is not None else {'period': period or 'max'}
+        with _download_lock(yf):
+            df = yf.download(tickers, group_by='column', auto_adjust=True,
+                             progress=False, threads=True, timeout=REQUEST_TIMEOUT, **kwargs)
+        # yf.download 는 실패해도 예외 없이 빈 열만 돌려주므로 받은 표에서 실패를 판단
+        panel = normalize_panel(df, tickers)
+        failed = [t for t in tickers if panel['Close'][t].isna().all()]
+        if len(failed) == len(tickers):
+            # 모든 티커가 비었으면 요청 한도/일시 장애로 보고 스케줄러가 백오프 후 재시도하도록 예외로 올림
+            raise DataSourceError(f"빈 응답: {', '.join(tickers)}", status=503)
+        if failed:
+            print(f"데이터를 받지 못한 티커: {', '.join(failed)}")
+        return panel
+
+    def info(self, ticker):
+        import yfinance as yf
+        self.request_count += 1
+        return yf.Ticker(ticker).info or {}
+
+
+class FixtureSource(DataSource):
+    """fixture_dir/<티커>.csv 를 읽어 yfinance와 같은 모양으로 돌려주는 오프라인 대체 소스
+
+    latency: 요청 1회당 왕복 지연(초)을 흉내내어 일괄 다운로드 효과를 오프라인에서 측정
+    """
+    name = 'fixture'
+    rate_limited = False
+
+    def __init__(self, fixture_dir='fixtures', latency=0.0):
+        super().__init__()
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self._frames = {}
+        self._meta = None
+
+    def _load(self, ticker):
+        if ticker not in self._frames:
+            path = os.path.join(self.fixture_dir, f"{ticker}.csv")
+            if os.path.exists(path):
+                self._frames[ticker] = pd.read_csv(path, index_col=0, parse_dates=True)
+            else:
+                self._frames[ticker] = None
+        return self._frames[ticker]
+
+    def download(self, tickers, period=None, start=None, end=None):
+        tickers = list(tickers)
+        self.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        frames = {}
+        for ticker in tickers:
+            df = self._load(ticker)
+            if df is None or df.empty:
+                continue
+            stop = pd.Timestamp(end) if end is not None else df.index[-1] + pd.Timedelta(days=1)
+            begin = pd.Timestamp(start) if start is not None else period_start(period, df.index[-1])
+            mask = df.index < stop
+            if begin is not None:
+                mask &= df.index >= begin
+            frames[ticker] = df.loc[mask, [c for c in PRICE_FIELDS if c in df.columns]]
+
+        if not frames:
+            return normalize_panel(None, tickers)
+        df = pd.concat(frames, axis=1).swaplevel(0, 1, axis=1)
+        return normalize_panel(df, tickers)
+
+    def info(self, ticker):
+        """fixture_dir/ticker_meta.json 의 {티커: 메타데이터} 에서 읽음"""
+        if self._meta is None:
+            import json
+            try:
+                with open(os.path.join(self.fixture_dir, 'ticker_meta.json'), 'r', encoding='utf-8') as f:
+                    self._meta = json.load(f)
+            except (OSError, ValueError):
+                self._meta = {}
+        if ticker not in self._meta:
+            raise DataSourceError(f"fixture 메타데이터 없음: {ticker}")
+        return self._meta[ticker]
+
+
+def get_data_source():
+    """환경변수 DATA_SOURCE 에 맞는 데이터 소스 생성"""
+    if os.getenv('DATA_SOURCE', 'yfinance').lower() == 'fixture':
+        return FixtureSource(os.getenv('FIXTURE_DIR', 'fixtures'))
+    return YFinanceSource()
+
+
+def fetch_panel(tickers, period='1y', source=None, chunk_size=DOWNLOAD_CHUNK_SIZE, start=None):
+    """모든 티커를 chunk_size 단위로 묶어 내려받고, 날짜가 정렬된 하나의 패널로 합침
+
+    start 를 주면 period 대신 start 이후 구간만 받음
+    """
+    source = source or get_data_source()
+    tickers = list(dict.fromkeys(tickers))  # 순서 유지 중복 제거
+    parts = [source.download(tickers[i:i + chunk_size], period=period, start=start)
+             for i in range(0, len(tickers), chunk_size)]
+    if not parts:
+        return normalize_panel(None, [])
+    panel = pd.concat(parts, axis=1).sort_index()
+    return panel.reindex(columns=pd.MultiIndex.from_product([PRICE_FIELDS, tickers]))
+
+
+def ticker_frame(panel, ticker):
+    """패널에서 한 티커의 OHLCV만 꺼내 yfinance history()와 같은 모양으로 반환"""
+    if ticker not in panel.columns.get_level_values(1):
+        return pd.DataFrame(columns=PRICE_FIELDS)
+    return panel.xs(ticker, axis=1, level=1).dropna(how='all')
+
+
+def slice_period(panel, period, end=None):
+    """전체 기간 패널에서 yfinance period 와 같은 최근 구간만 잘라냄"""
+    begin = period_start(period, end)
+    if begin is None:
+        return panel
+    return panel[panel.index >= begin]
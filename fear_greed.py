@@ -0,0 +1,151 @@
+import os
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+from ohlcv_store import STORE_DIR
+
+# ==========================================
+# [설정] CNN Fear & Greed 조회
+# 데워진 세션의 쿠키와 마지막 응답(ETag/Last-Modified 포함)을 STATE_FILE 에 보관해 실행 간에 재사용
+# ==========================================
+FG_API_URL = os.getenv('FG_API_URL', 'https://production.dataviz.cnn.io/index/fearandgreed/graphdata')
+FG_PAGE_URL = os.getenv('FG_PAGE_URL', 'https://edition.cnn.com/markets/fear-and-greed')
+FG_STATE_FILE = os.path.join(STORE_DIR, 'fear_greed.json')
+FG_TTL_MINUTES = float(os.getenv('FG_TTL_MINUTES', 60))   # 이 시간 안에 받은 값은 네트워크 없이 그대로 사용
+REQUEST_TIMEOUT = 10
+# ==========================================
+
+BROWSER_HEADERS = {
+    'User-Agent':      'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+    'Accept':          'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection':      'keep-alive',
+}
+
+
+class FearGreedClient:
+    """CNN Fear & Greed API 클라이언트
+
+    - 세션 쿠키를 상태 파일에 저장해 다음 실행에서도 CNN 페이지를 다시 방문하지 않고 재사용
+      (쿠키가 없거나 API 가 401/403 으로 거절할 때만 페이지를 방문해 세션을 데움)
+    - 마지막으로 받은 응답이 ttl 안이면 네트워크 요청 없이 그대로 반환
+    - 서버가 ETag/Last-Modified 를 주면 다음 조회는 조건부 요청 → 304 면 저장된 응답을 재사용
+    """
+
+    def __init__(self, api_url=FG_API_URL, page_url=FG_PAGE_URL, state_path=FG_STATE_FILE,
+                 ttl_minutes=FG_TTL_MINUTES):
+        self.api_url = api_url
+        self.page_url = page_url
+        self.state_path = state_path
+        self.ttl = timedelta(minutes=ttl_minutes)
+        self.state = self._read_state()
+        self.stats = {'page': 0, 'api': 0, 'not_modified': 0, 'ttl_hit': 0}
+        self._session = None
+        self._lock = threading.Lock()
+
+    # ── 상태 파일 ────────────────────────────────────────────
+    def _read_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self):
+        os.makedirs(os.path.dirname(self.state_path) or '.', exist_ok=True)
+        tmp = self.state_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp, self.state_path)
+
+    # ── 세션 ─────────────────────────────────────────────────
+    @property
+    def session(self):
+        """저장된 쿠키를 복원한 requests 세션 (한 번 만들어 계속 재사용)"""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+            self._session.headers.update(BROWSER_HEADERS)
+            now = time.time()
+            for c in self.state.get('cookies', []):
+                if c.get('expires') and c['expires'] < now:
+                    continue
+                self._session.cookies.set(c['name'], c['value'], domain=c.get('domain', ''),
+                                          path=c.get('path', '/'), expires=c.get('expires'),
+                                          secure=c.get('secure', False))
+        return self._session
+
+    def _save_cookies(self):
+        self.state['cookies'] = [
+            {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path,
+             'expires': c.expires, 'secure': c.secure}
+            for c in self.session.cookies
+        ]
+
+    def warm_up(self):
+        """실제 브라우저처럼 CNN 페이지를 방문해 쿠키 획득"""
+        self.stats['page'] += 1
+        self.session.get(self.page_url, timeout=REQUEST_TIMEOUT)
+        self._save_cookies()
+
+    # ── 조회 ─────────────────────────────────────────────────
+    def is_fresh(self, now=None):
+        fetched_at = self.state.get('fetched_at')
+        if not fetched_at or 'data' not in self.state:
+            return False
+        return (now or datetime.now()) - datetime.fromisoformat(fetched_at) < self.ttl
+
+    def _request_api(self):
+        headers = {
+            'Accept':  'application/json, text/plain, */*',
+            'Referer': self.page_url,
+            'Origin':  'https://edition.cnn.com',
+        }
+        # 저장된 응답이 있을 때만 조건부 요청 (304 를 받아도 돌려줄 본문이 있어야 함)
+        if 'data' in self.state:
+            if self.state.get('etag'):
+                headers['If-None-Match'] = self.state['etag']
+            if self.state.get('last_modified'):
+                headers['If-Modified-Since'] = self.state['last_modified']
+        self.stats['api'] += 1
+        return self.session.get(self.api_url, headers=headers, timeout=REQUEST_TIMEOUT)
+
+    def fetch(self, force=False):
+        """API 응답(JSON dict) 반환 - TTL 안이면 저장된 값, 304 면 저장된 값, 그 외에는 새 응답
+
+        실패 시 requests 예외 또는 ValueError 를 그대로 올림 (재시도/폴백은 호출하는 쪽에서)
+        """
+        with self._lock:
+            now = datetime.now()
+            if not force and self.is_fresh(now):
+                self.stats['ttl_hit'] += 1
+                return self.state['data']
+
+            if not self.state.get('cookies'):
+                self.warm_up()
+            r = self._request_api()
+            if r.status_code in (401, 403):
+                # 쿠키가 만료됐거나 거절됨 → 세션을 다시 데우고 한 번만 재요청
+                self.warm_up()
+                r = self._request_api()
+
+            if r.status_code == 304:
+                self.stats['not_modified'] += 1
+            else:
+                r.raise_for_status()
+                if not r.text.strip():
+                    raise ValueError("빈 응답")
+                self.state['data'] = r.json()
+                self.state['etag'] = r.headers.get('ETag')
+                self.state['last_modified'] = r.headers.get('Last-Modified')
+            self.state['fetched_at'] = now.isoformat(timespec='seconds')
+            self._save_cookies()
+            self._write_state()
+            return self.state['data']
+
+    def last_data(self):
+        """마지막으로 저장된 응답 (없으면 None) - 네트워크 실패 시 폴백용"""
+        return self.state.get('data')
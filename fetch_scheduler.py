@@ -0,0 +1,173 @@
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# ==========================================
+# [설정] 시세 조회 스케줄러
+# ==========================================
+MAX_WORKERS = 4          # 동시에 실행할 조회 작업 수
+RATE_PER_SEC = 2.0       # 초당 허용 요청 수 (토큰 버킷 충전 속도)
+BURST = 4                # 한 번에 몰아서 보낼 수 있는 최대 요청 수
+MAX_RETRIES = 3          # 429/5xx 응답 시 재시도 횟수
+BACKOFF_BASE = 1.0       # 재시도 대기 시간(초) = BACKOFF_BASE * 2^(시도-1) + 지터
+TASK_DEADLINE = 45.0     # 작업 하나가 시작된 뒤 결과를 기다리는 최대 시간(초)
+RUN_DEADLINE = 300.0     # run() 한 번의 전체 시간 예산(초): 넘기면 아직 시작 못 한 작업까지 timeout 처리
+# ==========================================
+
+
+class TokenBucket:
+    """초당 rate 개씩 충전되는 토큰 버킷 (여러 스레드에서 공유)"""
+
+    def __init__(self, rate=RATE_PER_SEC, capacity=BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline=None):
+        """토큰 1개를 얻을 때까지 대기 (deadline(monotonic)을 넘기면 False)"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait_sec = (1 - self.tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait_sec > deadline:
+                return False
+            time.sleep(wait_sec)
+
+
+def error_status(exc):
+    """예외에서 HTTP 상태코드 추출 (requests/yfinance/DataSourceError 공통)"""
+    status = getattr(exc, 'status', None)
+    if status is None:
+        response = getattr(exc, 'response', None)
+        status = getattr(response, 'status_code', None)
+    if status is None and ('Too Many Requests' in str(exc) or 'RateLimit' in type(exc).__name__):
+        status = 429
+    return status
+
+
+def is_retryable(exc):
+    status = error_status(exc)
+    return status == 429 or (status is not None and 500 <= status < 600)
+
+
+class RunReport:
+    """작업별 상태/소요시간 기록 (ok | error | timeout)"""
+
+    def __init__(self):
+        self.entries = {}
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+
+    def record(self, key, status, elapsed, attempts=0, tickers=None, error=None):
+        self.entries[key] = {
+            'status': status, 'elapsed': elapsed, 'attempts': attempts,
+            'tickers': list(tickers or [key]), 'error': error,
+        }
+
+    def tickers_with(self, status):
+        return [t for e in self.entries.values() if e['status'] == status for t in e['tickers']]
+
+    def print_summary(self):
+        print(f"[조회 리포트] 작업 {len(self.entries)}개, 전체 {self.elapsed:.2f}s")
+        for key, e in sorted(self.entries.items(), key=lambda kv: -kv[1]['elapsed']):
+            line = f"  {e['status']:<7} {e['elapsed']:6.2f}s  시도 {e['attempts']}회  {', '.join(e['tickers'])}"
+            if e['error']:
+                line += f"  ({e['error']})"
+            print(line)
+        timed_out = self.tickers_with('timeout')
+        if timed_out:
+            print(f"  시간 초과 티커: {', '.join(timed_out)}")
+
+
+class FetchScheduler:
+    """조회 작업을 스레드 풀에서 동시에 실행 (동시 실행 수 제한 + 토큰 버킷 + 백오프 재시도 + 작업별 마감시간)"""
+
+    def __init__(self, max_workers=MAX_WORKERS, rate=RATE_PER_SEC, burst=BURST,
+                 max_retries=MAX_RETRIES, backoff=BACKOFF_BASE, deadline=TASK_DEADLINE, budget=RUN_DEADLINE):
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.deadline = deadline
+        self.budget = budget
+
+    def _call(self, fn, started, attempts, stop):
+        """작업 하나 실행 (run 이 끝나 stop 이 켜졌으면 시작하지도, 다시 시도하지도 않음)
+
+        실행 중인 스레드는 강제로 멈출 수 없으므로 fn 은 자체 요청 타임아웃으로 반드시 돌아와야 함
+        """
+        if stop.is_set():
+            raise TimeoutError("전체 시간 예산 초과로 시작하지 않음")
+        started[0] = time.monotonic()
+        deadline = started[0] + self.deadline
+        for attempt in range(1, self.max_retries + 2):
+            attempts[0] = attempt
+            if stop.is_set():
+                raise TimeoutError("마감시간 초과로 포기됨")
+            if not self.bucket.acquire(deadline):
+                raise TimeoutError("요청 한도 대기 중 마감시간 초과")
+            try:
+                return fn()
+            except Exception as e:
+                if attempt > self.max_retries or not is_retryable(e):
+                    raise
+                wait_sec = self.backoff * 2 ** (attempt - 1) + random.uniform(0, self.backoff)
+                if time.monotonic() + wait_sec > deadline:
+                    raise
+                print(f"재시도 대기 {wait_sec:.1f}s (상태 {error_status(e)}): {e}")
+                time.sleep(wait_sec)
+
+    def run(self, tasks, tickers_of=None):
+        """tasks: {키: 인자 없는 함수} → ({키: 결과}, RunReport)
+
+        tickers_of: {키: 티커 목록} (리포트에 티커 단위로 표시할 때)
+        """
+        tickers_of = tickers_of or {}
+        report = RunReport()
+        results = {}
+        stop = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = {}
+        for key, fn in tasks.items():
+            started, attempts = [None], [0]
+            future = executor.submit(self._call, fn, started, attempts, stop)
+            pending[future] = (key, started, attempts)
+
+        try:
+            while pending:
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                now = time.monotonic()
+                for future in done:
+                    key, started, attempts = pending.pop(future)
+                    elapsed = now - (started[0] or now)
+                    try:
+                        results[key] = future.result()
+                        report.record(key, 'ok', elapsed, attempts[0], tickers_of.get(key))
+                    except Exception as e:
+                        report.record(key, 'error', elapsed, attempts[0], tickers_of.get(key), str(e))
+                # 시작 후 마감시간을 넘긴 작업은 결과를 기다리지 않고 포기
+                for future in [f for f, (_, s, _) in pending.items() if s[0] and now - s[0] > self.deadline]:
+                    key, started, attempts = pending.pop(future)
+                    future.cancel()
+                    report.record(key, 'timeout', now - started[0], attempts[0], tickers_of.get(key))
+                # 멈춘 작업이 워커를 붙잡아 대기열 작업이 시작조차 못 하는 경우: 전체 예산을 넘기면 남은 작업을 모두 포기
+                if pending and self.budget is not None and now - report.started > self.budget:
+                    stop.set()
+                    for future, (key, started, attempts) in pending.items():
+                        future.cancel()
+                        report.record(key, 'timeout', now - (started[0] or now), attempts[0], tickers_of.get(key),
+                                      None if started[0] else '전체 시간 예산 초과로 시작하지 않음')
+                    pending.clear()
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        report.elapsed = time.monotonic() - report.started
+        return results, report
@@ -0,0 +1,108 @@
+import io
+import os
+import time
+
+# ==========================================
+# [설정] 전송 전 이미지 최적화
+# 'flat'(표/심리 지표처럼 단색 면 위주): 256색 팔레트 PNG 로 양자화 + 최대 압축
+# 'photo'(시장 맵처럼 색이 많은 그림): JPEG/WebP 변형을 만들어 채널별로 골라 보냄
+# ==========================================
+OPTIMIZE_IMAGES = os.getenv('OPTIMIZE_IMAGES', '1') != '0'
+OPTIMIZED_DIR = os.getenv('OPTIMIZED_DIR', 'optimized')
+PALETTE_COLORS = 256
+JPEG_QUALITY = 88
+WEBP_QUALITY = 85
+# 채널별로 'photo' 이미지를 보낼 형식 ('png' 면 원본 그대로)
+# 텔레그램은 사진을 어차피 JPEG 로 다시 압축하고, 이메일(Gmail/Apple Mail)은 WebP 를 바로 표시함
+CHANNEL_FORMATS = {'telegram': 'jpeg', 'email': 'webp'}
+EXTENSIONS = {'png': '.png', 'jpeg': '.jpg', 'webp': '.webp'}
+# ==========================================
+
+
+def _encode(img, fmt):
+    buf = io.BytesIO()
+    if fmt == 'png':
+        img.save(buf, format='PNG', compress_level=9)
+    elif fmt == 'jpeg':
+        # 글자 가장자리 색 번짐을 막기 위해 크로마 서브샘플링 없이(4:4:4) 저장
+        img.convert('RGB').save(buf, format='JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True,
+                                subsampling=0)
+    elif fmt == 'webp':
+        img.convert('RGB').save(buf, format='WEBP', quality=WEBP_QUALITY, method=4)
+    else:
+        raise ValueError(f"알 수 없는 이미지 형식: {fmt}")
+    return buf.getvalue()
+
+
+def quantize_png(img):
+    """256색 팔레트(median cut, 디더링 없음)로 줄인 뒤 최대 압축 PNG → 바이트
+
+    면 색(배경/셀/글자색)은 그대로 남고 글자 가장자리의 안티앨리어싱 중간색만 가까운 색으로 합쳐짐
+    """
+    from PIL import Image
+    quantized = img.convert('RGB').quantize(colors=PALETTE_COLORS, method=Image.Quantize.MEDIANCUT,
+                                            dither=Image.Dither.NONE)
+    return _encode(quantized, 'png')
+
+
+def optimize_image(path, kind='flat', out_dir=None):
+    """원본 PNG 하나 → {형식: 최적화된 파일 경로} (원본보다 커지는 변형은 만들지 않고 원본 경로 사용)
+
+    flat: {'png'} / photo: {'png', 'jpeg', 'webp'}
+    """
+    from PIL import Image
+    t0 = time.perf_counter()
+    with open(path, 'rb') as f:
+        original = f.read()
+    img = Image.open(io.BytesIO(original))
+    img.load()
+
+    encoded = {'png': quantize_png(img)} if kind == 'flat' else {fmt: _encode(img, fmt) for fmt in ('jpeg', 'webp')}
+    out_dir = out_dir or OPTIMIZED_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    variants = {'png': path}
+    sizes = []
+    for fmt, data in encoded.items():
+        sizes.append(f"{fmt} {len(data) / 1024:.0f}KB ({(len(data) / len(original) - 1) * 100:+.0f}%)")
+        if len(data) < len(original):
+            out_path = os.path.join(out_dir, stem + EXTENSIONS[fmt])
+            with open(out_path, 'wb') as f:
+                f.write(data)
+            variants[fmt] = out_path
+    print(f"[이미지 최적화] {os.path.basename(path)} ({kind}): {len(original) / 1024:.0f}KB → "
+          f"{', '.join(sizes)}  {(time.perf_counter() - t0) * 1000:.0f}ms")
+    return variants
+
+
+def optimize_for_channels(images, channels=None):
+    """[(경로, 'flat'|'photo')] → {채널: [보낼 경로]} (입력 순서 유지, 이미지끼리는 동시에 처리)"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    channels = channels or CHANNEL_FORMATS
+    paths = [path for path, _ in images]
+    if not OPTIMIZE_IMAGES or not images:
+        return {channel: paths for channel in channels}
+
+    t0 = time.perf_counter()
+
+    def run(item):
+        path, kind = item
+        try:
+            return optimize_image(path, kind)
+        except Exception as e:
+            print(f"[이미지 최적화] {os.path.basename(path)} 실패 → 원본 사용: {e}")
+            return {'png': path}
+
+    # Pillow 인코딩은 GIL 을 놓으므로 스레드로도 동시에 진행됨
+    with ThreadPoolExecutor(max_workers=min(4, len(images))) as executor:
+        variants = list(executor.map(run, images))
+
+    result = {}
+    for channel, photo_format in channels.items():
+        result[channel] = [v.get(photo_format if kind == 'photo' else 'png', v['png'])
+                           for v, (_, kind) in zip(variants, images)]
+    before = sum(os.path.getsize(p) for p in paths)
+    summary = ', '.join(f"{ch} {sum(os.path.getsize(p) for p in ps) / 1024:.0f}KB" for ch, ps in result.items())
+    print(f"[이미지 최적화] 전체 원본 {before / 1024:.0f}KB → {summary} ({time.perf_counter() - t0:.2f}s)")
+    return result
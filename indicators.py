@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+from data_source import period_start
+
+# 결과 컬럼: 현재가, 기준일, 전일대비(%), RSI(14), 20/60일 평균, 1년 고점 대비 MDD(%), 20일 MDD(%), 연초대비(%), 평균 MDD(%)
+INDICATOR_COLUMNS = ['price', 'price_date', 'day_change', 'rsi_14', 'avg_20', 'avg_60',
+                     'mdd', 'mdd_20', 'ytd', 'avg_mdd']
+
+
+def _pack_recent(values):
+    """각 열의 NaN을 위로 몰고 유효값을 아래쪽(최근)에 순서대로 정렬
+
+    미국/KRX처럼 휴장일이 달라 날짜가 어긋나도 '티커별 최근 N개 봉'이 모두 마지막 N행에 모임
+    """
+    valid = ~np.isnan(values)
+    order = np.argsort(valid, axis=0, kind='stable')
+    return np.take_along_axis(values, order, axis=0), valid.sum(axis=0)
+
+
+def _tail_mean(packed, count, n):
+    """최근 n개 봉 평균 (봉이 n개보다 적으면 있는 만큼 평균)"""
+    tail = packed[-n:]
+    return np.nansum(tail, axis=0) / np.minimum(count, n).clip(min=1)
+
+
+def _tail_max(packed, n):
+    tail = np.where(np.isnan(packed[-n:]), -np.inf, packed[-n:])
+    return tail.max(axis=0)
+
+
+def _rsi(packed, count, period=14):
+    """단순이동평균 방식 RSI (최근 period 개의 종가 변화 기준)"""
+    delta = np.diff(packed[-(period + 1):], axis=0)
+    delta = np.nan_to_num(delta, nan=0.0)
+    avg_gain = np.where(delta > 0, delta, 0).mean(axis=0)
+    avg_loss = np.where(delta < 0, -delta, 0).mean(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    # 첫 봉은 변화량이 없으므로 period 개의 변화량에는 period + 1 개의 종가가 필요
+    return np.where(count > period, rsi, np.nan)
+
+
+def daily_mdd(close):
+    """일별 MDD(%) - 상장일부터의 최고점 대비 하락률 (여러 티커 열을 한 번에 계산)"""
+    max_so_far = close.cummax()
+    return (close - max_so_far) / max_so_far * 100
+
+
+def compute_indicators(close, now=None):
+    """종가 패널(날짜 x 티커, 전체 기간)로 모든 티커의 지표를 한 번에 계산
+
+    평균 MDD는 전체 기간, 나머지 지표는 최근 1년 구간 기준 (기존 history(period="1y")와 동일)
+    반환: 티커를 인덱스로 하는 DataFrame (INDICATOR_COLUMNS)
+    """
+    now = now or datetime.now()
+    close = close.astype(float)
+    close_1y = close[close.index >= period_start('1y', now.date())]
+
+    values = close_1y.to_numpy()
+    packed, count = _pack_recent(values)
+    n = len(values)
+
+    price = packed[-1] if n else np.full(close.shape[1], np.nan)
+    prev = packed[-2] if n >= 2 else np.full(close.shape[1], np.nan)
+
+    # 티커별 마지막 유효 봉의 날짜
+    last_pos = n - 1 - np.argmax(~np.isnan(values[::-1]), axis=0) if n else np.zeros(close.shape[1], dtype=int)
+    price_date = pd.DatetimeIndex(close_1y.index[last_pos]) if n else pd.DatetimeIndex([pd.NaT] * close.shape[1])
+    price_date = price_date.where(count > 0, pd.NaT)
+
+    max_1y = close_1y.max().to_numpy()
+    max_20 = _tail_max(packed, 20)
+
+    # 연초 기준가: 작년 마지막 종가, 없으면 올해 첫 종가
+    prior = close_1y[close_1y.index.year < now.year]
+    current = close_1y[close_1y.index.year >= now.year]
+    base = prior.ffill().iloc[-1] if len(prior) else pd.Series(np.nan, index=close.columns)
+    if len(current):
+        base = base.fillna(current.bfill().iloc[0])
+    base = base.to_numpy()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = pd.DataFrame({
+            'price': price,
+            'price_date': price_date,
+            'day_change': (price - prev) / prev * 100,
+            'rsi_14': _rsi(packed, count),
+            'avg_20': _tail_mean(packed, count, 20),
+            'avg_60': _tail_mean(packed, count, 60),
+            'mdd': (price - max_1y) / max_1y * 100,
+            'mdd_20': (price - max_20) / max_20 * 100,
+            'ytd': (price - base) / base * 100,
+            'avg_mdd': daily_mdd(close).mean().to_numpy(),
+        }, index=close.columns)
+
+    # 최근 1년 데이터가 없는 티커는 모든 값 비움
+    result.loc[count == 0, [c for c in INDICATOR_COLUMNS if c != 'price_date']] = np.nan
+    return result
@@ -0,0 +1,202 @@
+import os
+from datetime import datetime
+
+import numpy as np
+
+from plot_style import pil_font
+
+# ==========================================
+# [설정] 브라우저 없이 그리는 섹터 히트맵
+# ==========================================
+CONSTITUENTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sp500_constituents.csv')
+IMAGE_SIZE = 1080
+BG_DARK = '#161C22'
+TITLE_BAND = 0.08        # 상단 제목 띠 높이 비율
+SECTOR_HEADER = 16       # 섹터 이름 띠 높이(px)
+# 등락률(%) → 색 (Finviz 히트맵과 비슷한 빨강-회색-초록 구간)
+COLOR_STOPS = [(-3, '#f63538'), (-2, '#bf4045'), (-1, '#8b444e'), (0, '#414554'),
+               (1, '#35764e'), (2, '#2f9e4f'), (3, '#30cc5a')]
+# ==========================================
+
+
+def load_constituents(path=CONSTITUENTS_FILE):
+    """구성종목 CSV(ticker, name, sector) → DataFrame"""
+    import pandas as pd
+    return pd.read_csv(path)
+
+
+def market_caps(tickers, last_close):
+    """시가총액 = 캐시된 상장주식수 x 최근 종가 (주식수가 없으면 캐시된 marketCap)
+
+    메타데이터 캐시(ticker_meta, TTL 30일)에 없는 티커만 스케줄러로 동시에 한 번 조회
+    (조회에 실패한 티커는 만료된 캐시가 있으면 그 값을 쓰고, 없으면 맵에서 빠짐)
+    """
+    import pandas as pd
+    import ticker_meta
+    from data_source import get_data_source
+    from fetch_scheduler import FetchScheduler
+
+    metas = {t: ticker_meta.cached_meta(t) for t in tickers}
+    missing = [t for t in tickers if not ticker_meta.is_cached(t)]
+    if missing:
+        print(f"시가총액 메타데이터 조회: {len(missing)}개 티커")
+        source = get_data_source()
+        # 요청 한도가 없는 소스(fixture)는 토큰 버킷이 한 번에 모두 내보내도록
+        scheduler = FetchScheduler() if source.rate_limited else FetchScheduler(rate=len(missing), burst=len(missing))
+        results, report = scheduler.run({t: (lambda t=t: ticker_meta.fetch_ticker_meta(t, source)) for t in missing})
+        metas.update(results)
+        failed = [t for t in missing if t not in results]
+        if failed:
+            print(f"메타데이터 조회 실패 {len(failed)}개 티커 (시간 초과 {len(report.tickers_with('timeout'))}개): "
+                  f"{', '.join(failed[:10])}{' ...' if len(failed) > 10 else ''}")
+
+    caps = {}
+    for ticker in tickers:
+        meta = metas[ticker]
+        shares, close = meta.get('sharesOutstanding'), last_close.get(ticker)
+        if shares and close is not None and not np.isnan(close):
+            caps[ticker] = shares * close
+        elif meta.get('marketCap'):
+            caps[ticker] = meta['marketCap']
+    return pd.Series(caps, dtype=float)
+
+
+def period_returns(close, days=1):
+    """티커별 최근 days 봉 수익률(%) - 휴장/결측은 앞 값으로 채운 뒤 계산"""
+    filled = close.ffill()
+    if len(filled) <= days:
+        return filled.iloc[-1] * np.nan
+    return (filled.iloc[-1] / filled.iloc[-1 - days] - 1) * 100
+
+
+def constituent_close(close, constituents):
+    """종가 패널에서 구성종목 열만, 구성종목이 모두 비어 있는 날짜(미국 휴장, 한국만 열린 날 등)는 뺌"""
+    tickers = [t for t in constituents['ticker'] if t in close.columns]
+    return close[tickers].dropna(how='all')
+
+
+def treemap_data(close, constituents, days=1, caps=None):
+    """종가 패널(날짜 x 티커) + 구성종목 → 히트맵 입력 DataFrame(ticker, sector, cap, ret)
+
+    패널에는 VIX/한국 종목 날짜도 섞여 있으므로 구성종목의 거래일만 남긴 뒤 days 봉 수익률 계산
+    """
+    close = constituent_close(close, constituents)
+    tickers = list(close.columns)
+    last_close = close.ffill().iloc[-1]
+    caps = market_caps(tickers, last_close) if caps is None else caps
+    data = constituents.set_index('ticker').loc[tickers, ['sector']]
+    data['cap'] = caps.reindex(tickers)
+    data['ret'] = period_returns(close, days)
+    return data.dropna(subset=['cap']).reset_index()
+
+
+# ── 레이아웃 ───────────────────────────────────────────────
+def _worst(row, side):
+    """행(면적 목록)을 한 변(side)에 붙였을 때 가장 길쭉한 사각형의 가로세로 비"""
+    s = sum(row)
+    return max(max(side * side * r / (s * s), s * s / (side * side * r)) for r in row)
+
+
+def squarify(values, x, y, w, h):
+    """Squarified treemap (Bruls et al.) - 값 비율대로 (x, y, w, h) 영역을 정사각형에 가깝게 분할
+
+    values 는 양수, 큰 값부터 정렬되어 있어야 함 → 같은 순서의 (x, y, w, h) 목록
+    """
+    total = float(sum(values))
+    if total <= 0 or w <= 0 or h <= 0:
+        return [(x, y, 0.0, 0.0) for _ in values]
+    areas = [v * w * h / total for v in values]
+    rects = []
+    i, n = 0, len(areas)
+    while i < n:
+        side = min(w, h)
+        row = [areas[i]]
+        i += 1
+        # 가로세로 비가 나빠지기 전까지 같은 줄에 추가
+        while i < n and _worst(row + [areas[i]], side) <= _worst(row, side):
+            row.append(areas[i])
+            i += 1
+        s = sum(row)
+        if w >= h:
+            # 짧은 변(세로)을 따라 한 열로 쌓고 남은 영역은 오른쪽
+            col_w = s / h
+            cy = y
+            for a in row:
+                rects.append((x, cy, col_w, a / col_w))
+                cy += a / col_w
+            x, w = x + col_w, w - col_w
+        else:
+            row_h = s / w
+            cx = x
+            for a in row:
+                rects.append((cx, y, a / row_h, row_h))
+                cx += a / row_h
+            y, h = y + row_h, h - row_h
+    return rects
+
+
+def return_colors(returns):
+    """등락률(%) 배열 → (n, 3) uint8 RGB (구간 선형 보간을 채널별로 한 번에, NaN 은 보합 색)"""
+    stops = np.array([s for s, _ in COLOR_STOPS], dtype=float)
+    rgb = np.array([[int(c[i:i + 2], 16) for i in (1, 3, 5)] for _, c in COLOR_STOPS], dtype=float)
+    r = np.nan_to_num(np.asarray(returns, dtype=float), nan=0.0)
+    return np.stack([np.interp(r, stops, rgb[:, ch]) for ch in range(3)], axis=1).round().astype(np.uint8)
+
+
+# ── 렌더링 ─────────────────────────────────────────────────
+def _label(draw, rect, ticker, ret):
+    """칸 크기에 맞춰 티커/등락률 표시 (너무 작은 칸은 생략)"""
+    x, y, w, h = rect
+    if w < 28 or h < 18:
+        return
+    size = int(max(8, min(40, h / 2.8)))
+    # 글자 폭을 실제로 재서 칸 너비의 90% 안에 들어오도록 한 번 보정
+    text_w = pil_font(size, True).getlength(ticker)
+    if text_w > w * 0.9:
+        size = max(8, int(size * w * 0.9 / text_w))
+    cx, cy = x + w / 2, y + h / 2
+    if h >= size * 2.4 and not np.isnan(ret):
+        draw.text((cx, cy - size * 0.15), ticker, fill='#FFFFFF', font=pil_font(size, True), anchor='md')
+        draw.text((cx, cy + size * 0.15), f"{ret:+.2f}%", fill='#FFFFFF',
+                  font=pil_font(max(8, int(size * 0.6)), False), anchor='ma')
+    else:
+        draw.text((cx, cy), ticker, fill='#FFFFFF', font=pil_font(size, True), anchor='mm')
+
+
+def render_treemap_png(data, title='S&P 500 Market Heatmap'):
+    """히트맵 입력(ticker, sector, cap, ret)을 섹터 → 종목 2단 squarified treemap 으로 그려 1080x1080 PNG 바이트로 반환"""
+    import io
+    from PIL import Image, ImageDraw
+
+    img = Image.new('RGB', (IMAGE_SIZE, IMAGE_SIZE), BG_DARK)
+    draw = ImageDraw.Draw(img)
+
+    # 제목 및 날짜
+    band = IMAGE_SIZE * TITLE_BAND
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M')
+    draw.text((IMAGE_SIZE / 2, band / 2), title, fill='#FFFFFF', font=pil_font(36, True), anchor='mm')
+    draw.text((IMAGE_SIZE * 0.99, band - 6), f'조회 기준: {now_str}', fill='#AAAAAA',
+              font=pil_font(14, True), anchor='rd')
+
+    # 색은 전체 종목에 대해 한 번에 계산
+    data = data[data['cap'] > 0].sort_values('cap', ascending=False).reset_index(drop=True)
+    colors = return_colors(data['ret'].to_numpy())
+
+    margin = 4
+    area = (margin, band, IMAGE_SIZE - 2 * margin, IMAGE_SIZE - band - margin)
+    sector_caps = data.groupby('sector', sort=False)['cap'].sum().sort_values(ascending=False)
+    for sector, rect in zip(sector_caps.index, squarify(sector_caps.tolist(), *area)):
+        sx, sy, sw, sh = rect
+        draw.rectangle([sx, sy, sx + sw, sy + sh], fill=BG_DARK)
+        header = SECTOR_HEADER if sh > SECTOR_HEADER * 3 and sw > 40 else 0
+        if header:
+            draw.text((sx + 3, sy + header / 2), sector.upper(), fill='#CCCCCC', font=pil_font(11, True), anchor='lm')
+        members = data.index[data['sector'] == sector]
+        inner = (sx + 1, sy + header + 1, sw - 2, sh - header - 2)
+        for i, (x, y, w, h) in zip(members, squarify(data.loc[members, 'cap'].tolist(), *inner)):
+            draw.rectangle([x, y, x + w, y + h], fill=tuple(colors[i]), outline=BG_DARK)
+            _label(draw, (x, y, w, h), data.at[i, 'ticker'], data.at[i, 'ret'])
+
+    buf = io.BytesIO()
+    img.save(buf, format='PNG')
+    return buf.getvalue()
@@ -1,48 +1,13 @@
-import yfinance as yf
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib
 from datetime import datetime
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
-from dotenv import load_dotenv
-import os
-import platform
-from notifier import notify
+from plot_style import write_png
+from table_render import TableSpec, cell_style, render_table
+from report_records import build_records, is_missing
 
-#OS판별
-system_name = platform.system()
-
-if system_name == 'Darwin':  # macOS
-    matplotlib.rc('font', family='AppleGothic')
-elif system_name == 'Linux':  # GitHub Actions 등 Ubuntu 환경
-    matplotlib.rc('font', family='NanumGothic')
-
-# macOS 기본 한글 폰트 설정 (AppleGothic)
-# matplotlib.rc('font', family='AppleGothic')
-# matplotlib.rc('font', family='NanumGothic')
-
-# 평균 MDD, 최대 MDD 계산 예시 (calc_mdd.py 참고)
-def daily_mdd(series):
-    max_so_far = series.expanding().max()
-    mdd = ((series - max_so_far) / max_so_far) * 100
-    return mdd
-
-def calc_avg_mdd(ticker):
-    stock = yf.Ticker(ticker)
-    hist = stock.history(period="max")
-    mdd_daily = daily_mdd(hist['Close'])
-    avg_mdd = mdd_daily.mean()
-    return avg_mdd
-
-# 여러 종목 코드 리스트 (지수/ETF/원자재/주식)
+# pandas/matplotlib/저장소 모듈은 표를 실제로 만들 때 가져옴 (import 시간 단축)
 
 # 카테고리별 종목 리스트 및 한글명 매핑
 
-# (검색용 티커, 표에 표시할 이름) 쌍으로 구성
+# (검색용 티커, 표에 표시할 이름) 쌍으로 구성 - 이름을 None 으로 두면 ticker_meta 캐시의 shortName 사용
 category_map = [
     ("S&P500", [
         ("SPLG", "SPLG"), ("SPY", "SPY"), ("SSO", "SSO"), ("UPRO", "UPRO"), ("453330.KS", "RISE S&P500")
@@ -90,227 +55,124 @@ ticker_name_map = {
     "0072R0.KS": "TIGER KRX금현물",
 }
 
-# yfinance로 종목 정보 가져오기
-def fetch_stock_info(ticker):
-    stock = yf.Ticker(ticker)
-    info = stock.info
-    name = ticker_name_map.get(ticker, info.get('shortName', ticker))
-    time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-    today = datetime.now().date()
-    start_of_year = datetime(today.year, 1, 1).date()
-    hist = stock.history(period="1y")
-    if hist.empty:
-        print(f"데이터가 없습니다: {ticker}")
-        return
-
-    price = hist['Close'].iloc[-1]
-    price_date = hist.index[-1].strftime('%Y-%m-%d')
-
-    # 20일평균
-    avg_20 = hist['Close'][-20:].mean() if len(hist) >= 20 else hist['Close'].mean()
-
-    # 연초 주가 (YTD 계산용)
-    # 1. 작년 마지막 거래일 종가 찾기
-    last_year_data = hist[hist.index.year < today.year]
-    
-    if not last_year_data.empty:
-        year_start_price = last_year_data['Close'].iloc[-1]
-        ytd_change = ((price - year_start_price) / year_start_price) * 100
-    else:
-        # 2. 작년 데이터가 없으면 올해 첫 데이터 사용
-        year_start_price_series = hist.loc[hist.index >= str(start_of_year), 'Close']
-        if not year_start_price_series.empty:
-            year_start_price = year_start_price_series.iloc[0]
-            ytd_change = ((price - year_start_price) / year_start_price) * 100
-        else:
-            year_start_price = None
-            ytd_change = None
-
-    # 최고점, 최고점 날짜, MDD
-    max_price = hist['Close'].max()
-    max_price_idx = hist['Close'].idxmax()
-    max_price_date = max_price_idx.strftime('%Y-%m-%d')
-    mdd = ((price - max_price) / max_price) * 100
-
-    # 20일 MDD 계산
-    max_20 = hist['Close'][-20:].max() if len(hist) >= 20 else hist['Close'].max()
-    mdd_20 = ((price - max_20) / max_20) * 100
-
-    display_ticker = ticker_name_map.get(ticker, ticker)
+# 레코드 한 개를 표 한 줄(문자열)로 변환 (포맷은 그림을 그릴 때만 적용)
+def format_index_row(rec):
     return {
-        '티커': display_ticker, #0
-        '현재가': f"{price:,.1f}", #1
-        '20일평균': f"{avg_20:.1f}", #2
-        '20일MDD': f"{mdd_20:.1f}%", #4
-        '현재MDD': f"{mdd:.1f}%", #3
-        '연초대비': f"{ytd_change:.1f}%" if year_start_price else 'N/A', #5
+        '현재가': f"{rec.price:,.1f}", #2
+        '20일평균': f"{rec.avg_20:.1f}", #3
+        '20일MDD': f"{rec.mdd_20:.1f}%", #4
+        '현재MDD': f"{rec.mdd:.1f}%", #5
+        '연초대비': f"{rec.ytd:.1f}%" if not is_missing(rec.ytd) else 'N/A', #6
     }
 
 
+# 표에 들어가는 전체 티커 (오케스트레이터가 다른 리포트 티커와 합쳐 한 번에 조회)
+INDEX_TICKERS = [ticker for _, ticker_pairs in category_map for ticker, _ in ticker_pairs]
+
+
+def index_records(ind, categories=None):
+    """compute_indicators 결과 → 표 순서대로 정렬된 IndicatorRecord 목록 (categories 기본값: category_map)"""
+    import ticker_meta
+    categories = category_map if categories is None else categories
+    # 표시명이 비어 있는 티커만 ticker_meta 캐시의 shortName 으로 보충
+    entries = [(cat, ticker, ticker_meta.display_name(ticker, display_name))
+               for cat, ticker_pairs in categories for ticker, display_name in ticker_pairs]
+    return build_records(ind, entries, 'index')
+
+
+def create_index_image(ind=None, output_path='index_monitoring_instagram.png'):
+    """지수/ETF 표 이미지 생성 (ind: compute_indicators 결과, 없으면 저장소에서 직접 조회/계산)"""
+    if ind is None:
+        from ohlcv_store import OHLCVStore
+        from indicators import compute_indicators
+        # 로컬 저장소를 마지막 저장일 이후 구간만 일괄 갱신한 뒤, 전체 티커 지표를 한 번에 계산
+        ind = compute_indicators(OHLCVStore().panel(INDEX_TICKERS)['Close'])
+
+    png = render_index_png(index_records(ind))
+    if png is None:
+        return None
+    write_png(png, output_path)
+    print(f'인스타그램용 이미지가 {output_path}로 저장되었습니다.')
+    return output_path
+
+
+# 카테고리별 배경색: 중복 없는 6가지 계열 색상 (파랑, 초록, 노랑, 주황, 분홍, 보라)
+category_colors = [
+    "#e3f0ff",  # 연파랑
+    "#e6f7e6",  # 연초록
+    "#fff7e3",  # 연노랑
+    "#ffe9e3",  # 연주황
+    "#fbe3ff",  # 연분홍
+    "#ece3ff"   # 연보라
+]
+# 카테고리 첫 행(헤더) 색상
+category_header_colors = {
+    "S&P500": "#90caf9",
+    "NASDAQ": "#81c784",
+    "배당성장": "#ffe082",
+    "중기채": "#ffb74d",
+    "장기채": "#f48fb1",
+    "금": "#b39ddb"
+}
 
-if __name__ == "__main__":
-    results = []
-    table_data = []
-    colnames = None
-    now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    # 카테고리별로 표 데이터 생성
-    # 표의 첫 번째 열에 카테고리(구분값) 추가
-    for cat, ticker_pairs in category_map:
-        for ticker, display_name in ticker_pairs:
-            try:
-                info = fetch_stock_info(ticker)
-                if info:
-                    # 상품명(표시명) 칼럼을 항상 두 번째로 추가
-                    row = [cat, display_name]
-                    # info에서 '티커' 항목을 제외한 나머지 값만 추가
-                    row += [v for k, v in info.items() if k != "티커"]
-                    if colnames is None:
-                        # 칼럼명: 구분, 상품명, 나머지 info.keys() (티커 제외)
-                        keys = [k for k in info.keys() if k != "티커"]
-                        # '평균MDD' 대신 '20일MDD'가 포함됨
-                        colnames = ["구분", "상품명"] + keys
-                    table_data.append(row)
-            except Exception as e:
-                print(f"{ticker} 오류: {e}")
-
-    if table_data and colnames:
-        # 생성날짜 행 추가
-        created_row = ["" for _ in range(len(colnames))]
-        table_data = [created_row, colnames] + table_data
-
-        fig, ax = plt.subplots(figsize=(10.8, 10.8), dpi=100)
-        fig.patch.set_facecolor('#f8f9fa')
-        ax.axis('off')
-
-        nrows, ncols = len(table_data), len(colnames)
-        table_bbox = [0.01, 0.01, 0.99, 0.99]
-        table = ax.table(cellText=table_data, colLabels=None, loc='center', cellLoc='center', bbox=table_bbox)
-        table.auto_set_font_size(False)
-        table.set_fontsize(11)
-        table.scale(1.0, 1.0)
-
-        # 표 스타일 개선 및 생성날짜 행 통합, border 제거
-        # 카테고리별 배경색 정의
-        # 중복 없는 6가지 계열 색상 (파랑, 초록, 노랑, 주황, 분홍, 보라)
-        category_colors = [
-            "#e3f0ff",  # 연파랑
-            "#e6f7e6",  # 연초록
-            "#fff7e3",  # 연노랑
-            "#ffe9e3",  # 연주황
-            "#fbe3ff",  # 연분홍
-            "#ece3ff"   # 연보라
-        ]
-
-        # 카테고리별로 색상 적용을 위해 각 행의 카테고리 인덱스 추출
-        cat_indices = []
-        prev_cat = None
-        cat_idx = -1
-        for row in range(2, nrows):
-            cat = table[(row,0)].get_text().get_text()
-            if cat != '' and cat != prev_cat:
-                cat_idx += 1
-                prev_cat = cat
-            cat_indices.append(cat_idx)
 
-        for (row, col), cell in table.get_celld().items():
-            # 셀 스타일(정렬, weight, 병합 등) 기존대로 적용
-            if row == 0:
-                cell.set_edgecolor('none')
-                cell.set_facecolor('#fff')
-                cell.set_text_props(ha='right', va='center', color='blue', fontsize=10, weight='black')
-                cell.set_height(0.07)
-                if col == ncols-1:
-                    cell.get_text().set_text(f"조회기준일시: {now_str}")
-                else:
-                    cell.get_text().set_text("")
-            elif row == 1:
-                cell.set_facecolor('#444444')
-                cell.set_fontsize(10)
-                cell.set_text_props(weight='black', color='#fff', ha='center')
-                cell.set_edgecolor('#ddd')
-                cell.set_height(0.09)
-                if col == 1:
-                    cell.set_width(0.32)
-            elif row >= 2:
-                cat_idx = cat_indices[row-2] if (row-2) < len(cat_indices) else 0
-                cell.set_facecolor(category_colors[cat_idx % len(category_colors)])
-                cell.set_height(0.09)
-                cell.set_fontsize(11)
-                if col == 1:
-                    cell.set_width(0.32)
+def _index_styles(rec, colnames, bg, is_header):
+    """레코드 수치로 한 행의 셀 스타일을 바로 계산 (표시 문자열을 다시 해석하지 않음)"""
+    weight = '900' if is_header else 'normal'
+    styles = []
+    for colname in colnames:
+        color = 'black'
+        # 20일MDD -5% 이하 빨강
+        if colname == '20일MDD' and rec.mdd_20 <= -5:
+            color = 'red'
+        # 20일평균이 현재가보다 높으면 빨강
+        elif colname == '20일평균' and rec.avg_20 > rec.price:
+            color = 'red'
+        elif colname == '연초대비' and not is_missing(rec.ytd):
+            color = '#1976d2' if rec.ytd < 0 else '#d32f2f'
+        # '구분', '상품명' 칼럼이 아니면 우측정렬
+        ha = 'center' if colname in ['구분', '상품명'] else 'right'
+        styles.append(cell_style(bg, color=color, weight=weight, ha=ha))
+    return styles
+
+
+def build_index_table(records):
+    """레코드로 지수/ETF 표의 텍스트/스타일 행렬(TableSpec) 생성"""
+    if not records:
+        print("데이터가 없습니다.")
+        return None
+
+    # 칼럼명: 구분, 상품명, 나머지 수치 칼럼
+    colnames = ["구분", "상품명"] + list(format_index_row(records[0]).keys())
+    rows, styles = [], []
+    cat_idx = -1
+    prev_cat = None
+    for rec in records:
+        # 구분(카테고리) 값은 카테고리 첫 행에만 표시하고, 그 행은 헤더 색상으로 강조
+        first = rec.group != prev_cat
+        if first:
+            cat_idx += 1
+            prev_cat = rec.group
+            bg = category_header_colors.get(rec.group, "#e0e0e0")  # 기본값 회색
+        else:
+            bg = category_colors[cat_idx % len(category_colors)]
+        rows.append([rec.group if first else "", rec.name] + list(format_index_row(rec).values()))
+        styles.append(_index_styles(rec, colnames, bg, first))
 
-            # 텍스트 색상 조건부 적용 (스타일과 분리)
-            if row >= 2 and colnames is not None and col < len(colnames):
-                colname = colnames[col]
-                val = cell.get_text().get_text().replace('%','').replace(',','')
-                # '구분', '상품명' 칼럼이 아니면 우측정렬
-                if colname not in ['구분', '상품명']:
-                    cell.set_text_props(ha='right')
-                # 20일MDD 파랑색
-                if colname == '20일MDD':
-                    try:
-                        if float(val) <= -5:
-                            cell.get_text().set_color('red')
-                    except:
-                        pass
-                # 현재가 < 20일평균 파랑색
-                if colname == '20일평균':
-                    try:
-                        price = float(val)
-                        nowPrice = table[(row, colnames.index('현재가'))].get_text().get_text().replace(',','')
-                        if float(price) > float(nowPrice):
-                            cell.get_text().set_color('red')
-                    except:
-                        pass
-                if colname == '연초대비':
-                    try:
-                        price = float(val)
-                        color = '#1976d2' if price < 0 else '#d32f2f'
-                        cell.set_text_props(color=color)
-                    except:
-                        pass
-                # 카테고리 헤더 색상 정의 (순서대로 매핑)
-                category_header_colors = {
-                    "S&P500": "#90caf9",
-                    "NASDAQ": "#81c784",
-                    "배당성장": "#ffe082",
-                    "중기채": "#ffb74d",
-                    "장기채": "#f48fb1",
-                    "금": "#b39ddb"
-                }
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    # 상품명 칼럼만 넓게 (나머지는 같은 너비)
+    col_widths = [0.32 if colname == '상품명' else 1 / len(colnames) for colname in colnames]
+    return TableSpec(colnames, rows, styles, caption=f"조회기준일시: {now_str}", col_widths=col_widths)
 
-                # 현재 행의 카테고리 확인 (첫 번째 열)
-                current_cat = table[(row, 0)].get_text().get_text()
-                
-                # 카테고리가 변경되는 지점(헤더)인지 확인
-                # 이전 행의 카테고리와 다르면 헤더로 간주 (row=2는 무조건 시작)
-                is_header = False
-                if row == 2:
-                    is_header = True
-                elif row > 2:
-                    prev_row_cat = table[(row-1, 0)].get_text().get_text()
-                    if current_cat != prev_row_cat and current_cat != "":
-                        is_header = True
-                
-                if is_header:
-                    header_color = category_header_colors.get(current_cat, "#e0e0e0") # 기본값 회색
-                    cell.set_facecolor(header_color)
-                    cell.set_text_props(weight='900')
 
-        # 구분(카테고리) 값이 연속되는 행은 첫 행만 표시, 나머지는 빈 문자열로
-        prev_cat = None
-        for row in range(2, nrows):
-            cat = table[(row,0)].get_text().get_text()
-            if cat == prev_cat:
-                table[(row,0)].get_text().set_text("")
-            else:
-                prev_cat = cat
+def render_index_png(records, backend=None):
+    """레코드로 지수/ETF 표를 그려 PNG 바이트로 반환 (렌더링 워커 프로세스에서도 호출)"""
+    spec = build_index_table(records)
+    if spec is None:
+        return None
+    return render_table(spec, backend)
 
-        plt.savefig('index_monitoring_instagram.png', bbox_inches='tight', pad_inches=0, dpi=100)
-        print('인스타그램용 이미지가 index_monitoring_instagram.png로 저장되었습니다.')
 
-    
-    # 알림은 monitor_stock.py에서 통합하여 전송하므로 여기서는 이미지 저장만 수행합니다.
-else:
-    print("데이터가 없습니다.")
+if __name__ == "__main__":
+    # 알림은 monitor_stock.py(report_pipeline)에서 통합하여 전송하므로 여기서는 이미지 저장만 수행합니다.
+    create_index_image()
@@ -1,151 +1,295 @@
 import os
 import time
-from playwright.sync_api import sync_playwright
-import matplotlib.pyplot as plt
-import matplotlib.image as mpimg
 from datetime import datetime
-import matplotlib
+from plot_style import write_png, pil_font, pt_to_px
+
+# ==========================================
+# [설정] 시장 맵 캡처
+# ==========================================
+# 'capture': Finviz 페이지를 브라우저로 캡처 / 'native': 저장소 종가와 캐시된 시가총액으로 직접 그림 (브라우저/네트워크 불필요)
+MAP_MODE = os.environ.get('MAP_MODE', 'capture')
+MAP_URL = "https://finviz.com/map.ashx?t=sec"
+# 캡처할 수 있는 맵 목록 (고른 맵들은 한 브라우저의 탭에서 동시에 캡처)
+# days 가 있는 맵은 native 모드에서 최근 days 봉 수익률로 직접 그림 (나머지는 capture 모드 전용)
+MAP_CATALOG = [
+    {'name': 'sp500', 'url': MAP_URL, 'title': 'S&P 500 Market Heatmap', 'image': 'market_map.png', 'days': 1},
+    {'name': 'world', 'url': 'https://finviz.com/map.ashx?t=geo', 'title': 'World Market Heatmap',
+     'image': 'market_map_world.png'},
+    {'name': 'etf', 'url': 'https://finviz.com/map.ashx?t=etf', 'title': 'ETF Market Heatmap',
+     'image': 'market_map_etf.png'},
+    {'name': 'sp500_1w', 'url': 'https://finviz.com/map.ashx?t=sec&st=w1', 'title': 'S&P 500 1-Week Performance',
+     'image': 'market_map_1w.png', 'days': 5},
+]
+# 리포트에 넣을 맵 이름 (쉼표 구분). 기본은 S&P 500 섹터 맵 하나, 예: MAP_NAMES=sp500,world,etf,sp500_1w
+MAP_NAMES = [name.strip() for name in os.environ.get('MAP_NAMES', 'sp500').split(',') if name.strip()]
+MAP_SPECS = [spec for spec in MAP_CATALOG if spec['name'] in MAP_NAMES]
+NAV_TIMEOUT = 60.0       # 페이지 이동(DOMContentLoaded)까지 최대 대기(초)
+CANVAS_TIMEOUT = 30.0    # 맵 캔버스가 나타나 화면에 보일 때까지 최대 대기(초)
+STABLE_TIMEOUT = 20.0    # 캔버스 픽셀이 더 이상 바뀌지 않을 때까지 최대 대기(초)
+STABLE_MS = 500          # 이 시간(ms) 동안 내용이 같으면 그리기 완료로 판단
+MAP_IMAGE_SIZE = 1080    # 출력 이미지 한 변(px)
+BG_DARK = '#161C22'      # 맵 배경과 비슷한 어두운 배경색
+POLL_MS = 50             # 준비 상태 확인 간격(ms) - 뒤쪽 탭은 애니메이션 프레임이 느려질 수 있어 시간 간격으로 확인
+# ==========================================
+
+# Playwright/matplotlib 은 맵을 실제로 캡처할 때 가져옴 (맵 단계를 건너뛰면 로드하지 않음)
+
+# 맵 캔버스 찾기: canvas#map-canvas, 없으면 화면에 보이는 가장 큰 캔버스 (최소 10만 픽셀, 예: 500x200)
+FIND_MAP_CANVAS_JS = """() => {
+    const visible = el => {
+        const r = el.getBoundingClientRect();
+        const s = window.getComputedStyle(el);
+        return r.width > 0 && r.height > 0 && s.visibility !== 'hidden' && s.display !== 'none';
+    };
+    const byId = document.querySelector('canvas#map-canvas');
+    if (byId && visible(byId)) return byId;
+    let best = null, bestArea = 0;
+    for (const c of document.querySelectorAll('canvas')) {
+        if (!visible(c)) continue;
+        const r = c.getBoundingClientRect();
+        if (r.width * r.height > bestArea) { bestArea = r.width * r.height; best = c; }
+    }
+    return bestArea > 100000 ? best : null;
+}"""
+
+# 확인할 때마다 캔버스를 작게 축소해 체크섬을 비교, stableMs 동안 같으면 true
+# (빈 캔버스는 아직 그리기 전으로 보고, 교차 출처로 픽셀을 못 읽으면 크기만 비교)
+CANVAS_STABLE_JS = """(stableMs) => {
+    const canvas = (%s)();
+    if (!canvas || !canvas.width || !canvas.height) return false;
+    const st = window.__mapStable || (window.__mapStable = {sig: null, since: 0, probe: document.createElement('canvas')});
+    st.probe.width = 128; st.probe.height = 80;
+    const ctx = st.probe.getContext('2d', {willReadFrequently: true});
+    ctx.clearRect(0, 0, 128, 80);
+    ctx.drawImage(canvas, 0, 0, 128, 80);
+    let sig = canvas.width + 'x' + canvas.height;
+    try {
+        const d = ctx.getImageData(0, 0, 128, 80).data;
+        let h = 0, painted = false;
+        for (let i = 0; i < d.length; i += 4) {
+            h = (h * 31 + d[i] + d[i + 1] * 3 + d[i + 2] * 7 + d[i + 3] * 11) | 0;
+            painted = painted || d[i + 3] > 0;
+        }
+        if (!painted) { st.sig = null; return false; }
+        sig += ':' + h;
+    } catch (e) {}
+    const now = performance.now();
+    if (sig !== st.sig) { st.sig = sig; st.since = now; return false; }
+    return now - st.since >= stableMs;
+}""" % FIND_MAP_CANVAS_JS
+
+# 모달/오버레이/높은 z-index 요소 제거 후, 나중에 추가되는 오버레이도 MutationObserver 로 바로 제거
+REMOVE_OVERLAYS_JS = """() => {
+    // 1. 일반적인 모달/오버레이 클래스 패턴
+    const selectors = [
+        '[class*="modal"]', '[id*="modal"]',
+        '[class*="overlay"]', '[id*="overlay"]',
+        '.absolute.top-0.left-0.w-full.h-full',
+        'button.absolute.right-4'
+    ].join(',');
+    // 2. 높은 z-index를 가진 요소 (모달 대응, 맵 본체는 제외)
+    const isOverlay = el => {
+        if (el.id === 'map-canvas' || el.closest('#map-canvas-container')) return false;
+        if (el.matches(selectors)) return true;
+        return parseInt(window.getComputedStyle(el).zIndex) > 100;
+    };
+    const sweep = root => {
+        for (const el of [root, ...root.querySelectorAll('*')]) {
+            if (el.isConnected && isOverlay(el)) el.remove();
+        }
+    };
+    sweep(document.body);
+    if (!window.__overlayObserver) {
+        window.__overlayObserver = new MutationObserver(mutations => {
+            for (const m of mutations) {
+                m.addedNodes.forEach(node => { if (node.nodeType === 1) sweep(node); });
+            }
+        });
+        window.__overlayObserver.observe(document.body, {childList: true, subtree: true});
+    }
+    // 3. 스크롤 막힘 해제 및 배경 흐림 제거
+    document.body.style.overflow = 'auto';
+    document.documentElement.style.overflow = 'auto';
+}"""
+
+# 레이아웃/페인트가 반영되도록 애니메이션 프레임 두 번 대기 (프레임이 멈춘 탭에서도 200ms 뒤에는 진행)
+NEXT_PAINT_JS = """() => new Promise(resolve => {
+    let done = false;
+    const finish = () => { if (!done) { done = true; resolve(); } };
+    requestAnimationFrame(() => requestAnimationFrame(finish));
+    setTimeout(finish, 200);
+})"""
 
-# 한글 폰트 설정 (OS별 처리)
-import platform
-system_name = platform.system()
-if system_name == 'Darwin':
-    matplotlib.rc('font', family='AppleGothic')
-elif system_name == 'Linux':
-    matplotlib.rc('font', family='NanumGothic')
 
 def capture_market_map(output_path='market_map.png'):
     print("시장 맵(Finviz) 캡처 및 인스타그램 규격 변환을 시작합니다...")
-    temp_path = 'temp_map.png'
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        # 현실적인 User-Agent와 설정 적용
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-            viewport={'width': 1280, 'height': 800}
-        )
-        page = context.new_page()
-        
+    screenshot = capture_map_screenshot()
+    if screenshot is None:
+        return None
+    write_png(render_market_map_png(screenshot), output_path)
+    print(f"인스타그램 규격 시장 맵 저장 완료: {output_path}")
+    return output_path
+
+
+def native_market_map(output_path='market_map.png', days=1, title='S&P 500 Market Heatmap'):
+    """브라우저 없이 구성종목 종가/시가총액으로 섹터 히트맵을 그려 저장"""
+    from datetime import timedelta
+    from ohlcv_store import OHLCVStore
+    from market_treemap import load_constituents, treemap_data, render_treemap_png
+
+    constituents = load_constituents()
+    # 수익률 계산에는 최근 몇 주만 있으면 됨
+    start = datetime.now() - timedelta(days=max(30, days * 3))
+    close = OHLCVStore().panel(list(constituents['ticker']), start=start)['Close']
+    write_png(render_treemap_png(treemap_data(close, constituents, days), title), output_path)
+    print(f"시장 맵(직접 그림) 저장 완료: {output_path}")
+    return output_path
+
+
+def capture_map_screenshot(url=MAP_URL):
+    """맵 하나를 캡처해 PNG 바이트로 반환 (실패 시 None)"""
+    shots, _ = capture_maps([{'name': 'map', 'url': url}])
+    return shots['map']
+
+
+def capture_maps(specs=MAP_SPECS):
+    """capture_maps_async 의 동기 진입점 (이벤트 루프가 없는 스레드에서 호출)"""
+    import asyncio
+    return asyncio.run(capture_maps_async(specs))
+
+
+async def capture_maps_async(specs=MAP_SPECS):
+    """브라우저 하나를 띄워 맵마다 탭을 열고 동시에 캡처
+
+    반환: ({이름: PNG 바이트 또는 None}, {'launch': 브라우저 기동(s), 'pages': 탭 작업 전체(s), 이름: 탭별(s)})
+    """
+    import asyncio
+    from playwright.async_api import async_playwright
+
+    t0 = time.perf_counter()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
         try:
-            # 타임아웃을 넉넉히 주고 로드 시점 조절
-            page.goto("https://finviz.com/map.ashx?t=sec", wait_until="domcontentloaded", timeout=60000)
-            
-            # 페이지 로드 후 맵과 모달이 나타날 때까지 충분히 대기
-            time.sleep(15) 
-            
-            # JavaScript로 모든 모달, 오버레이 및 높은 z-index 요소 강제 제거
-            page.evaluate("""() => {
-                // 1. 일반적인 모달/오버레이 클래스 패턴 제거
-                const selectors = [
-                    '[class*="modal"]', '[id*="modal"]', 
-                    '[class*="overlay"]', '[id*="overlay"]',
-                    '.absolute.top-0.left-0.w-full.h-full',
-                    'button.absolute.right-4'
-                ];
-                selectors.forEach(s => {
-                    document.querySelectorAll(s).forEach(el => el.remove());
-                });
-                
-                // 2. 높은 z-index를 가진 모든 요소 제거 (모달 대응, 맵 본체는 제외)
-                const allElements = document.querySelectorAll('*');
-                for (const el of allElements) {
-                    const z = parseInt(window.getComputedStyle(el).zIndex);
-                    if (z > 100 && el.id !== 'map-canvas' && !el.closest('#map-canvas-container')) {
-                        el.remove();
-                    }
-                }
-                
-                // 3. 스크롤 막힘 해제 및 배경 흐림 제거
-                document.body.style.overflow = 'auto';
-                document.documentElement.style.overflow = 'auto';
-            }""")
-            print("모달 제거 스크립트 실행 완료")
-            time.sleep(3)
-            
-            # 맵 영역 확인 및 캡처 (여러 셀렉터 시도)
-            # 1. 명시적인 ID로 시도
-            map_element = page.locator("canvas#map-canvas")
-            
-            # 2. 만약 못 찾으면 페이지 내에서 가장 큰 캔버스 요소를 찾음 (히트맵 특성상 가장 큼)
-            if map_element.count() == 0 or not map_element.first.is_visible():
-                print("명시적 ID로 맵을 찾지 못했습니다. 대체 검색을 시작합니다...")
-                canvases = page.query_selector_all("canvas")
-                max_area = 0
-                best_canvas = None
-                for c in canvases:
-                    box = c.bounding_box()
-                    if box:
-                        area = box['width'] * box['height']
-                        if area > max_area:
-                            max_area = area
-                            best_canvas = c
-                
-                if best_canvas and max_area > 100000: # 최소 10만 픽셀 이상 (예: 500x200)
-                    map_element = best_canvas
-                    print(f"가장 큰 캔버스 발견: {max_area}px 영역")
-                else:
-                    # 마지막 수단: 컨테이너 시도
-                    map_element = page.locator("#map-canvas-container").first
-            else:
-                map_element = map_element.first
-            
-            if not map_element:
-                 raise Exception("맵 요소를 도저히 찾을 수 없습니다.")
-            
-            # 요소가 화면에 보이도록 대기
-            map_element.screenshot(path=temp_path)
-            
-            # ── 인스타그램 규격(1080x1080)으로 재가공 ────────────────
-            fig, ax = plt.subplots(figsize=(10.8, 10.8), dpi=100)
-            # 맵 배경색과 유사한 어두운 색상 적용 (더 꽉 찬 느낌을 줌)
-            BG_DARK = '#161C22' 
-            fig.patch.set_facecolor(BG_DARK)
-            ax.set_facecolor(BG_DARK)
-            ax.set_xlim(0, 100)
-            ax.set_ylim(0, 100)
-            ax.axis('off')
-            
-            # 제목 및 날짜 (어두운 배경에 맞춰 흰색 계열로)
-            now_str = datetime.now().strftime('%Y-%m-%d %H:%M')
-            ax.text(50, 96, 'S&P 500 Market Heatmap', ha='center', va='center', 
-                    fontsize=26, fontweight='black', color='#FFFFFF')
-            ax.text(96, 96, f'조회 기준: {now_str}', ha='right', va='center', 
-                    fontsize=10, fontweight='bold', color='#AAAAAA')
-            
-            # 맵 이미지 불러오기 및 중앙 배치
-            img = mpimg.imread(temp_path)
-            img_h, img_w, _ = img.shape
-            aspect = img_h / img_w
-            
-            # 가로를 거의 100% 가깝게 채움 (여백 최소화)
-            target_w = 98
-            target_h = target_w * aspect
-            
-            # 중앙 배치 (Y축 여백 최소화)
-            y_start = (92 - target_h) / 2 + 2
-            
-            ax.imshow(img, extent=[1, 99, y_start, y_start + target_h], aspect='auto', zorder=2)
-            
-            # 테두리 제거 또는 아주 얇게
-            plt.savefig(output_path, bbox_inches='tight', pad_inches=0, facecolor=fig.get_facecolor())
-            plt.close()
-            
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-                
-            print(f"인스타그램 규격 시장 맵 저장 완료: {output_path}")
-            return output_path
-            
-        except Exception as e:
-            print(f"시장 맵 캡처 중 오류 발생: {e}")
-            try:
-                page.screenshot(path='debug_error.png')
-                print("디버깅용 전체 화면 스크린샷 저장 완료: debug_error.png")
-            except: pass
-            return None
+            # 현실적인 User-Agent와 설정 적용 (탭은 모두 같은 컨텍스트 → 쿠키/캐시 공유)
+            context = await browser.new_context(
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+                viewport={'width': 1280, 'height': 800}
+            )
+            launch_sec = time.perf_counter() - t0
+            t1 = time.perf_counter()
+            results = await asyncio.gather(*(_capture_tab(context, spec) for spec in specs))
+            pages_sec = time.perf_counter() - t1
         finally:
-            browser.close()
+            await browser.close()
+
+    shots = {spec['name']: png for spec, (png, _) in zip(specs, results)}
+    timings = {'launch': launch_sec, 'pages': pages_sec}
+    timings.update({spec['name']: sec for spec, (_, sec) in zip(specs, results)})
+    print(f"[맵 캡처] 브라우저 기동 {launch_sec:.1f}s, 탭 {len(specs)}개 작업 {pages_sec:.1f}s")
+    for spec, (png, sec) in zip(specs, results):
+        print(f"  {spec['name']:<10} {'ok' if png else 'error':<6} {sec:5.1f}s")
+    return shots, timings
+
+
+async def _capture_tab(context, spec):
+    """탭 하나에서 이동 → 캔버스 준비 대기 → 오버레이 제거 → 캡처 → (PNG 바이트 또는 None, 소요시간)"""
+    t0 = time.perf_counter()
+    page = await context.new_page()
+    try:
+        await page.goto(spec['url'], wait_until="domcontentloaded", timeout=NAV_TIMEOUT * 1000)
+        map_element = await wait_for_map(page, spec['name'])
+
+        # JavaScript로 모든 모달, 오버레이 및 높은 z-index 요소 강제 제거 (이후 뜨는 모달도 제거)
+        await page.evaluate(REMOVE_OVERLAYS_JS)
+        await page.evaluate(NEXT_PAINT_JS)
+
+        # 임시 파일 없이 메모리로 바로 캡처
+        return await map_element.screenshot(), time.perf_counter() - t0
+
+    except Exception as e:
+        print(f"[{spec['name']}] 시장 맵 캡처 중 오류 발생: {e}")
+        try:
+            await page.screenshot(path=f"debug_error_{spec['name']}.png")
+            print(f"디버깅용 전체 화면 스크린샷 저장 완료: debug_error_{spec['name']}.png")
+        except Exception:
+            pass
+        return None, time.perf_counter() - t0
+    finally:
+        await page.close()
+
+
+async def wait_for_map(page, label='map', canvas_timeout=CANVAS_TIMEOUT, stable_timeout=STABLE_TIMEOUT,
+                       stable_ms=STABLE_MS):
+    """맵 캔버스가 보이고 픽셀이 멈출 때까지 대기 → 캡처할 요소
+
+    캔버스가 마감시간 안에 안 보이면 #map-canvas-container 로 대체,
+    픽셀이 계속 바뀌어 마감시간을 넘기면 경고만 출력하고 현재 상태로 진행
+    """
+    from playwright.async_api import TimeoutError as PlaywrightTimeout
+
+    t0 = time.perf_counter()
+    try:
+        handle = await page.wait_for_function(FIND_MAP_CANVAS_JS, polling=POLL_MS, timeout=canvas_timeout * 1000)
+    except PlaywrightTimeout:
+        print(f"[{label}] {canvas_timeout:.0f}s 안에 맵 캔버스를 찾지 못했습니다. 컨테이너로 대체합니다...")
+        container = await page.query_selector("#map-canvas-container")
+        if container is None:
+            raise Exception("맵 요소를 도저히 찾을 수 없습니다.")
+        return container
+    t1 = time.perf_counter()
+
+    try:
+        await page.wait_for_function(CANVAS_STABLE_JS, arg=stable_ms, polling=POLL_MS, timeout=stable_timeout * 1000)
+    except PlaywrightTimeout:
+        print(f"[{label}] {stable_timeout:.0f}s 동안 맵 그리기가 끝나지 않아 현재 상태로 캡처합니다.")
+    print(f"[{label}] 맵 준비 완료: 캔버스 표시 {t1 - t0:.1f}s, 그리기 완료 {time.perf_counter() - t1:.1f}s")
+    # 그리기가 끝난 뒤 캔버스가 교체되는 경우를 대비해 다시 찾음
+    canvas = (await page.evaluate_handle(FIND_MAP_CANVAS_JS)).as_element()
+    return canvas or handle.as_element()
+
+
+def render_market_map_png(screenshot, title='S&P 500 Market Heatmap'):
+    """캡처한 맵 스크린샷(PNG 바이트)을 인스타그램 규격(1080x1080)으로 재가공해 PNG 바이트로 반환
+
+    디코딩 → 어두운 캔버스에 붙이기 → 제목/조회시각 쓰기 → PNG 인코딩 한 번 (파일/Figure 를 거치지 않음)
+    """
+    import io
+    from PIL import Image, ImageDraw
+
+    # 맵 배경색과 유사한 어두운 색상 적용 (더 꽉 찬 느낌을 줌)
+    canvas = Image.new('RGB', (MAP_IMAGE_SIZE, MAP_IMAGE_SIZE), BG_DARK)
+    shot = Image.open(io.BytesIO(screenshot)).convert('RGB')
+
+    # 가로를 거의 100% 가깝게 채우되(여백 최소화), 세로로 긴 맵은 제목 아래 영역에 맞춤
+    scale = min(MAP_IMAGE_SIZE * 0.98 / shot.width, MAP_IMAGE_SIZE * 0.90 / shot.height)
+    size = (round(shot.width * scale), round(shot.height * scale))
+    if size != shot.size:
+        shot = shot.resize(size, Image.LANCZOS)
+    # 제목 띠(상단 8%) 아래 영역의 중앙에 배치
+    x = (MAP_IMAGE_SIZE - size[0]) // 2
+    y = max(round(MAP_IMAGE_SIZE * 0.08), round(MAP_IMAGE_SIZE * 0.52 - size[1] / 2))
+    canvas.paste(shot, (x, y))
+
+    # 제목 및 날짜 (어두운 배경에 맞춰 흰색 계열로)
+    draw = ImageDraw.Draw(canvas)
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M')
+    band_y = MAP_IMAGE_SIZE * 0.04
+    title_font, stamp_font = pil_font(pt_to_px(26), True), pil_font(pt_to_px(10), True)
+    stamp = f'조회 기준: {now_str}'
+    draw.text((MAP_IMAGE_SIZE / 2, band_y), title, fill='#FFFFFF', font=title_font, anchor='mm')
+    # 제목이 길어 조회시각과 겹치면 조회시각을 제목 아래 줄로 내림
+    stamp_x = MAP_IMAGE_SIZE * 0.96
+    title_right = (MAP_IMAGE_SIZE + draw.textlength(title, font=title_font)) / 2
+    stamp_y = band_y if title_right < stamp_x - draw.textlength(stamp, font=stamp_font) - 10 else band_y + 30
+    draw.text((stamp_x, stamp_y), stamp, fill='#AAAAAA', font=stamp_font, anchor='rm')
+
+    buf = io.BytesIO()
+    canvas.save(buf, format='PNG')
+    return buf.getvalue()
+
 
 if __name__ == "__main__":
-    capture_market_map()
+    if MAP_MODE == 'native':
+        native_market_map()
+    else:
+        capture_market_map()
@@ -1,23 +1,11 @@
-import yfinance as yf
-import requests
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import numpy as np
-from matplotlib.patches import Wedge, FancyBboxPatch, Circle
 from datetime import datetime
 import json
-import platform
-import matplotlib
+import math
+import os
 import time
-from notifier import notify
+from plot_style import setup_fonts, figure_to_png, write_png
 
-# ── 폰트 ──────────────────────────────────────────────────
-system_name = platform.system()
-if system_name == 'Darwin':
-    matplotlib.rc('font', family='AppleGothic')
-elif system_name == 'Linux':
-    matplotlib.rc('font', family='NanumGothic')
-matplotlib.rcParams['axes.unicode_minus'] = False
+# requests/matplotlib/저장소 모듈은 실제로 조회하거나 그릴 때 가져옴 (import 시간 단축)
 
 # ── 다크 모드 팔레트 ──────────────────────────────────────────
 BG      = '#161C22'
@@ -48,15 +36,9 @@ def score_text_color(s):
     else: return '#7ED957'
 
 # ── 데이터 수집 ────────────────────────────────────────────
-CACHE_FILE = 'fg_cache.json'
+CACHE_FILE = 'fg_cache.json'   # 예전 방식의 스냅샷 (상태 파일이 없을 때만 마지막 폴백으로 읽음)
 
-BROWSER_HEADERS = {
-    'User-Agent':      'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
-    'Accept':          'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-    'Accept-Language': 'en-US,en;q=0.9',
-    'Accept-Encoding': 'gzip, deflate, br',
-    'Connection':      'keep-alive',
-}
+_fg_client = None
 
 def _parse_fg_response(d):
     fg   = d['fear_and_greed']
@@ -70,51 +52,49 @@ def _parse_fg_response(d):
         'cached':     False,
     }
 
-def fetch_fear_and_greed(max_retries=3):
-    api_url  = "https://production.dataviz.cnn.io/index/fearandgreed/graphdata"
-    page_url = "https://edition.cnn.com/markets/fear-and-greed"
+def fear_greed_client():
+    """프로세스 안에서 하나의 클라이언트(데워진 세션)를 공유"""
+    global _fg_client
+    if _fg_client is None:
+        from fear_greed import FearGreedClient
+        _fg_client = FearGreedClient()
+    return _fg_client
+
+def fetch_fear_and_greed(max_retries=3, client=None):
+    client = client or fear_greed_client()
 
     for attempt in range(1, max_retries + 1):
         try:
-            session = requests.Session()
-            # ① 실제 브라우저처럼 CNN 페이지 먼저 방문 → 쿠키 획득
-            session.get(page_url, headers=BROWSER_HEADERS, timeout=10)
-            # ② 쿠키가 담긴 세션으로 API 호출
-            api_headers = dict(BROWSER_HEADERS)
-            api_headers.update({
-                'Accept':  'application/json, text/plain, */*',
-                'Referer': page_url,
-                'Origin':  'https://edition.cnn.com',
-            })
-            r = session.get(api_url, headers=api_headers, timeout=10)
-            if not r.text.strip():
-                raise ValueError("빈 응답")
-            result = _parse_fg_response(r.json())
-            # 성공 시 캐시 저장
-            with open(CACHE_FILE, 'w') as f:
-                json.dump(result, f)
-            print(f"Fear & Greed 조회 성공 (시도 {attempt}회, score={result['score']})")
+            result = _parse_fg_response(client.fetch())
+            print(f"Fear & Greed 조회 성공 (시도 {attempt}회, score={result['score']}, {client.stats})")
             return result
         except Exception as e:
             print(f"Fear & Greed 시도 {attempt}/{max_retries} 실패: {e}")
             if attempt < max_retries:
                 time.sleep(2)
 
-    # 모든 시도 실패 → 캐시 사용
+    # 모든 시도 실패 → 마지막으로 저장된 응답, 그것도 없으면 예전 스냅샷 사용
     try:
-        with open(CACHE_FILE, 'r') as f:
-            cached = json.load(f)
-            cached['cached'] = True
-            print(f"Fear & Greed 캐시 사용 (score={cached['score']})")
-            return cached
+        data = client.last_data()
+        if data:
+            cached = _parse_fg_response(data)
+        else:
+            with open(CACHE_FILE, 'r') as f:
+                cached = json.load(f)
+        cached['cached'] = True
+        print(f"Fear & Greed 캐시 사용 (score={cached['score']})")
+        return cached
     except Exception:
         print("Fear & Greed 캐시도 없음")
         return None
 
 
-def fetch_vix():
+def fetch_vix(store=None):
+    from data_source import slice_period, ticker_frame
+    from ohlcv_store import OHLCVStore
     try:
-        h = yf.Ticker("^VIX").history(period="5d")
+        store = store or OHLCVStore()
+        h = ticker_frame(slice_period(store.panel(['^VIX']), "5d"), '^VIX')
         if h.empty: return None
         cur  = h['Close'].iloc[-1]
         prev = h['Close'].iloc[-2] if len(h)>=2 else cur
@@ -126,8 +106,16 @@ def fetch_vix():
         return None
 
 # ── 게이지 ─────────────────────────────────────────────────
+GAUGE_R = (34, 21)        # 게이지 바깥/안쪽 반지름
+
 def draw_gauge(ax, cx, cy, score, prev_score, rating, prev_rating):
-    outer_r, inner_r = 34, 21
+    draw_gauge_static(ax, cx, cy)
+    draw_gauge_needle(ax, cx, cy, score, prev_score, rating, prev_rating)
+
+def draw_gauge_static(ax, cx, cy):
+    """매번 같은 부분: 트랙 배경과 5구간 세그먼트/라벨"""
+    from matplotlib.patches import Wedge
+    outer_r, inner_r = GAUGE_R
 
     # 트랙 배경 (어두운 회색)
     ax.add_patch(Wedge((cx,cy), outer_r+0.5, 0, 180,
@@ -142,18 +130,22 @@ def draw_gauge(ax, cx, cy, score, prev_score, rating, prev_rating):
                            width=outer_r-inner_r,
                            facecolor=color, edgecolor='white',
                            linewidth=2.5, alpha=1.0, zorder=3))
-        mid_rad = np.radians((sd+ed)/2)
+        mid_rad = math.radians((sd+ed)/2)
         # 글자를 표(웨지) 안으로 이동: (outer_r + inner_r) / 2
         mid_r = (outer_r + inner_r) / 2
-        lx = cx + mid_r * np.cos(mid_rad)
-        ly = cy + mid_r * np.sin(mid_rad)
+        lx = cx + mid_r * math.cos(mid_rad)
+        ly = cy + mid_r * math.sin(mid_rad)
         ax.text(lx, ly, lbl, ha='center', va='center',
                 fontsize=10.5, color='#000000', fontweight='black', zorder=5)
 
+def draw_gauge_needle(ax, cx, cy, score, prev_score, rating, prev_rating):
+    """실행마다 바뀌는 부분: 바늘, 점수, 등급, 전일 비교"""
+    from matplotlib.patches import Circle
+
     # 바늘
-    angle_rad = np.radians(180-(score/100)*180)
-    nx = cx+28*np.cos(angle_rad)
-    ny = cy+28*np.sin(angle_rad)
+    angle_rad = math.radians(180-(score/100)*180)
+    nx = cx+28*math.cos(angle_rad)
+    ny = cy+28*math.sin(angle_rad)
     ax.annotate('', xy=(nx,ny), xytext=(cx,cy),
                 arrowprops=dict(arrowstyle='->', color='#FFFFFF',
                                 lw=5.0, mutation_scale=22), zorder=7)
@@ -178,34 +170,24 @@ def draw_gauge(ax, cx, cy, score, prev_score, rating, prev_rating):
             fontweight='bold', color=SUBTEXT, zorder=10)
 
 # ── VIX 섹션 ──────────────────────────────────────────────
-def draw_vix_content(ax, cx, cy, vix):
-    cur = vix['current']
-    chg = vix['change']
-    pct = vix['pct']
-    vc_text = score_text_color(100 - min(cur/80*100, 100))
+VIX_TOTAL = 80            # 단계 바 오른쪽 끝 값
 
-    arrow = '▲' if chg >= 0 else '▼'
-    cc    = '#FF6B6B' if chg >= 0 else '#66AAFF'
-
-    # 수치
-    ax.text(cx, cy+11, f'{cur:.2f}',
-            ha='center', va='center', fontsize=55,
-            fontweight='black', color=vc_text, zorder=5)
-    ax.text(cx, cy+2.0, f'{arrow}  {abs(chg):.2f}  ({abs(pct):.2f}%)',
-            ha='center', va='center', fontsize=20,
-            fontweight='bold', color=cc, zorder=5)
+def _vix_bar(cx, cy):
+    """단계 바 위치 (x, 너비, y, 높이)"""
+    return cx-44, 88, cy-8, 7
 
-    # 단계 바
+def draw_vix_band(ax, cx, cy):
+    """매번 같은 부분: VIX 단계 바와 라벨"""
+    from matplotlib.patches import FancyBboxPatch
     segs = [(0,15,VIX_SEG[0],'안정\n(~15)'),
             (15,25,VIX_SEG[1],'보통\n(~25)'),
             (25,35,VIX_SEG[2],'주의\n(~35)'),
             (35,80,VIX_SEG[3],'공포\n(35+)')]
-    total = 80
-    bx, bw, by, bh = cx-44, 88, cy-8, 7
+    bx, bw, by, bh = _vix_bar(cx, cy)
 
     for lo, hi, color, label in segs:
-        sw = (hi-lo)/total*bw
-        sx = bx+(lo/total)*bw
+        sw = (hi-lo)/VIX_TOTAL*bw
+        sx = bx+(lo/VIX_TOTAL)*bw
         rect = FancyBboxPatch((sx+0.15, by), sw-0.3, bh,
                               boxstyle='round,pad=0.3',
                               facecolor=color, edgecolor='white',
@@ -215,9 +197,28 @@ def draw_vix_content(ax, cx, cy, vix):
                 ha='center', va='center', fontsize=12.5,
                 color='#000000', fontweight='black', zorder=4)
 
+def draw_vix_content(ax, cx, cy, vix):
+    """실행마다 바뀌는 부분: 현재값, 전일 대비, 단계 바 위 마커"""
+    cur = vix['current']
+    chg = vix['change']
+    pct = vix['pct']
+    vc_text = score_text_color(100 - min(cur/80*100, 100))
+
+    arrow = '▲' if chg >= 0 else '▼'
+    cc    = '#FF6B6B' if chg >= 0 else '#66AAFF'
+
+    # 수치
+    ax.text(cx, cy+11, f'{cur:.2f}',
+            ha='center', va='center', fontsize=55,
+            fontweight='black', color=vc_text, zorder=5)
+    ax.text(cx, cy+2.0, f'{arrow}  {abs(chg):.2f}  ({abs(pct):.2f}%)',
+            ha='center', va='center', fontsize=20,
+            fontweight='bold', color=cc, zorder=5)
+
     # 현재 마커
-    clamped = min(cur, 80)
-    mx = bx+(clamped/total)*bw
+    bx, bw, by, bh = _vix_bar(cx, cy)
+    clamped = min(cur, VIX_TOTAL)
+    mx = bx+(clamped/VIX_TOTAL)*bw
     ax.annotate('', xy=(mx, by+bh+0.4), xytext=(mx, by+bh+4.5),
                 arrowprops=dict(arrowstyle='->', color='#FFFFFF',
                                 lw=2.2, mutation_scale=12), zorder=6)
@@ -225,34 +226,169 @@ def draw_vix_content(ax, cx, cy, vix):
             ha='center', va='bottom', fontsize=14,
             fontweight='black', color='#FFFFFF', zorder=6)
 
+# ── 1년 추이 ───────────────────────────────────────────────
+TREND_SPACE = 24          # 하단 추이 그래프에 내줄 높이 (본문 100 기준 좌표)
+
+def draw_trend(fig, trend, bottom, height):
+    """Fear & Greed(왼쪽 축)와 VIX(오른쪽 축) 최근 1년 추이를 그림 영역 하단 띠에 그림"""
+    import matplotlib.dates as mdates
+    ax = fig.add_axes([0.07, bottom, 0.86, height])
+    ax.set_facecolor(CARD)
+    for side in ax.spines.values():
+        side.set_color(DIVIDER)
+    # 공포/탐욕 구간 배경
+    for (lo, hi), color in zip(FG_RNG, FG_SEG):
+        ax.axhspan(lo, hi, color=color, alpha=0.10, lw=0)
+    fg = trend['fg'].dropna()
+    ax.plot(fg.index, fg.values, color='#FFD700', lw=1.6, label='Fear & Greed')
+    ax.set_ylim(0, 100)
+    ax.set_yticks([0, 25, 50, 75, 100])
+
+    vax = ax.twinx()
+    vix = trend['vix'].dropna()
+    vax.plot(vix.index, vix.values, color='#66B2FF', lw=1.2, label='VIX')
+    if len(vix):
+        vax.set_ylim(0, max(40, vix.max() * 1.1))
+
+    for a, color in ((ax, '#FFD700'), (vax, '#66B2FF')):
+        a.tick_params(axis='y', colors=color, labelsize=9, length=0)
+        a.tick_params(axis='x', colors=SUBTEXT, labelsize=9, length=0)
+    ax.xaxis.set_major_locator(mdates.MonthLocator(interval=2))
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%y.%m'))
+    ax.set_xlim(trend.index[0], trend.index[-1])
+    ax.text(0.01, 0.96, '최근 1년 추이', transform=ax.transAxes, ha='left', va='top',
+            fontsize=10, fontweight='bold', color=TEXT, zorder=5)
+    lines = ax.get_lines() + vax.get_lines()
+    ax.legend(lines, [l.get_label() for l in lines], loc='upper right', fontsize=8.5, frameon=False,
+              labelcolor=TEXT, ncol=2)
+
+
 # ── 메인 ──────────────────────────────────────────────────
 def create_sentiment_image(output_path='sentiment_monitoring.png'):
+    from ohlcv_store import OHLCVStore
+    from sentiment_history import merge_history, trend_window
+    store = OHLCVStore()
     fg  = fetch_fear_and_greed()
-    vix = fetch_vix()
-    now_str = datetime.now().strftime('%Y-%m-%d %H:%M')
+    vix = fetch_vix(store)
+    history = merge_history(fear_greed_client().last_data(), store.panel(['^VIX'])['Close']['^VIX'])
+    return render_sentiment_image(fg, vix, output_path, trend_window(history))
+
 
-    # 정사각 figure → equal aspect → 100x100 완벽 매핑
-    fig, ax = plt.subplots(figsize=(10.8, 10.8), dpi=100)
+def render_sentiment_image(fg, vix, output_path='sentiment_monitoring.png', trend=None):
+    """이미 조회한 Fear & Greed / VIX 값(+ 추이 시계열)으로 이미지만 생성"""
+    write_png(render_sentiment_png(fg, vix, trend), output_path)
+    print(f"이미지 저장 완료: {output_path}")
+    return output_path
+
+
+# ── 정적 배경 템플릿 ───────────────────────────────────────
+# 제목/게이지 구간/구분선/VIX 단계 바는 팔레트와 배치가 같으면 매번 같은 그림이므로
+# 한 번 그려 PNG 로 캐시하고, 실행마다 그 위에 바늘/수치만 그림
+TEMPLATE_CACHE = os.getenv('SENTIMENT_TEMPLATE', '1') != '0'   # '0' 이면 매번 전체를 다시 그림
+TEMPLATE_DIR = os.path.join(os.getenv('STORE_DIR', 'data_store'), 'render_cache')
+
+_templates = {}
+
+def _sentiment_canvas(pad):
+    """정사각 figure → equal aspect → 100x100 완벽 매핑 (pad 만큼 좌우/아래로 넓힘)"""
+    import matplotlib
+    from matplotlib.figure import Figure
+    setup_fonts()
+    matplotlib.rcParams['axes.unicode_minus'] = False
+
+    # pyplot 전역 상태를 쓰지 않는 Figure 객체로 그려 다른 스테이지와 동시에 실행해도 안전
+    fig = Figure(figsize=(10.8, 10.8), dpi=100)
+    ax = fig.subplots()
     fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
     fig.patch.set_facecolor(BG)
     ax.set_facecolor(BG)
-    ax.set_xlim(0, 100)
-    ax.set_ylim(0, 100)
+    ax.set_xlim(-pad / 2, 100 + pad / 2)
+    ax.set_ylim(-pad, 100)
     ax.set_aspect('equal')
     ax.axis('off')
+    return fig, ax
 
-    # ── 제목 (Fear & Greed Index) ──────────────────────────
+def draw_static_layers(ax, has_fg, has_vix):
+    """값과 무관한 레이어 (제목, 게이지 트랙/구간, 구분선, VIX 제목/단계 바)"""
     ax.text(50, 97.0, 'Fear & Greed Index',
             ha='center', va='center', fontsize=20,
             fontweight='black', color=TITLE, zorder=5)
+    if has_fg:
+        draw_gauge_static(ax, 50, 57)
+    ax.plot([4, 96], [38.0, 38.0], color=DIVIDER, linewidth=1.5, zorder=4)
+    ax.text(50, 34.0, 'VIX  변동성 지수',
+            ha='center', va='center', fontsize=20,
+            fontweight='black', color=TEXT, zorder=5)
+    if has_vix:
+        draw_vix_band(ax, 50, 14)
+
+def _template_key(pad, has_fg, has_vix):
+    """팔레트/라벨/배치/글꼴/matplotlib 버전이 바뀌면 키도 바뀜"""
+    import hashlib
+    import matplotlib
+    spec = [BG, DIVIDER, TITLE, TEXT, FG_SEG, FG_LBL, FG_RNG, VIX_SEG, GAUGE_R, VIX_TOTAL,
+            pad, has_fg, has_vix, list(matplotlib.rcParams['font.family']), matplotlib.__version__]
+    return hashlib.sha1(json.dumps(spec).encode()).hexdigest()[:16]
+
+def static_background(pad, has_fg, has_vix):
+    """정적 레이어만 그린 1080x1080 RGBA 이미지 (프로세스 메모리 → 디스크 캐시 → 새로 그림 순)"""
+    from PIL import Image
+
+    key = _template_key(pad, has_fg, has_vix)
+    if key in _templates:
+        return _templates[key]
+    path = os.path.join(TEMPLATE_DIR, f'sentiment_{key}.png')
+    try:
+        with Image.open(path) as img:
+            bg = img.convert('RGBA')
+    except (OSError, ValueError):
+        fig, ax = _sentiment_canvas(pad)
+        draw_static_layers(ax, has_fg, has_vix)
+        bg = _figure_rgba(fig)
+        os.makedirs(TEMPLATE_DIR, exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        bg.save(tmp, format='PNG')
+        os.replace(tmp, path)
+    _templates[key] = bg
+    return bg
+
+def _figure_rgba(fig):
+    """figure 를 한 번만 그려 RGBA 이미지로 (savefig 의 tight bbox 계산용 추가 렌더링 없음)"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from PIL import Image
+    canvas = FigureCanvasAgg(fig)
+    canvas.draw()
+    return Image.frombuffer('RGBA', canvas.get_width_height(), canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1).copy()
+
+def render_sentiment_png(fg, vix, trend=None, template=None):
+    """Fear & Greed / VIX 값으로 이미지를 그려 PNG 바이트로 반환 (렌더링 워커 프로세스에서도 호출)
+
+    trend(날짜 x fg/vix DataFrame)가 있으면 본문을 줄이고 하단에 추이 그래프를 그림
+    template: 캐시된 정적 배경 위에 동적 레이어만 그려 합성할지 여부 (None 이면 TEMPLATE_CACHE)
+    """
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M')
+    has_trend = trend is not None and len(trend) > 1
+    use_template = TEMPLATE_CACHE if template is None else template
+    # 추이 그래프가 들어갈 때는 좌표 범위를 넓혀 본문 전체를 같은 비율로 줄이고 아래쪽을 비워 둠
+    pad = TREND_SPACE if has_trend else 0
+    fig, ax = _sentiment_canvas(pad)
+
+    if use_template:
+        # 동적 레이어만 투명 배경에 그린 뒤 캐시된 배경 위에 합성
+        fig.patch.set_facecolor('none')
+        ax.set_facecolor('none')
+    else:
+        draw_static_layers(ax, bool(fg), bool(vix))
+
+    # ── 조회 시각 ─────────────────────────────────────────
     ax.text(96, 97.0, f'조회 기준: {now_str}',
             ha='right', va='center', fontsize=10,
             fontweight='bold', color=SUBTEXT, zorder=5)
 
     # ── Fear & Greed 섹션 ──────────────────────────────────
     if fg:
-        draw_gauge(ax, 50, 57, fg['score'], fg['prev_score'],
-                   fg['rating'], fg['prev_rating'])
+        draw_gauge_needle(ax, 50, 57, fg['score'], fg['prev_score'],
+                          fg['rating'], fg['prev_rating'])
         if fg.get('cached'):
             ax.text(50, 40, '* 이전 저장 데이터 사용 중',
                     ha='center', va='center', fontsize=8.5,
@@ -262,14 +398,7 @@ def create_sentiment_image(output_path='sentiment_monitoring.png'):
                 ha='center', va='center', fontsize=12,
                 color=SUBTEXT, zorder=5)
 
-    # ── 구분선 ────────────────────────────────────────────
-    ax.plot([4, 96], [38.0, 38.0], color=DIVIDER, linewidth=1.5, zorder=4)
-
     # ── VIX 섹션 ──────────────────────────────────────────
-    ax.text(50, 34.0, 'VIX  변동성 지수',
-            ha='center', va='center', fontsize=20,
-            fontweight='black', color=TEXT, zorder=5)
-
     if vix:
         draw_vix_content(ax, 50, 14, vix)
     else:
@@ -277,13 +406,26 @@ def create_sentiment_image(output_path='sentiment_monitoring.png'):
                 ha='center', va='center', fontsize=12,
                 color=SUBTEXT, zorder=5)
 
-    plt.savefig(output_path, dpi=100,
-                bbox_inches='tight', pad_inches=0.05)
-    plt.close()
-    print(f"이미지 저장 완료: {output_path}")
-    return output_path
+    if has_trend:
+        span = 100 + pad
+        draw_trend(fig, trend, bottom=pad * 0.12 / span, height=pad * 0.8 / span)
+
+    if not use_template:
+        return figure_to_png(fig, dpi=100, bbox_inches='tight', pad_inches=0.05)
+
+    import io
+    from PIL import Image
+    img = Image.alpha_composite(static_background(pad, bool(fg), bool(vix)), _figure_rgba(fig))
+    # savefig(bbox_inches='tight', pad_inches=0.05) 와 같은 크기: 축이 figure 전체를 채우므로 사방 5px 여백
+    border = round(0.05 * fig.dpi)
+    out = Image.new('RGB', (img.width + 2 * border, img.height + 2 * border), BG)
+    out.paste(img.convert('RGB'), (border, border))
+    buf = io.BytesIO()
+    out.save(buf, format='PNG')
+    return buf.getvalue()
 
 if __name__ == '__main__':
+    from notifier import notify
     output = create_sentiment_image('sentiment_monitoring.png')
     notify(
         image_paths=[output],
@@ -1,42 +1,9 @@
-import yfinance as yf
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib
 from datetime import datetime
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
-from dotenv import load_dotenv
-import os
-import platform
-from notifier import notify
+from plot_style import write_png
+from table_render import TableSpec, cell_style, render_table
+from report_records import build_records, is_missing
 
-#OS판별
-system_name = platform.system()
-
-if system_name == 'Darwin':  # macOS
-    matplotlib.rc('font', family='AppleGothic')
-elif system_name == 'Linux':  # GitHub Actions 등 Ubuntu 환경
-    matplotlib.rc('font', family='NanumGothic')
-
-# macOS 기본 한글 폰트 설정 (AppleGothic)
-# matplotlib.rc('font', family='AppleGothic')
-# matplotlib.rc('font', family='NanumGothic')
-
-# 평균 MDD, 최대 MDD 계산 예시 (calc_mdd.py 참고)
-def daily_mdd(series):
-    max_so_far = series.expanding().max()
-    mdd = ((series - max_so_far) / max_so_far) * 100
-    return mdd
-
-def calc_avg_mdd(ticker):
-    stock = yf.Ticker(ticker)
-    hist = stock.history(period="max")
-    mdd_daily = daily_mdd(hist['Close'])
-    avg_mdd = mdd_daily.mean()
-    return avg_mdd
+# pandas/matplotlib/저장소 모듈은 표를 실제로 만들 때 가져옴 (import 시간 단축)
 
 # 여러 종목 코드 리스트 (지수/ETF/원자재/주식)
 ticker_name_map = {
@@ -71,280 +38,106 @@ ticker_groups = [
     }
 ]
 
-# yfinance로 종목 정보 가져오기
-def fetch_stock_info(ticker):
-    stock = yf.Ticker(ticker)
-    info = stock.info
-    # 한글명 매핑 우선 적용
-    name = ticker_name_map.get(ticker, info.get('shortName', ticker))
-    time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-    # 오늘, 하루전, 1주일전, 연초, 20일평균, 최고점
-    today = datetime.now().date()
-    start_of_year = datetime(today.year, 1, 1).date()
-    hist = stock.history(period="1y")
-    if hist.empty:
-        print(f"데이터가 없습니다: {ticker}")
-        return
-
-    # 현재가 및 기준일자
-    price = hist['Close'].iloc[-1]
-    price_date = hist.index[-1].strftime('%Y-%m-%d')
-
-    # 전일대비 변동율
-    prev_day_price = hist['Close'].iloc[-2]
-    day_change = ((price - prev_day_price) / prev_day_price) * 100
-    # RSI(14) 계산
-    def calc_rsi(series, period=14):
-        delta = series.diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        avg_gain = gain.rolling(window=period, min_periods=period).mean()
-        avg_loss = loss.rolling(window=period, min_periods=period).mean()
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.iloc[-1]
-    rsi_14 = calc_rsi(hist['Close']) if len(hist) >= 14 else None
-
-    # 1주일전 주가
-    week_ago_idx = len(hist) - 6 if len(hist) > 5 else 0
-    week_ago_price = hist['Close'].iloc[week_ago_idx]
-
-    # 1주일 변화율
-    week_change = ((price - week_ago_price) / week_ago_price) * 100
-
-    # 20일평균
-    avg_20 = hist['Close'][-20:].mean() if len(hist) >= 20 else hist['Close'].mean()
-
-    # 60일평균
-    avg_60 = hist['Close'][-60:].mean() if len(hist) >= 60 else hist['Close'].mean()
-
-    # 연초 주가 (YTD 계산용)
-    # 1. 작년 마지막 거래일 종가 찾기
-    last_year_data = hist[hist.index.year < today.year]
-    
-    if not last_year_data.empty:
-        year_start_price = last_year_data['Close'].iloc[-1]
-        ytd_change = ((price - year_start_price) / year_start_price) * 100
-    else:
-        # 2. 작년 데이터가 없으면 올해 첫 데이터 사용
-        year_start_price_series = hist.loc[hist.index >= str(start_of_year), 'Close']
-        if not year_start_price_series.empty:
-            year_start_price = year_start_price_series.iloc[0]
-            ytd_change = ((price - year_start_price) / year_start_price) * 100
-        else:
-            year_start_price = None
-            ytd_change = None
-
-    # 최고점, 최고점 날짜, MDD
-    max_price = hist['Close'].max()
-    max_price_idx = hist['Close'].idxmax()
-    max_price_date = max_price_idx.strftime('%Y-%m-%d')
-    mdd = ((price - max_price) / max_price) * 100
-
-    # 20일 MDD 계산
-    max_20 = hist['Close'][-20:].max() if len(hist) >= 20 else hist['Close'].max()
-    mdd_20 = ((price - max_20) / max_20) * 100
-
-    # 티커 칼럼에 주요 지수/원자재는 한글명으로 노출
-    display_ticker = ticker_name_map.get(ticker, ticker)
+# 레코드 한 개를 표 한 줄(문자열)로 변환 (포맷은 그림을 그릴 때만 적용)
+def format_stock_row(rec):
     return {
-        '티커': display_ticker, #0
-        '현재가': f"{price:,.1f}",
-        '전일대비': f"{day_change:.1f}%", #2
-        'RSI(14)': f"{rsi_14:.1f}" if rsi_14 else 'N/A', #3
-        '20일평균': f"{avg_20:.1f}", #4
-        '60일평균': f"{avg_60:.1f}", #5
-        '현재MDD': f"{mdd:.1f}%", #6
-        '평균MDD': f"{calc_avg_mdd(ticker):.1f}%", #7
-        '연초대비': f"{ytd_change:.1f}%" if year_start_price else 'N/A', #8
+        '티커': rec.name, #0
+        '현재가': f"{rec.price:,.1f}",
+        '전일대비': f"{rec.day_change:.1f}%", #2
+        'RSI(14)': f"{rec.rsi_14:.1f}" if not is_missing(rec.rsi_14) else 'N/A', #3
+        '20일평균': f"{rec.avg_20:.1f}", #4
+        '60일평균': f"{rec.avg_60:.1f}", #5
+        '현재MDD': f"{rec.mdd:.1f}%", #6
+        '평균MDD': f"{rec.avg_mdd:.1f}%", #7
+        '연초대비': f"{rec.ytd:.1f}%" if not is_missing(rec.ytd) else 'N/A', #8
     }
 
 
-if __name__ == "__main__":
-    results = []
-    row_colors = [] # 각 행의 배경색을 저장할 리스트
+# 표에 들어가는 전체 티커 (오케스트레이터가 다른 리포트 티커와 합쳐 한 번에 조회)
+STOCK_TICKERS = [ticker for group in ticker_groups for ticker in group['tickers']]
 
-    for group in ticker_groups:
-        group_color = group['color']
-        for ticker in group['tickers']:
-            try:
-                info = fetch_stock_info(ticker)
-                if info:
-                    results.append(info)
-                    row_colors.append(group_color)
-            except Exception as e:
-                print(f"{ticker} 오류: {e}")
-                
-    if results:
-        df = pd.DataFrame(results)
-        print(df.to_markdown(index=False))
 
-    # 표만 이미지 전체에 꽉 차게 출력 (여백 최소화)
-    fig, ax = plt.subplots(figsize=(10.8, 10.8), dpi=100)
-    fig.patch.set_facecolor('#f8f9fa')
-    ax.axis('off')
+def stock_records(ind, groups=None):
+    """compute_indicators 결과 → 표 순서대로 정렬된 IndicatorRecord 목록 (groups 기본값: ticker_groups)"""
+    groups = ticker_groups if groups is None else groups
+    # 티커 칼럼에 주요 지수/원자재는 한글명으로 노출
+    entries = [(group['name'], ticker, ticker_name_map.get(ticker, ticker))
+               for group in groups for ticker in group['tickers']]
+    return build_records(ind, entries, 'stock')
+
+
+def create_stock_image(ind=None, output_path='stock_monitoring_instagram.png'):
+    """종목 표 이미지 생성 (ind: compute_indicators 결과, 없으면 저장소에서 직접 조회/계산)"""
+    if ind is None:
+        from ohlcv_store import OHLCVStore
+        from indicators import compute_indicators
+        # 로컬 저장소를 마지막 저장일 이후 구간만 일괄 갱신한 뒤, 전체 티커 지표를 한 번에 계산
+        ind = compute_indicators(OHLCVStore().panel(STOCK_TICKERS)['Close'])
+
+    png = render_stock_png(stock_records(ind))
+    if png is None:
+        return None
+    write_png(png, output_path)
+    print(f'인스타그램용 이미지가 {output_path}로 저장되었습니다.')
+    return output_path
+
+
+RED, BLUE, DEFAULT = '#d32f2f', '#1976d2', '#222'
+
+
+def _stock_styles(rec, bg):
+    """레코드 수치로 한 행의 셀 스타일을 바로 계산 (표시 문자열을 다시 해석하지 않음)"""
+    right = dict(bg=bg, ha='right')
+    styles = [cell_style(bg, weight='black'), cell_style(weight='black', **right)]
+    # 전일대비: 하락 파랑 / 상승 빨강
+    styles.append(cell_style(color=BLUE if rec.day_change < 0 else RED, **right) if not is_missing(rec.day_change)
+                  else cell_style(**right))
+    # RSI: 과매수(70 이상) 빨강, 과매도(30 이하) 파랑
+    if rec.rsi_14 >= 70:
+        styles.append(cell_style(color=RED, weight='bold', **right))
+    elif rec.rsi_14 <= 30:
+        styles.append(cell_style(color=BLUE, weight='bold', **right))
+    else:
+        styles.append(cell_style(**right))
+    # 20/60일 평균이 현재가보다 높으면 빨강
+    for avg in (rec.avg_20, rec.avg_60):
+        styles.append(cell_style(color=RED, weight='heavy', **right) if avg > rec.price else cell_style(**right))
+    # 현재MDD -30% 이하, 평균MDD가 현재MDD보다 크면 빨강
+    styles.append(cell_style(color=RED, weight='heavy', **right) if rec.mdd <= -30 else cell_style(**right))
+    styles.append(cell_style(color=RED, weight='heavy', **right) if rec.avg_mdd > rec.mdd else cell_style(**right))
+    # 연초대비: 상승 빨강 / 하락 파랑
+    styles.append(cell_style(color=RED if rec.ytd > 0 else BLUE, **right) if not is_missing(rec.ytd)
+                  else cell_style(**right))
+    return styles
+
+
+def build_stock_table(records, groups=None):
+    """레코드로 종목 표의 텍스트/스타일 행렬(TableSpec) 생성 (그룹 배경색은 groups 기본값 ticker_groups 기준)"""
+    import pandas as pd
+    groups = ticker_groups if groups is None else groups
+    if not records:
+        print("데이터가 없습니다.")
+        return None
+
+    group_colors = {group['name']: group['color'] for group in groups}
+    columns = list(format_stock_row(records[0]).keys())
+    rows = [list(format_stock_row(rec).values()) for rec in records]
+    styles = [_stock_styles(rec, group_colors.get(rec.group, '#ffffff')) for rec in records]
+    print(pd.DataFrame(rows, columns=columns).to_markdown(index=False))
 
     now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    nrows, ncols = df.shape
-    created_row = ["" for _ in range(ncols)]
-    table_data = [created_row, df.columns.tolist()] + df.values.tolist()
-    # bbox: [left, bottom, right, top] - 표가 이미지에 최대한 꽉 차게
-    table_bbox = [0.01, 0.01, 0.99, 0.99]
-    table = ax.table(cellText=table_data, colLabels=None, loc='center', cellLoc='center', bbox=table_bbox)
-    table.auto_set_font_size(False)
-    table.set_fontsize(11)
-    table.scale(1.0, 1.0)
-
-    # 표 스타일 개선 및 생성날짜 행 통합, border 제거
-    for (row, col), cell in table.get_celld().items():
-        # 생성날짜 행(맨 윗줄, row==0): 전체 통합처럼 보이게, 모든 셀 visible, cell 높이 최소화
-        if row == 0:
-            cell.set_edgecolor('none')
-            cell.set_facecolor('#fff')
-            cell.set_text_props(ha='right', va='center', color='blue', fontsize=10, weight='black')
-            cell.set_height(0.07)
-            if col == ncols-1:
-                cell.get_text().set_text(f"조회기준일시: {now_str}")
-            else:
-                cell.get_text().set_text("")
-        # 칼럼명 행(row==1): cell 높이 최소화
-        elif row == 1:
-            cell.set_facecolor('#444444')
-            cell.set_fontsize(10)
-            cell.set_text_props(weight='black', color='#fff', ha='center')
-            cell.set_edgecolor('#ddd')
-            cell.set_height(0.09)
-        else:
-            cell.set_edgecolor('#ddd')
-            cell.set_height(0.09)
-            
-            # 데이터 행 (row >= 2)
-            # row_colors 리스트는 0부터 시작하므로, table row index 2는 row_colors[0]에 해당
-            data_row_idx = row - 2
-            if 0 <= data_row_idx < len(row_colors):
-                cell.set_facecolor(row_colors[data_row_idx])
-            else:
-                cell.set_facecolor('#ffffff') # 기본값
+    return TableSpec(columns, rows, styles, caption=f"조회기준일시: {now_str}")
 
-            cell.set_fontsize(11)
 
-            # 정렬 기준: 텍스트(티커)는 중앙, 숫자는 우측
-            # 컬럼 인덱스: 0(티커), 1(현재가), 2(전일대비), 3(RSI), 4(20일평균), 5(60일평균), 6(현재MDD), 7(평균MDD), 8(연초대비)
-            align = 'right' if col in [1,2,3,4,5,6,7,8] else 'center'
-            
-            if col in [0,1]:
-                cell.set_text_props(weight='black')
-            if col == 2: # 전일대비
-                try:
-                    text = cell.get_text().get_text()
-                    val = float(text.replace('%', ''))
-                    color = '#1976d2' if val < 0 else '#d32f2f'
-                except:
-                    color = '#222'
-                cell.set_text_props(color=color, ha=align)
-            elif col == 3: # RSI
-                try:
-                    rsi = float(cell.get_text().get_text())
-                    if rsi >= 70:
-                        cell.set_text_props(color='#d32f2f', weight='bold', ha=align)
-                    elif rsi <= 30:
-                        cell.set_text_props(color='#1976d2', weight='bold', ha=align)
-                    else:
-                        cell.set_text_props(color='#222', ha=align)
-                except:
-                    cell.set_text_props(color='#222', ha=align)
-            elif col == 4: # 20일평균
-                try:
-                    avg_20 = float(cell.get_text().get_text())
-                    price = float(table[(row,1)].get_text().get_text().replace(',',''))
-                    if avg_20 > price:
-                        cell.set_text_props(color='#d32f2f', weight='heavy', ha=align)
-                    else:
-                        cell.set_text_props(color='#222', ha=align)
-                except:
-                    cell.set_text_props(color='#222', ha=align)
-            elif col == 5: # 60일평균
-                try:
-                    avg_60 = float(cell.get_text().get_text())
-                    price = float(table[(row,1)].get_text().get_text().replace(',',''))
-                    if avg_60 > price:
-                        cell.set_text_props(color='#d32f2f', weight='heavy', ha=align)
-                    else:
-                        cell.set_text_props(color='#222', ha=align)
-                except:
-                    cell.set_text_props(color='#222', ha=align)
-            elif col == 6: # 현재MDD
-                try:
-                    text = cell.get_text().get_text()
-                    val = float(text.replace('%', ''))
-                    color = '#d32f2f' if val <= -30 else '#222'
-                    weight = 'heavy' if val <= -30 else 'normal'
-                except:
-                    color = '#222'
-                    weight = 'normal'
-                cell.set_text_props(color=color, weight=weight, ha=align)
-            elif col == 7: # 평균MDD
-                try:
-                    text6 = cell.get_text().get_text()
-                    val6 = float(text6.replace('%', ''))
-                    # col==6(현재MDD) 값 가져오기
-                    text5 = table[(row,6)].get_text().get_text()
-                    val5 = float(text5.replace('%', ''))
-                    color = '#d32f2f' if val6 > val5 else '#222'
-                    weight = 'heavy' if val6 > val5 else 'normal'
-                except:
-                    color = '#222'
-                    weight = 'normal'
-                cell.set_text_props(color=color, ha='right', weight=weight)
-            elif col == 8: # 연초대비
-                try:
-                    text = cell.get_text().get_text()
-                    val = float(text.replace('%', ''))
-                    color = '#d32f2f' if val > 0 else '#1976d2'
-                except:
-                    color = '#222'
-                cell.set_text_props(color=color, ha='right')
-            else:
-                cell.set_text_props(color='#222', ha=align)
+def render_stock_png(records, backend=None):
+    """레코드로 종목 표를 그려 PNG 바이트로 반환 (렌더링 워커 프로세스에서도 호출)"""
+    spec = build_stock_table(records)
+    if spec is None:
+        return None
+    return render_table(spec, backend)
 
-    # pad_inches=0으로 저장하여 여백 완전 제거
-    plt.savefig('stock_monitoring_instagram.png', bbox_inches='tight', pad_inches=0, dpi=100)
-    print('인스타그램용 이미지가 stock_monitoring_instagram.png로 저장되었습니다.')
 
-    
-    import subprocess
-    import sys
-    subprocess.run([sys.executable, 'monitor_index.py'], cwd=os.path.dirname(os.path.abspath(__file__)))
-
-    load_dotenv()
-    SENDER_EMAIL = os.getenv('SENDER_EMAIL')
-    APP_PASSWORD = os.getenv('APP_PASSWORD')
-    RECEIVER_EMAIL = os.getenv('RECEIVER_EMAIL')
-
-    # 시장 심리 지표 (Fear & Greed, VIX) 이미지 생성
-    from monitor_sentiment import create_sentiment_image
-    create_sentiment_image('sentiment_monitoring.png')
-
-    # 시장 맵 (Finviz) 이미지 생성
-    try:
-        from monitor_map import capture_market_map
-        capture_market_map('market_map.png')
-    except Exception as e:
-        print(f"시장 맵 생성 실패: {e}")
-
-    # 모든 이미지를 모아서 한 번에 전송
-    image_list = [
-        'stock_monitoring_instagram.png', 
-        'index_monitoring_instagram.png', 
-        'sentiment_monitoring.png'
-    ]
-    # 시장 맵이 성공적으로 생성되었을 때만 추가
-    if os.path.exists('market_map.png'):
-        image_list.append('market_map.png')
-
-    notify(
-        image_paths=image_list,
-        subject='[Daily Report] 주식 시장 모니터링',
-        body='오늘의 종목, 지수 및 시장 심리/지도 리포트입니다.'
-    )
+if __name__ == "__main__":
+    # 종목/지수 표, 시장 심리, 시장 맵을 한 프로세스에서 생성한 뒤 한 번에 전송
+    from report_pipeline import run_daily_report
+    run_daily_report()
@@ -1,12 +1,12 @@
 import os
-import smtplib
-import requests
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
+import json
+import random
+import threading
+import time
 from dotenv import load_dotenv
 
+from outbox import MAX_AGE_HOURS, Outbox
+
 load_dotenv()
 
 # ==========================================
@@ -16,76 +16,409 @@ ENABLE_EMAIL = False
 ENABLE_TELEGRAM = True
 # ==========================================
 
-def send_image_via_gmail(image_paths, subject="주식 모니터링 결과", body="첨부된 이미지를 확인하세요."):
+# ==========================================
+# [설정] 텔레그램 전송
+# TELEGRAM_CHAT_ID / RECEIVER_EMAIL 에 쉼표로 여러 수신처를 적으면 모두에게 보냄 (방송 모드)
+# ==========================================
+TELEGRAM_API_URL = os.getenv('TELEGRAM_API_URL', 'https://api.telegram.org')   # 로컬 스텁 서버로 바꿔 테스트
+MEDIA_GROUP_SIZE = 10     # sendMediaGroup 한 번에 보낼 수 있는 최대 사진 수 (텔레그램 제한)
+SEND_RETRIES = 3          # 429/5xx/연결 오류 시 재시도 횟수
+SEND_BACKOFF = 1.0        # 재시도 대기(초) = SEND_BACKOFF * 2^(시도-1) + 지터 (429 는 retry_after 우선)
+SEND_TIMEOUT = 60         # 요청 하나의 최대 대기(초)
+TELEGRAM_MSGS_PER_SEC = 25   # 봇 전체 초당 메시지 한도(공식 약 30)보다 약간 낮게 - 앨범의 사진 1장 = 메시지 1개
+BROADCAST_WORKERS = 4     # 방송 시 동시에 보내는 채팅방 수
+SMTP_HOST = os.getenv('SMTP_HOST', 'smtp.gmail.com')
+SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
+# 보낼 리포트를 SQLite 대기열(outbox.py)에 먼저 넣고 수신처별 결과를 기록
+# 실패한 곳은 `python notifier.py flush` 로 다시 렌더링하지 않고 재전송
+USE_OUTBOX = os.getenv('USE_OUTBOX', '1') != '0'
+# ==========================================
+
+
+def _env_list(name):
+    """쉼표로 구분한 환경변수 → 목록 (빈 값 제외, 순서 유지, 중복 제거)"""
+    return list(dict.fromkeys(v.strip() for v in (os.getenv(name) or '').split(',') if v.strip()))
+
+def _image_type(path):
+    """확장자로 MIME 타입 결정 (최적화 단계가 JPEG/WebP 로 바꾼 이미지도 올바르게 첨부)"""
+    import mimetypes
+    return mimetypes.guess_type(path)[0] or 'image/png'
+
+def _all_sent(errors):
+    return bool(errors) and all(error is None for error in errors.values())
+
+def _print_throughput(channel, errors, elapsed, extra=''):
+    ok = sum(error is None for error in errors.values())
+    rate = ok / elapsed if elapsed > 0 else float('inf')
+    print(f"[{channel}] 수신처 {len(errors)}곳 중 {ok}곳 성공, {elapsed:.2f}s ({rate:.1f}곳/s){extra}")
+    failed = [k for k, v in errors.items() if v is not None]
+    if failed:
+        print(f"  실패: {', '.join(failed)}")
+
+def _read_images(image_paths):
+    """존재하는 이미지만 (파일명, 바이트, MIME)로 읽어 둠 (재시도/대기열 저장에 그대로 씀)"""
+    images = []
+    for image_path in image_paths:
+        if not os.path.exists(image_path):
+            print(f"파일을 찾을 수 없습니다: {image_path}")
+            continue
+        with open(image_path, 'rb') as f:
+            images.append((os.path.basename(image_path), f.read(), _image_type(image_path)))
+    return images
+
+# ── 이메일 ─────────────────────────────────────────────────
+def _deliver_gmail(images, subject, body, recipients):
+    """메시지를 한 번 만들어 SMTP 연결 하나로 모든 수신자에게 (수신자마다 To 만 바꿔) 전송
+
+    images: [(파일명, 바이트, MIME)] → {수신자: None=성공 | 오류 메시지}
+    """
     sender_email = os.getenv('SENDER_EMAIL')
     app_password = os.getenv('APP_PASSWORD')
-    receiver_email = os.getenv('RECEIVER_EMAIL')
 
-    if not all([sender_email, app_password, receiver_email]):
+    if not all([sender_email, app_password, recipients]):
         print("이메일 설정 정보가 부족합니다. .env 파일을 확인해주세요.")
-        return
+        return dict.fromkeys(recipients, '이메일 설정 정보 부족')
+
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    from email.mime.base import MIMEBase
+    from email import encoders
 
     msg = MIMEMultipart()
     msg['From'] = sender_email
-    msg['To'] = receiver_email
     msg['Subject'] = subject
     msg.attach(MIMEText(body, 'plain'))
 
-    for idx, image_path in enumerate(image_paths):
-        if not os.path.exists(image_path):
-            print(f"파일을 찾을 수 없습니다: {image_path}")
-            continue
-        with open(image_path, 'rb') as f:
-            mime = MIMEBase('image', 'png', filename=os.path.basename(image_path))
-            mime.add_header('Content-Disposition', 'attachment', filename=os.path.basename(image_path))
-            mime.add_header('X-Attachment-Id', str(idx))
-            mime.add_header('Content-ID', f'<{idx}>')
-            mime.set_payload(f.read())
-            encoders.encode_base64(mime)
-            msg.attach(mime)
+    for idx, (name, content, content_type) in enumerate(images):
+        mime = MIMEBase(*content_type.split('/'), filename=name)
+        mime.add_header('Content-Disposition', 'attachment', filename=name)
+        mime.add_header('X-Attachment-Id', str(idx))
+        mime.add_header('Content-ID', f'<{idx}>')
+        mime.set_payload(content)
+        encoders.encode_base64(mime)
+        msg.attach(mime)
 
+    t0 = time.perf_counter()
+    errors = {}
     try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(sender_email, app_password)
-        server.send_message(msg)
-        server.quit()
-        print('이메일 전송 완료!')
+        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SEND_TIMEOUT)
+        try:
+            server.ehlo()
+            if server.has_extn('starttls'):
+                server.starttls()
+                server.ehlo()
+            server.login(sender_email, app_password)
+            for receiver_email in recipients:
+                del msg['To']
+                msg['To'] = receiver_email
+                try:
+                    server.send_message(msg, to_addrs=[receiver_email])
+                    errors[receiver_email] = None
+                except smtplib.SMTPRecipientsRefused as e:
+                    print(f"이메일 수신 거부 ({receiver_email}): {e}")
+                    errors[receiver_email] = str(e)
+        finally:
+            server.quit()
+        if len(recipients) == 1 and errors[recipients[0]] is None:
+            print('이메일 전송 완료!')
     except Exception as e:
         print(f"이메일 전송 실패: {e}")
+        for receiver_email in recipients:
+            errors.setdefault(receiver_email, str(e))
+    if len(recipients) > 1:
+        _print_throughput('이메일', errors, time.perf_counter() - t0, ' - SMTP 연결 1회')
+    return errors
+
+def send_image_via_gmail(image_paths, subject="주식 모니터링 결과", body="첨부된 이미지를 확인하세요.", recipients=None):
+    """이미지 파일을 이메일로 전송 (recipients 가 없으면 RECEIVER_EMAIL) → 전원 성공 여부"""
+    recipients = recipients or _env_list('RECEIVER_EMAIL')
+    return _all_sent(_deliver_gmail(_read_images(image_paths), subject, body, recipients))
+
+# ── 텔레그램 ───────────────────────────────────────────────
+_session = None
+_session_lock = threading.Lock()
+_pause_until = 0.0        # 429 를 받으면 모든 스레드가 retry_after 가 지날 때까지 보내지 않음
+
+def telegram_session():
+    """연결을 재사용하는 requests 세션 (프로세스에서 하나를 공유 → TLS 핸드셰이크 1회)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=BROADCAST_WORKERS)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+def telegram_call(token, method, data, files=None, retries=SEND_RETRIES):
+    """Bot API 호출 → 응답 JSON (ok=False 로 끝나면 마지막 응답, 연결 실패가 계속되면 예외)
+
+    429 는 응답의 parameters.retry_after 만큼, 5xx/연결 오류는 지수 백오프만큼 기다린 뒤 재시도
+    """
+    global _pause_until
+    import requests
+    url = f"{TELEGRAM_API_URL}/bot{token}/{method}"
+    for attempt in range(1, retries + 2):
+        pause = _pause_until - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+        wait = SEND_BACKOFF * 2 ** (attempt - 1) + random.uniform(0, 0.1)
+        try:
+            response = telegram_session().post(url, data=data, files=files, timeout=SEND_TIMEOUT)
+        except requests.RequestException as e:
+            if attempt > retries:
+                raise
+            print(f"텔레그램 {method} 연결 오류 (시도 {attempt}회): {e} → {wait:.1f}s 후 재시도")
+            time.sleep(wait)
+            continue
+        try:
+            result = response.json()
+        except ValueError:
+            result = {'ok': False, 'description': response.text[:200]}
+        status = response.status_code
+        if result.get('ok') or attempt > retries or not (status == 429 or status >= 500):
+            return result
+        if status == 429:
+            wait = float(result.get('parameters', {}).get('retry_after', wait))
+            _pause_until = max(_pause_until, time.monotonic() + wait)
+        print(f"텔레그램 {method} {status} (시도 {attempt}회) → {wait:.1f}s 후 재시도")
+        time.sleep(wait)
+
+def _send_album(token, chat_id, group, caption, file_ids=None):
+    """사진 묶음 하나를 한 채팅방에 전송 → 텔레그램이 발급한 file_id 목록 (실패 시 RuntimeError)
+
+    file_ids 가 있으면 업로드 없이 이미 올라간 사진을 참조해 보냄
+    """
+    refs = file_ids or [f'attach://photo{i}' for i in range(len(group))]
+    files = None if file_ids else {f'photo{i}': image for i, image in enumerate(group)}
+    if len(group) == 1:
+        if files:
+            files = {'photo': files['photo0']}
+            data = {'chat_id': chat_id, 'caption': caption}
+        else:
+            data = {'chat_id': chat_id, 'caption': caption, 'photo': refs[0]}
+        result = telegram_call(token, 'sendPhoto', data, files)
+    else:
+        # 캡션은 앨범의 첫 사진에만 달면 앨범 전체의 설명으로 표시됨
+        media = [{'type': 'photo', 'media': ref} for ref in refs]
+        media[0]['caption'] = caption
+        result = telegram_call(token, 'sendMediaGroup',
+                               {'chat_id': chat_id, 'media': json.dumps(media, ensure_ascii=False)}, files)
+    if not result.get('ok'):
+        raise RuntimeError(result.get('description'))
+    messages = result['result'] if isinstance(result['result'], list) else [result['result']]
+    # photo 는 크기별 목록이고 마지막이 원본 크기
+    return [m['photo'][-1]['file_id'] for m in messages]
+
+def _deliver_telegram(images, caption, chat_ids, file_ids=None, progress=None):
+    """이미지를 앨범(sendMediaGroup, 10장씩 / 1장이면 sendPhoto)으로 전송
 
-def send_image_via_telegram(image_paths, caption="주식 모니터링 결과입니다."):
+    채팅방이 여럿이면 첫 채팅방에만 업로드하고, 나머지는 받은 file_id 로 요청 한도에 맞춰 동시에 보냄
+    file_ids(이전 전송에서 받은 앨범별 file_id, 아직 못 올린 앨범은 None)가 있는 앨범은 업로드 없이 file_id 로 보냄
+    progress: {채팅방: 이미 보낸 앨범 수} - 앨범을 보낼 때마다 갱신하며, 중간에 실패한 채팅방은 다음에 그 앨범부터 이어 보냄
+    images: [(파일명, 바이트, MIME)] → ({채팅방: None=성공 | 오류 메시지}, file_ids)
+    """
     token = os.getenv('TELEGRAM_BOT_TOKEN')
-    chat_id = os.getenv('TELEGRAM_CHAT_ID')
 
-    if not all([token, chat_id]):
+    if not all([token, chat_ids]):
         print("텔레그램 설정 정보가 부족합니다. .env 파일을 확인해주세요.")
-        return
+        return dict.fromkeys(chat_ids, '텔레그램 설정 정보 부족'), file_ids
+    if not images:
+        return dict.fromkeys(chat_ids, '보낼 이미지 없음'), file_ids
 
-    url = f"https://api.telegram.org/bot{token}/sendPhoto"
-    
-    for image_path in image_paths:
-        if not os.path.exists(image_path):
-            print(f"파일을 찾을 수 없습니다: {image_path}")
-            continue
+    groups = [images[i:i + MEDIA_GROUP_SIZE] for i in range(0, len(images), MEDIA_GROUP_SIZE)]
+    names = ', '.join(name for name, _, _ in images)
+    t0 = time.perf_counter()
+    errors = {}
+    file_ids = (list(file_ids or []) + [None] * len(groups))[:len(groups)]
+    progress = {} if progress is None else progress
+
+    def send_rest(chat_id):
+        """이 채팅방에 아직 안 보낸 앨범만 차례로 (앨범마다 file_id 와 진행 상황을 바로 기록)"""
+        for g in range(progress.get(chat_id, 0), len(groups)):
+            ids = _send_album(token, chat_id, groups[g], caption, file_ids[g])
+            if file_ids[g] is None:
+                file_ids[g] = ids
+            progress[chat_id] = g + 1
+
+    # ① 업로드: 모든 앨범의 file_id 를 얻을 때까지 채팅방을 차례로 시도
+    #    (앞 앨범까지 올리고 실패하면 받은 file_id 는 유지하고, 다음 채팅방은 못 올린 앨범만 업로드)
+    rest = chat_ids
+    if None in file_ids:
+        rest = []
+        for i, chat_id in enumerate(chat_ids):
+            try:
+                send_rest(chat_id)
+                errors[chat_id] = None
+                rest = chat_ids[i + 1:]
+                break
+            except Exception as e:
+                print(f"텔레그램 전송 실패 ({chat_id}, 앨범 {progress.get(chat_id, 0) + 1}/{len(groups)}): {e}")
+                errors[chat_id] = str(e)
+
+    # ② 나머지 채팅방: 업로드 없이 file_id 재사용, 봇 전체 초당 메시지 한도를 토큰 버킷으로 지킴
+    if rest:
+        from fetch_scheduler import FetchScheduler
+        # 토큰 1개 = 채팅방 1곳에 사진 최대 len(images)장 → 어느 1초 구간에서도 (버킷 용량 1 + 초당 충전량) x 사진 수 <= 한도
+        rate = max(0.1, TELEGRAM_MSGS_PER_SEC / len(images) - 1)
+        scheduler = FetchScheduler(max_workers=BROADCAST_WORKERS, rate=rate, burst=1,
+                                   max_retries=0, deadline=SEND_TIMEOUT * (SEND_RETRIES + 1))
+        tasks = {chat_id: (lambda chat_id=chat_id: send_rest(chat_id)) for chat_id in rest}
+        results, report = scheduler.run(tasks)
+        for chat_id in rest:
+            if chat_id in results:
+                errors[chat_id] = None
+            else:
+                entry = report.entries.get(chat_id, {})
+                errors[chat_id] = f"{entry.get('status')} {entry.get('error') or ''}".strip()
+                print(f"텔레그램 전송 실패 ({chat_id}): {errors[chat_id]}")
+
+    if len(chat_ids) == 1:
+        if errors[chat_ids[0]] is None:
+            print(f"텔레그램 전송 완료: {names}")
+    else:
+        uploaded = len(chat_ids) - len(rest)
+        uploaded_kb = sum(len(content) for _, content, _ in images) / 1024 if uploaded else 0
+        _print_throughput('텔레그램', errors, time.perf_counter() - t0,
+                          f" - 업로드 {uploaded}회({uploaded_kb:.0f}KB), file_id 재사용 {len(rest)}곳")
+    return errors, file_ids
+
+def send_image_via_telegram(image_paths, caption="주식 모니터링 결과입니다.", chat_ids=None):
+    """이미지 파일을 텔레그램으로 전송 (chat_ids 가 없으면 TELEGRAM_CHAT_ID) → 전원 성공 여부"""
+    chat_ids = chat_ids or _env_list('TELEGRAM_CHAT_ID')
+    errors, _ = _deliver_telegram(_read_images(image_paths), caption, chat_ids)
+    return _all_sent(errors)
+
+def _deliver(channel, images, subject, body, recipients, file_ids=None, progress=None):
+    """채널 하나로 전송 → ({수신처: None=성공 | 오류 메시지}, 텔레그램 file_id)"""
+    if channel == 'telegram':
+        return _deliver_telegram(images, subject, recipients, file_ids, progress)
+    return _deliver_gmail(images, subject, body, recipients), None
+
+def _run_channels(jobs):
+    """{채널: 작업} 을 동시에 실행 (한 채널이 느리거나 실패해도 다른 채널은 그대로 진행) → {채널: 성공 여부}"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = {name: executor.submit(job) for name, job in jobs.items()}
+    results = {}
+    for name, future in futures.items():
         try:
-            with open(image_path, 'rb') as image_file:
-                files = {'photo': image_file}
-                data = {'chat_id': chat_id, 'caption': caption}
-                response = requests.post(url, files=files, data=data)
-                if response.status_code == 200:
-                    print(f"텔레그램 전송 완료: {os.path.basename(image_path)}")
-                else:
-                    print(f"텔레그램 전송 실패: {response.text}")
+            results[name] = future.result()
         except Exception as e:
-            print(f"텔레그램 전송 중 오류 발생: {e}")
+            print(f"{name} 전송 중 오류 발생: {e}")
+            results[name] = False
+    print(f"[알림] {', '.join(f'{k}={v}' for k, v in results.items())} ({time.perf_counter() - t0:.2f}s)")
+    return results
+
+def flush(report_id=None, outbox=None):
+    """대기열에서 아직 못 보낸 (리포트, 채널, 수신처)만 다시 전송 → {채널: 전원 성공 여부}
+
+    저장해 둔 이미지를 그대로 보내므로 시세 조회/렌더링을 다시 하지 않음
+    채널끼리는 동시에, 한 채널 안에서는 오래된 리포트부터 차례로 보냄
+    """
+    own = outbox is None
+    outbox = outbox or Outbox()
+    try:
+        expired = outbox.expire()
+        if expired:
+            print(f"[대기열] {MAX_AGE_HOURS}시간 넘게 못 보낸 {expired}건은 만료 처리")
+        work = {}
+        for rid, channel, recipients in outbox.pending(report_id):
+            work.setdefault(channel, []).append((rid, recipients))
+        if not work:
+            return {}
 
-def notify(image_paths, subject="주식 모니터링 결과", body="주식 모니터링 결과입니다."):
+        def run(channel, items):
+            ok = True
+            for rid, recipients in items:
+                subject, body, meta = outbox.report(rid)
+                progress = dict(meta.get('telegram_progress', {}))
+                errors, file_ids = _deliver(channel, outbox.images(rid, channel), subject, body, recipients,
+                                            meta.get('telegram_file_ids'), progress)
+                # 일부 앨범만 보내고 실패해도 받은 file_id 와 채팅방별 진행 상황을 남겨 다음 flush 가 이어 보냄
+                if file_ids and file_ids != meta.get('telegram_file_ids'):
+                    outbox.set_meta(rid, 'telegram_file_ids', file_ids)
+                if progress != meta.get('telegram_progress', {}):
+                    outbox.set_meta(rid, 'telegram_progress', progress)
+                outbox.mark(rid, channel, errors)
+                ok = ok and _all_sent(errors)
+            return ok
+
+        return _run_channels({channel: (lambda channel=channel, items=items: run(channel, items))
+                              for channel, items in work.items()})
+    finally:
+        if own:
+            outbox.close()
+
+def notify(image_paths, subject="주식 모니터링 결과", body="주식 모니터링 결과입니다.", channel_images=None):
+    """활성화된 채널로 동시에 전송 → {채널: 전원 성공 여부}
+
+    channel_images: {채널: 경로 목록} - 채널별로 다른 형식의 이미지를 보낼 때 (없는 채널은 image_paths)
+    USE_OUTBOX 면 대기열에 넣은 뒤 이 리포트의 대기 항목만 전송 (같은 내용을 다시 넣으면 이미 보낸 곳은 건너뜀)
+    """
+    channel_images = channel_images or {}
+    recipients = {}
     if ENABLE_TELEGRAM:
-        send_image_via_telegram(image_paths, caption=subject)
-    
+        recipients['telegram'] = _env_list('TELEGRAM_CHAT_ID')
     if ENABLE_EMAIL:
-        send_image_via_gmail(image_paths, subject=subject, body=body)
+        recipients['email'] = _env_list('RECEIVER_EMAIL')
 
-    if not ENABLE_EMAIL and not ENABLE_TELEGRAM:
+    if not recipients:
         print("활성화된 알림 채널이 없습니다. (notifier.py 상단의 ENABLE_EMAIL, ENABLE_TELEGRAM 확인)")
+        return {}
+
+    images = {channel: _read_images(channel_images.get(channel, image_paths)) for channel in recipients}
+    if not USE_OUTBOX:
+        return _run_channels({channel: (lambda channel=channel: _all_sent(
+            _deliver(channel, images[channel], subject, body, recipients[channel])[0])) for channel in recipients})
+
+    results = {}
+    for channel in [channel for channel, targets in recipients.items() if not targets]:
+        print(f"{channel} 수신처 설정 정보가 부족합니다. .env 파일을 확인해주세요.")
+        results[channel] = False
+        del recipients[channel]
+    if not recipients:
+        return results
+
+    outbox = Outbox()
+    try:
+        pruned = outbox.prune()
+        if pruned:
+            print(f"[대기열] 오래된 리포트 {pruned}건 삭제")
+        report_id = outbox.enqueue(subject, body, {channel: images[channel] for channel in recipients}, recipients)
+        sent = flush(report_id, outbox)
+        for channel in recipients:
+            if channel not in sent:
+                print(f"[대기열] {channel}: 리포트 {report_id} 는 이미 모든 수신처에 전송됨 (중복 전송 안 함)")
+            results[channel] = sent.get(channel, True)
+        return results
+    finally:
+        outbox.close()
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='알림 대기열: 못 보낸 리포트만 다시 전송 (렌더링/시세 조회 없음)')
+    parser.add_argument('command', choices=['flush', 'status'])
+    parser.add_argument('--report', help='이 리포트 ID 의 대기 항목만 전송')
+    args = parser.parse_args()
+
+    outbox = Outbox()
+    results = {}
+    if args.command == 'flush':
+        results = flush(args.report, outbox)
+        if not results:
+            print("[대기열] 보낼 항목이 없습니다.")
+    else:
+        for rid, channel, targets in outbox.pending(args.report):
+            print(f"[대기열] {rid} {channel}: {', '.join(targets)}")
+    print(f"[대기열] {outbox.path}: {outbox.summary()}")
+    outbox.close()
+    sys.exit(0 if all(results.values()) else 1)
@@ -0,0 +1,187 @@
+import os
+import json
+from datetime import datetime
+import pandas as pd
+
+from data_source import PRICE_FIELDS, get_data_source, normalize_panel, ticker_frame
+from fetch_scheduler import FetchScheduler
+
+# ==========================================
+# [설정] 로컬 시세 저장소
+# STORE_DIR 아래에 티커별 Parquet 파일 1개 + 마지막 저장일을 담은 _meta.json
+# ==========================================
+STORE_DIR = os.getenv('STORE_DIR', 'data_store')
+OVERLAP_DAYS = 7          # 증분 조회 시 마지막 저장일보다 앞쪽으로 겹쳐 받을 기간(일) → 수정주가 변경 감지용
+ADJ_TOLERANCE = 1e-4      # 겹치는 구간 종가의 허용 상대오차 (넘으면 분할/배당으로 보고 전체 재다운로드)
+MIN_REFRESH_MINUTES = 30  # 이 시간 안에 갱신한 티커는 다시 조회하지 않음
+REFRESH_CHUNK_SIZE = 10   # 스케줄러 작업 하나에 묶을 티커 수
+# ==========================================
+
+
+def market_chunks(tickers, size=REFRESH_CHUNK_SIZE):
+    """KRX(.KS/.KQ)와 그 외 티커를 따로 나눈 뒤 size 개씩 묶음 (느린 KRX 조회가 미국 티커를 막지 않도록)"""
+    krx = [t for t in tickers if t.endswith(('.KS', '.KQ'))]
+    others = [t for t in tickers if t not in krx]
+    return [group[i:i + size] for group in (others, krx) for i in range(0, len(group), size)]
+
+
+class OHLCVStore:
+    """티커별 일봉을 로컬 Parquet 으로 보관하고, 매 실행마다 마지막 저장일 이후 구간만 추가로 받는 저장소"""
+
+    def __init__(self, root=STORE_DIR, source=None):
+        self.root = root
+        self.source = source or get_data_source()
+        os.makedirs(self.root, exist_ok=True)
+        self._meta_path = os.path.join(self.root, '_meta.json')
+        self._meta = self._read_meta()
+        self._frames = {}
+
+    # ── 파일 입출력 ──────────────────────────────────────────
+    def _read_meta(self):
+        try:
+            with open(self._meta_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self):
+        tmp = self._meta_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self._meta, f, indent=1, sort_keys=True)
+        os.replace(tmp, self._meta_path)
+
+    def _path(self, ticker):
+        return os.path.join(self.root, f"{ticker}.parquet")
+
+    def load(self, ticker):
+        """저장된 일봉 (없으면 빈 DataFrame)"""
+        if ticker not in self._frames:
+            path = self._path(ticker)
+            if ticker in self._meta and os.path.exists(path):
+                self._frames[ticker] = pd.read_parquet(path)
+            else:
+                self._frames[ticker] = pd.DataFrame(columns=PRICE_FIELDS, index=pd.DatetimeIndex([]), dtype=float)
+        return self._frames[ticker]
+
+    def _save(self, ticker, df, now):
+        df = df[~df.index.duplicated(keep='last')].sort_index()
+        tmp = self._path(ticker) + '.tmp'
+        df.to_parquet(tmp)
+        os.replace(tmp, self._path(ticker))
+        self._frames[ticker] = df
+        self._meta[ticker] = {
+            'last_date': df.index[-1].strftime('%Y-%m-%d'),
+            'refreshed_at': now.isoformat(timespec='seconds'),
+        }
+
+    # ── 증분 갱신 ────────────────────────────────────────────
+    def _is_fresh(self, ticker, now):
+        meta = self._meta.get(ticker)
+        if not meta or not os.path.exists(self._path(ticker)):
+            return False
+        refreshed_at = datetime.fromisoformat(meta['refreshed_at'])
+        return (now - refreshed_at).total_seconds() < MIN_REFRESH_MINUTES * 60
+
+    def _adjusted_changed(self, stored, delta):
+        """겹치는 날짜의 종가가 달라졌으면 분할/배당으로 과거 수정주가가 바뀐 것으로 판단"""
+        last_date = stored.index[-1]
+        # 마지막 저장 봉은 장중에 저장된 미완성 봉일 수 있으므로 비교에서 제외
+        common = stored.index[stored.index < last_date].intersection(delta.index)
+        if common.empty:
+            return False
+        old = stored.loc[common, 'Close']
+        new = delta.loc[common, 'Close']
+        rel = ((new - old).abs() / old.abs()).max()
+        return bool(rel > ADJ_TOLERANCE)
+
+    def _merge_delta(self, ticker, delta, now):
+        """증분 구간을 붙여 저장. 수정주가가 바뀌었으면 저장하지 않고 False"""
+        stored = self.load(ticker)
+        if self._adjusted_changed(stored, delta):
+            print(f"{ticker}: 수정주가 변경 감지 (분할/배당) → 전체 재다운로드")
+            return False
+        # 마지막 저장 봉부터는 새로 받은 값으로 덮어씀 (_save 에서 중복 날짜는 뒤쪽 값 유지)
+        merged = pd.concat([stored, delta[delta.index >= stored.index[-1]]])
+        self._save(ticker, merged, now)
+        return True
+
+    def _run_downloads(self, jobs, scheduler):
+        """jobs: [(티커 묶음, download 인자)] 를 스케줄러로 동시에 실행 → {티커: 받은 일봉}"""
+        tasks, tickers_of = {}, {}
+        for chunk, kwargs in jobs:
+            key = f"{kwargs.get('start') or kwargs.get('period')}:{','.join(chunk)}"
+            tasks[key] = lambda chunk=chunk, kwargs=kwargs: self.source.download(chunk, **kwargs)
+            tickers_of[key] = chunk
+        results, report = scheduler.run(tasks, tickers_of)
+        report.print_summary()
+        frames = {}
+        for key, panel in results.items():
+            for ticker in tickers_of[key]:
+                frames[ticker] = ticker_frame(panel, ticker).dropna(subset=['Close'])
+        return frames
+
+    def refresh(self, tickers, now=None, scheduler=None):
+        """마지막 저장일 이후 구간만 받아 붙이고, 수정주가가 바뀐 티커는 전체 재다운로드
+
+        반환값: 이번에 갱신된 티커 목록 (조회 실패/시간 초과 티커는 기존 저장분 유지)
+        """
+        now = now or datetime.now()
+        scheduler = scheduler or FetchScheduler()
+        tickers = list(dict.fromkeys(tickers))
+        stale = [t for t in tickers if not self._is_fresh(t, now)]
+        if not stale:
+            return []
+
+        full = [t for t in stale if self.load(t).empty]
+        # 마지막 저장일이 같은 티커끼리 묶어서 증분 조회
+        by_start = {}
+        for ticker in stale:
+            if ticker in full:
+                continue
+            start = self.load(ticker).index[-1] - pd.Timedelta(days=OVERLAP_DAYS)
+            by_start.setdefault(start.strftime('%Y-%m-%d'), []).append(ticker)
+
+        jobs = [(chunk, {'start': start}) for start, group in by_start.items() for chunk in market_chunks(group)]
+        jobs += [(chunk, {'period': 'max'}) for chunk in market_chunks(full)]
+        frames = self._run_downloads(jobs, scheduler)
+
+        updated, reload = [], []
+        for ticker, hist in frames.items():
+            if hist.empty:
+                print(f"데이터가 없습니다: {ticker}")
+            elif ticker in full:
+                self._save(ticker, hist, now)
+                updated.append(ticker)
+            elif self._merge_delta(ticker, hist, now):
+                updated.append(ticker)
+            else:
+                reload.append(ticker)
+
+        if reload:
+            frames = self._run_downloads([(chunk, {'period': 'max'}) for chunk in market_chunks(reload)], scheduler)
+            for ticker, hist in frames.items():
+                if not hist.empty:
+                    self._save(ticker, hist, now)
+                    updated.append(ticker)
+
+        self._write_meta()
+        return updated
+
+    # ── 조회 ─────────────────────────────────────────────────
+    def panel(self, tickers, start=None, end=None, refresh=True):
+        """저장소의 일봉을 fetch_panel 과 같은 (필드, 티커) 패널로 반환"""
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return normalize_panel(None, [])
+        if refresh:
+            self.refresh(tickers)
+        frames = {}
+        for ticker in tickers:
+            df = self.load(ticker)
+            if start is not None:
+                df = df[df.index >= pd.Timestamp(start)]
+            if end is not None:
+                df = df[df.index < pd.Timestamp(end)]
+            frames[ticker] = df.reindex(columns=PRICE_FIELDS)
+        panel = pd.concat(frames, axis=1).swaplevel(0, 1, axis=1).sort_index()
+        return panel.reindex(columns=pd.MultiIndex.from_product([PRICE_FIELDS, tickers]))
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# ==========================================
+# [설정] 전송 대기열(outbox)
+# 리포트 이미지와 메타데이터를 SQLite 에 먼저 넣고, (리포트, 채널, 수신처)마다 전송 결과를 기록
+# 리포트 ID = 내용(제목/본문/채널별 이미지 바이트) 해시 → 같은 이미지 묶음을 다시 넣어도(flush 재시도 등) 이미 보낸 곳에는
+# 또 보내지 않음. 이미지에 생성 시각이 찍히므로 리포트를 새로 만든 재실행은 새 ID (재실행 중복은 run_state 사전 점검이 막음)
+# STORE_DIR(기본 data_store/) 아래에 두므로 CI 캐시로 다음 실행까지 유지됨
+# ==========================================
+STORE_DIR = os.getenv('STORE_DIR', 'data_store')
+OUTBOX_FILE = os.getenv('OUTBOX_FILE', os.path.join(STORE_DIR, 'outbox.sqlite'))
+MAX_ATTEMPTS = 5          # 수신처 하나당 최대 전송 시도 수 (넘으면 'failed' 로 두고 더 보내지 않음)
+MAX_AGE_HOURS = 24        # 이보다 오래 못 보낸 항목은 'expired' (지난 리포트를 뒤늦게 보내지 않음)
+KEEP_DAYS = 7             # 이보다 오래된 리포트는 이미지와 함께 삭제 (캐시 크기 유지)
+# ==========================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    report_id  TEXT PRIMARY KEY,
+    subject    TEXT NOT NULL,
+    body       TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    meta       TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    sha  TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS images (
+    report_id TEXT NOT NULL,
+    channel   TEXT NOT NULL,
+    position  INTEGER NOT NULL,
+    name      TEXT NOT NULL,
+    mime      TEXT NOT NULL,
+    sha       TEXT NOT NULL,
+    PRIMARY KEY (report_id, channel, position)
+);
+CREATE TABLE IF NOT EXISTS deliveries (
+    report_id  TEXT NOT NULL,
+    channel    TEXT NOT NULL,
+    recipient  TEXT NOT NULL,
+    status     TEXT NOT NULL DEFAULT 'pending',
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (report_id, channel, recipient)
+);
+CREATE INDEX IF NOT EXISTS deliveries_status ON deliveries (status);
+"""
+
+
+def report_hash(subject, body, channel_images):
+    """제목/본문 + 채널별 이미지(순서 포함) 내용 해시 → 리포트 ID"""
+    h = hashlib.sha256()
+    for part in (subject, body):
+        h.update(part.encode('utf-8') + b'\0')
+    for channel in sorted(channel_images):
+        h.update(channel.encode() + b'\0')
+        for name, data, mime in channel_images[channel]:
+            h.update(hashlib.sha256(data).digest())
+    return h.hexdigest()[:16]
+
+
+class Outbox:
+    """리포트 이미지/메타데이터와 수신처별 전송 상태(pending → sent / failed / expired)를 보관하는 SQLite 대기열
+
+    알림 스레드(채널별)가 동시에 기록하므로 연결 하나를 잠금으로 보호해 씀
+    """
+
+    def __init__(self, path=None):
+        self.path = path or OUTBOX_FILE
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self._conn.close()
+
+    def _write(self, statements):
+        """[(sql, params)] 를 한 트랜잭션으로 실행"""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                for sql, params in statements:
+                    self._conn.execute(sql, params)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def _read(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # ── 넣기 ────────────────────────────────────────────────
+    def enqueue(self, subject, body, channel_images, recipients):
+        """리포트 하나를 넣음 → 리포트 ID
+
+        channel_images: {채널: [(파일명, 바이트, MIME)]}, recipients: {채널: [수신처]}
+        이미 있는 리포트/수신처는 그대로 두고(이미 보낸 곳은 'sent' 유지), 새 수신처만 'pending' 으로 추가
+        """
+        report_id = report_hash(subject, body, channel_images)
+        now = time.time()
+        statements = [('INSERT OR IGNORE INTO reports (report_id, subject, body, created_at) VALUES (?, ?, ?, ?)',
+                       (report_id, subject, body, now))]
+        for channel, images in channel_images.items():
+            for position, (name, data, mime) in enumerate(images):
+                sha = hashlib.sha256(data).hexdigest()
+                # 채널끼리 같은 이미지(예: 최적화된 표 PNG)는 한 번만 저장
+                statements.append(('INSERT OR IGNORE INTO blobs (sha, data) VALUES (?, ?)', (sha, data)))
+                statements.append(('INSERT OR IGNORE INTO images VALUES (?, ?, ?, ?, ?, ?)',
+                                   (report_id, channel, position, name, mime, sha)))
+            for recipient in recipients.get(channel, []):
+                statements.append(('INSERT OR IGNORE INTO deliveries (report_id, channel, recipient, updated_at) '
+                                   'VALUES (?, ?, ?, ?)', (report_id, channel, recipient, now)))
+        self._write(statements)
+        return report_id
+
+    # ── 꺼내기 ──────────────────────────────────────────────
+    def expire(self, max_age_hours=MAX_AGE_HOURS):
+        """오래된 대기 항목을 'expired' 로 → 바뀐 수"""
+        cutoff = time.time() - max_age_hours * 3600
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE deliveries SET status = 'expired', updated_at = ? WHERE status = 'pending' AND report_id IN "
+                "(SELECT report_id FROM reports WHERE created_at < ?)", (time.time(), cutoff))
+            return cursor.rowcount
+
+    def pending(self, report_id=None):
+        """아직 못 보낸 항목 → [(리포트 ID, 채널, [수신처])] (오래된 리포트부터)"""
+        rows = self._read(
+            "SELECT d.report_id, d.channel, d.recipient FROM deliveries d JOIN reports r USING (report_id) "
+            "WHERE d.status = 'pending' AND (? IS NULL OR d.report_id = ?) "
+            "ORDER BY r.created_at, d.report_id, d.channel, d.rowid", (report_id, report_id))
+        work = {}
+        for rid, channel, recipient in rows:
+            work.setdefault((rid, channel), []).append(recipient)
+        return [(rid, channel, recipients) for (rid, channel), recipients in work.items()]
+
+    def report(self, report_id):
+        """→ (제목, 본문, 메타 dict)"""
+        subject, body, meta = self._read('SELECT subject, body, meta FROM reports WHERE report_id = ?',
+                                         (report_id,))[0]
+        return subject, body, json.loads(meta)
+
+    def images(self, report_id, channel):
+        """→ [(파일명, 바이트, MIME)] (넣은 순서)"""
+        return [tuple(row) for row in self._read(
+            'SELECT i.name, b.data, i.mime FROM images i JOIN blobs b USING (sha) '
+            'WHERE i.report_id = ? AND i.channel = ? ORDER BY i.position', (report_id, channel))]
+
+    # ── 결과 기록 ────────────────────────────────────────────
+    def set_meta(self, report_id, key, value):
+        """리포트별 부가 정보 저장 (예: 텔레그램 file_id → 재시도 때 다시 업로드하지 않음)"""
+        _, _, meta = self.report(report_id)
+        meta[key] = value
+        self._write([('UPDATE reports SET meta = ? WHERE report_id = ?', (json.dumps(meta), report_id))])
+
+    def mark(self, report_id, channel, errors, max_attempts=MAX_ATTEMPTS):
+        """수신처별 결과 기록 (errors: {수신처: None=성공 | 오류 메시지})"""
+        now = time.time()
+        statements = []
+        for recipient, error in errors.items():
+            if error is None:
+                sql = "UPDATE deliveries SET status = 'sent', attempts = attempts + 1, last_error = NULL"
+                params = ()
+            else:
+                sql = ("UPDATE deliveries SET status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END, "
+                       "attempts = attempts + 1, last_error = ?")
+                params = (max_attempts, str(error)[:500])
+            statements.append((sql + ", updated_at = ? WHERE report_id = ? AND channel = ? AND recipient = ?",
+                               params + (now, report_id, channel, recipient)))
+        self._write(statements)
+
+    def prune(self, keep_days=KEEP_DAYS):
+        """오래된 리포트와 더 이상 쓰이지 않는 이미지 삭제 → 지운 리포트 수"""
+        cutoff = time.time() - keep_days * 3600 * 24
+        old = [row[0] for row in self._read('SELECT report_id FROM reports WHERE created_at < ?', (cutoff,))]
+        if not old:
+            return 0
+        statements = []
+        for table in ('deliveries', 'images', 'reports'):
+            statements += [(f'DELETE FROM {table} WHERE report_id = ?', (rid,)) for rid in old]
+        statements.append(('DELETE FROM blobs WHERE sha NOT IN (SELECT sha FROM images)', ()))
+        self._write(statements)
+        return len(old)
+
+    def summary(self):
+        """→ {상태: 항목 수}"""
+        return dict(self._read('SELECT status, COUNT(*) FROM deliveries GROUP BY status'))
@@ -0,0 +1,71 @@
+import os
+import platform
+from functools import lru_cache
+
+_fonts_ready = False
+
+# Pillow 로 직접 그릴 때 쓰는 한글 폰트 파일 (굵기별 후보를 순서대로 찾음)
+FONT_FILES = {
+    'Darwin': {
+        'normal': ['/System/Library/Fonts/Supplemental/AppleGothic.ttf'],
+        'bold': ['/System/Library/Fonts/Supplemental/AppleGothic.ttf'],
+    },
+    'Linux': {
+        'normal': ['/usr/share/fonts/truetype/nanum/NanumGothic.ttf'],
+        'bold': ['/usr/share/fonts/truetype/nanum/NanumGothicExtraBold.ttf',
+                 '/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf'],
+    },
+}
+FALLBACK_FONT_FILES = {
+    'normal': ['/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'],
+    'bold': ['/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'],
+}
+
+
+def setup_fonts():
+    """OS별 한글 폰트 설정 (matplotlib 을 실제로 쓰는 시점에 한 번만 실행)"""
+    global _fonts_ready
+    if _fonts_ready:
+        return
+    import matplotlib
+    system_name = platform.system()
+    if system_name == 'Darwin':  # macOS
+        matplotlib.rc('font', family='AppleGothic')
+    elif system_name == 'Linux':  # GitHub Actions 등 Ubuntu 환경
+        matplotlib.rc('font', family='NanumGothic')
+    _fonts_ready = True
+
+
+def font_file(weight='normal'):
+    """OS별 한글 폰트 파일 경로 (weight: 'normal' | 'bold', 없으면 None)"""
+    candidates = FONT_FILES.get(platform.system(), {}).get(weight, []) + FALLBACK_FONT_FILES[weight]
+    return next((path for path in candidates if os.path.exists(path)), None)
+
+
+@lru_cache(maxsize=None)
+def pil_font(size, bold=False):
+    """Pillow 로 직접 그릴 때 쓰는 한글 폰트 (size: px, 크기/굵기별로 한 번만 로딩)"""
+    from PIL import ImageFont
+    path = font_file('bold' if bold else 'normal')
+    if path is None:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(path, size)
+
+
+def pt_to_px(pt, dpi=100):
+    """matplotlib 과 같은 크기로 보이도록 pt → px"""
+    return max(1, round(pt * dpi / 72))
+
+
+def figure_to_png(fig, **savefig_kwargs):
+    """Figure 를 파일 대신 PNG 바이트로 저장 (프로세스 간 전달용)"""
+    import io
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png', **savefig_kwargs)
+    return buf.getvalue()
+
+
+def write_png(png, output_path):
+    with open(output_path, 'wb') as f:
+        f.write(png)
+    return output_path
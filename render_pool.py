@@ -0,0 +1,108 @@
+import os
+import time
+import threading
+
+# ==========================================
+# [설정] 이미지 렌더링 프로세스 풀
+# ==========================================
+# matplotlib 렌더링은 GIL 을 거의 놓지 않아 스레드로는 동시에 돌지 않으므로 별도 프로세스에서 실행
+# 1 이하이면 풀 없이 호출한 스레드에서 바로 렌더링
+RENDER_WORKERS = int(os.environ.get('RENDER_WORKERS', min(4, os.cpu_count() or 1)))
+# ==========================================
+
+
+def _init_worker():
+    """워커 프로세스 시작 시 한 번만 실행: 백엔드/폰트 설정 후 글꼴 캐시를 미리 채움"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from plot_style import setup_fonts
+    setup_fonts()
+    # 한글/영문/숫자, 굵기별 글꼴을 한 번 그려 두어 첫 렌더링에서 글꼴 로딩 시간이 빠지도록 함
+    fig = Figure(figsize=(1, 1), dpi=50)
+    for weight in ('normal', 'bold'):
+        fig.text(0.5, 0.5, '시장 Market 0.0%', fontweight=weight)
+    FigureCanvasAgg(fig).draw()
+
+
+def _ping():
+    return os.getpid()
+
+
+def _render(func, args):
+    """워커에서 렌더링 함수 실행 → (PNG 바이트, 렌더링 소요시간)"""
+    t0 = time.perf_counter()
+    png = func(*args)
+    return png, time.perf_counter() - t0
+
+
+def _union_length(intervals):
+    """겹치는 구간을 합친 전체 길이 (동시에 진행된 렌더링의 실제 경과 시간)"""
+    total, end = 0.0, None
+    for s, e in sorted(intervals):
+        if end is None or s > end:
+            total += e - s
+            end = e
+        elif e > end:
+            total += e - end
+            end = e
+    return total
+
+
+class RenderPool:
+    """렌더링 함수(PNG 바이트 반환)를 프로세스 풀에서 실행하고 소요시간을 기록
+
+    func 는 워커에서 import 할 수 있는 모듈 최상위 함수여야 하고, 인자/결과는 pickle 로 전달됨
+    """
+
+    def __init__(self, workers=RENDER_WORKERS):
+        self.workers = workers
+        self.timings = {}   # 이름 → (워커 렌더링 시간, 요청 시각, 완료 시각)
+        self._lock = threading.Lock()
+        self._inline_lock = threading.Lock()
+        self._executor = None
+        if workers > 1:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # 조회 스레드가 돌고 있는 프로세스를 fork 하지 않도록 spawn 사용
+            self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+            # 워커 기동(인터프리터 + matplotlib import + 글꼴 로딩)을 시세 조회 단계와 겹치도록 미리 시작
+            for _ in range(workers):
+                self._executor.submit(_ping)
+
+    def render(self, name, func, *args):
+        """func(*args) 를 워커에서 실행하고 PNG 바이트 반환 (호출한 스레드는 결과까지 대기)"""
+        started = time.monotonic()
+        if self._executor is None:
+            # 풀이 없으면 한 번에 하나씩 그려 렌더링 합계가 곧 순차 실행 시간이 되도록 함
+            with self._inline_lock:
+                png, sec = _render(func, args)
+        else:
+            png, sec = self._executor.submit(_render, func, args).result()
+        with self._lock:
+            self.timings[name] = (sec, started, time.monotonic())
+        return png
+
+    def report(self):
+        if not self.timings:
+            return
+        serial = sum(sec for sec, _, _ in self.timings.values())
+        wall = _union_length([(s, e) for _, s, e in self.timings.values()])
+        speedup = serial / wall if wall else 0.0
+        print(f"[렌더링] 워커 {self.workers}개 - 순차 렌더링 합계 {serial:.2f}s, "
+              f"실제 경과 {wall:.2f}s ({speedup:.1f}배)")
+        for name, (sec, s, e) in sorted(self.timings.items(), key=lambda kv: kv[1][1]):
+            print(f"  {name:<12} 렌더링 {sec:6.2f}s  대기 포함 {e - s:6.2f}s")
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,294 @@
+import os
+import time
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# ==========================================
+# [설정] 일일 리포트 오케스트레이터
+# ==========================================
+MAX_STAGE_WORKERS = 4
+STOCK_IMAGE = 'stock_monitoring_instagram.png'
+INDEX_IMAGE = 'index_monitoring_instagram.png'
+SENTIMENT_IMAGE = 'sentiment_monitoring.png'
+# ==========================================
+
+
+class Stage:
+    """리포트 생성 단계 하나 (fn 은 의존 스테이지 결과 dict 를 받아 결과를 반환)"""
+
+    def __init__(self, name, fn, deps=()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+
+def _timed(fn, inputs):
+    t0 = time.perf_counter()
+    result = fn(inputs)
+    return result, time.perf_counter() - t0
+
+
+def run_stages(stages, max_workers=MAX_STAGE_WORKERS):
+    """의존 관계를 따라 스테이지 실행
+
+    의존 스테이지가 모두 끝난 스테이지는 동시에 실행하고,
+    실패한 스테이지는 그 스테이지에 의존하는 스테이지만 건너뛰게 함 (나머지는 계속 진행)
+    반환: ({이름: 결과}, {이름: 'ok' | 'error' | 'skipped'}, {이름: 소요시간})
+    """
+    results, status, elapsed = {}, {}, {}
+    remaining = {stage.name: stage for stage in stages}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while remaining or running:
+            for name, stage in list(remaining.items()):
+                if any(status.get(d) in ('error', 'skipped') for d in stage.deps):
+                    status[name] = 'skipped'
+                    del remaining[name]
+                    print(f"[{name}] 건너뜀 (선행 단계 실패)")
+                elif all(status.get(d) == 'ok' for d in stage.deps):
+                    inputs = {d: results[d] for d in stage.deps}
+                    running[executor.submit(_timed, stage.fn, inputs)] = name
+                    del remaining[name]
+
+            if not running:
+                # 존재하지 않는 스테이지에 의존하는 경우 등
+                for name in remaining:
+                    status[name] = 'skipped'
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name], elapsed[name] = future.result()
+                    status[name] = 'ok'
+                except Exception as e:
+                    status[name] = 'error'
+                    print(f"[{name}] 단계 실패: {e}")
+
+    return results, status, elapsed
+
+
+# ── 스테이지 함수 ──────────────────────────────────────────
+def report_tickers():
+    """두 리포트와 VIX 티커 (사전 점검의 일봉 날짜 확인 대상)"""
+    from monitor_stock import STOCK_TICKERS
+    from monitor_index import INDEX_TICKERS
+    return list(dict.fromkeys(STOCK_TICKERS + INDEX_TICKERS + ['^VIX']))
+
+
+def _load_prices(inputs, map_tickers=()):
+    """두 리포트와 VIX 티커(+ 직접 그리는 시장 맵의 구성종목)를 합쳐 저장소를 한 번만 갱신하고 지표도 한 번에 계산"""
+    from ohlcv_store import OHLCVStore
+    from indicators import compute_indicators
+
+    store = OHLCVStore()
+    tickers = report_tickers()
+    panel = store.panel(list(dict.fromkeys(tickers + list(map_tickers))))
+    return {'store': store, 'close': panel['Close'], 'ind': compute_indicators(panel['Close'][tickers])}
+
+
+def _fear_greed(inputs):
+    from monitor_sentiment import fetch_fear_and_greed
+    return fetch_fear_and_greed()
+
+
+def _records(inputs):
+    """두 표의 수치를 레코드로 만들고 JSON/CSV/Arrow 로 저장 (이미지 없이도 다른 작업이 읽을 수 있게)"""
+    from datetime import date
+    from monitor_stock import stock_records
+    from monitor_index import index_records
+    from report_records import export_daily
+
+    ind = inputs['prices']['ind']
+    records = {'stock': stock_records(ind), 'index': index_records(ind)}
+    paths = export_daily(records['stock'] + records['index'], date.today())
+    print(f"수치 레코드 저장: {', '.join(paths)}")
+    return records
+
+
+def _stock_table(inputs, renderer):
+    from monitor_stock import render_stock_png
+    return _save(renderer.render('stock_table', render_stock_png, inputs['records']['stock']), STOCK_IMAGE)
+
+
+def _index_table(inputs, renderer):
+    from monitor_index import render_index_png
+    return _save(renderer.render('index_table', render_index_png, inputs['records']['index']), INDEX_IMAGE)
+
+
+def _sentiment(inputs, renderer):
+    """Fear & Greed 과거 시계열과 VIX 종가를 심리 지표 시계열 파일에 합친 뒤 1년 추이와 함께 그림 (추가 조회 없음)"""
+    from monitor_sentiment import fetch_vix, fear_greed_client, render_sentiment_png
+    from sentiment_history import merge_history, trend_window
+
+    vix = fetch_vix(inputs['prices']['store'])
+    try:
+        history = merge_history(fear_greed_client().last_data(), inputs['prices']['close']['^VIX'])
+        trend = trend_window(history)
+    except Exception as e:
+        print(f"심리 지표 시계열 갱신 실패: {e}")
+        trend = None
+    return _save(renderer.render('sentiment', render_sentiment_png, inputs['fear_greed'], vix, trend),
+                 SENTIMENT_IMAGE)
+
+
+def _market_map(inputs, renderer):
+    """맵 여러 장을 브라우저 하나의 탭들에서 동시에 캡처하고, 1080x1080 재가공은 렌더링 워커에서 → 저장 경로 목록"""
+    from monitor_map import MAP_SPECS, capture_maps, render_market_map_png
+    shots, _ = capture_maps(MAP_SPECS)
+    captured = [spec for spec in MAP_SPECS if shots.get(spec['name'])]
+    if not captured:
+        raise RuntimeError("캡처에 성공한 시장 맵이 없습니다")
+
+    def render(spec):
+        png = renderer.render(f"map_{spec['name']}", render_market_map_png, shots[spec['name']], spec['title'])
+        return _save(png, spec['image'])
+
+    with ThreadPoolExecutor(max_workers=len(captured)) as executor:
+        return list(executor.map(render, captured))
+
+
+def _native_map(inputs, renderer, constituents):
+    """브라우저 없이 저장소 종가와 캐시된 시가총액으로 섹터 히트맵을 직접 그림 → 저장 경로 목록"""
+    from monitor_map import MAP_SPECS
+    from market_treemap import treemap_data, render_treemap_png
+
+    close = inputs['prices']['close']
+    specs = [spec for spec in MAP_SPECS if spec.get('days')]
+    caps = None
+    paths = []
+    for spec in specs:
+        data = treemap_data(close, constituents, spec['days'], caps)
+        caps = data.set_index('ticker')['cap']  # 시가총액은 맵끼리 공유
+        png = renderer.render(f"map_{spec['name']}", render_treemap_png, data, spec['title'])
+        paths.append(_save(png, spec['image']))
+    return paths
+
+
+# ── 스테이지 입력 지문 (같으면 이전 이미지 재사용) ─────────────────
+def _records_key(kind):
+    from run_state import fingerprint
+    return lambda inputs: fingerprint(inputs['records'][kind])
+
+
+def _sentiment_key(inputs):
+    from run_state import fingerprint
+    vix = inputs['prices']['close']['^VIX'].dropna().iloc[-2:]
+    return fingerprint([inputs['fear_greed'], vix.index.strftime('%Y-%m-%d').tolist(), vix.round(4).tolist()])
+
+
+def _close_key(constituents):
+    """직접 그리는 시장 맵: 구성종목의 마지막 거래일과 그날 종가"""
+    from run_state import fingerprint
+    from market_treemap import constituent_close
+
+    def key(inputs):
+        close = constituent_close(inputs['prices']['close'], constituents)
+        return fingerprint([close.index[-1].strftime('%Y-%m-%d'), close.iloc[-1].round(4).tolist()])
+    return key
+
+
+def _save(png, output_path):
+    from plot_style import write_png
+    if png is None:
+        return None
+    write_png(png, output_path)
+    print(f"이미지 저장 완료: {output_path}")
+    return output_path
+
+
+def build_stages(renderer, cache=None, sessions=None):
+    """renderer: RenderPool (이미지 스테이지는 그림 그리기를 renderer 에 맡기고 파일 저장만 함)
+
+    시장 맵은 MAP_MODE 에 따라 브라우저 캡처(독립 실행) 또는 직접 그리기(시세 조회 후 실행)
+    cache: run_state.StageCache - 이미지 스테이지의 입력 지문이 지난번과 같으면 다시 그리지 않음
+    sessions: 사전 점검의 거래소별 마지막 거래일 (브라우저 캡처 맵은 입력이 없으므로 NYSE 거래일로 판단)
+    """
+    from monitor_map import MAP_MODE
+    cached = cache.wrap if cache else (lambda name, fn, key_fn: fn)
+    if MAP_MODE == 'native':
+        from market_treemap import load_constituents
+        constituents = load_constituents()
+        prices = Stage('prices', partial(_load_prices, map_tickers=constituents['ticker']))
+        market_map = Stage('market_map', cached('market_map', partial(_native_map, renderer=renderer,
+                                                                       constituents=constituents), _close_key(constituents)),
+                           deps=['prices'])
+    else:
+        prices = Stage('prices', _load_prices)
+        nyse = (sessions or {}).get('NYSE')
+        market_map = Stage('market_map', cached('market_map', partial(_market_map, renderer=renderer),
+                                                lambda inputs: nyse))
+    return [
+        prices,
+        Stage('fear_greed', _fear_greed),
+        market_map,
+        Stage('records', _records, deps=['prices']),
+        Stage('stock_table', cached('stock_table', partial(_stock_table, renderer=renderer), _records_key('stock')),
+              deps=['records']),
+        Stage('index_table', cached('index_table', partial(_index_table, renderer=renderer), _records_key('index')),
+              deps=['records']),
+        Stage('sentiment', cached('sentiment', partial(_sentiment, renderer=renderer), _sentiment_key),
+              deps=['prices', 'fear_greed']),
+    ]
+
+
+def run_daily_report(send=True, force=None):
+    """종목/지수 표, 시장 심리, 시장 맵을 한 프로세스에서 생성하고 모아서 전송
+
+    사전 점검: 마지막 리포트 이후 끝난 거래일(NYSE/KRX)이 없고 저장소 일봉도 그대로면 바로 끝냄
+    실행하더라도 입력 지문이 같은 이미지 스테이지는 이전 이미지를 재사용하고, 모두 같으면 전송하지 않음
+    force(기본 FORCE_REPORT): 사전 점검/재사용 없이 모두 새로 만들어 전송
+    """
+    from run_state import (FORCE_REPORT, StageCache, load_state, mark_completed, preflight, save_state,
+                           source_fingerprint, stored_bar_dates)
+
+    t0 = time.perf_counter()
+    force = FORCE_REPORT if force is None else force
+    state = load_state()
+    go, info = preflight(report_tickers(), state)
+    print(f"[사전 점검] {info['reason']} ({(time.perf_counter() - t0) * 1000:.0f}ms)")
+    if not go and not force:
+        print("[사전 점검] 리포트를 건너뜁니다 (FORCE_REPORT=1 이면 강제 실행)")
+        return []
+
+    from render_pool import RenderPool
+    cache = StageCache(state, code=source_fingerprint(), enabled=not force)
+    # 렌더링 워커는 시세 조회가 진행되는 동안 미리 기동해 둠
+    with RenderPool() as renderer:
+        results, status, elapsed = run_stages(build_stages(renderer, cache, info['sessions']))
+    renderer.report()
+    cache.commit([name for name, s in status.items() if s == 'ok'])
+
+    print(f"[리포트] 전체 {time.perf_counter() - t0:.2f}s")
+    for name in status:
+        reused = ' (재사용)' if name in cache.reused else ''
+        print(f"  {name:<12} {status[name]:<8} {elapsed.get(name, 0):6.2f}s{reused}")
+
+    # 성공한 이미지만 순서대로 모아서 한 번에 전송
+    # 표/심리 이미지는 단색 면 위주(flat), 시장 맵은 색이 많은 그림(photo)
+    images = [(results.get(name), 'flat') for name in ('stock_table', 'index_table', 'sentiment')]
+    images += [(path, 'photo') for path in results.get('market_map') or []]
+    images = [(path, kind) for path, kind in images if path and os.path.exists(path)]
+    image_list = [path for path, _ in images]
+    if send and image_list:
+        if cache.reused and not cache.rendered:
+            print("[리포트] 모든 이미지가 지난 리포트와 같음 → 전송 생략")
+        else:
+            from image_optimize import optimize_for_channels
+            from notifier import notify
+            notify(
+                image_paths=image_list,
+                subject='[Daily Report] 주식 시장 모니터링',
+                body='오늘의 종목, 지수 및 시장 심리/지도 리포트입니다.',
+                channel_images=optimize_for_channels(images)
+            )
+        if all(s == 'ok' for s in status.values()):
+            mark_completed(state, info, stored_bar_dates(report_tickers()))
+    save_state(state)
+    return image_list
+
+
+if __name__ == '__main__':
+    run_daily_report()
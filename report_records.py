@@ -0,0 +1,100 @@
+import os
+import math
+import json
+from dataclasses import dataclass, fields, asdict
+
+# ==========================================
+# [설정] 리포트 수치 레코드 내보내기
+# ==========================================
+RECORDS_DIR = os.environ.get('RECORDS_DIR', 'report_data')
+RECORD_FORMATS = ('json', 'csv', 'arrow')   # 매일 저장할 형식
+# ==========================================
+
+
+@dataclass(slots=True, frozen=True)
+class IndicatorRecord:
+    """리포트 표 한 행의 수치 (문자열 포맷은 그림을 그릴 때만 적용)
+
+    값이 없는 지표는 NaN, price_date 는 'YYYY-MM-DD'
+    """
+    report: str          # 'stock' | 'index'
+    group: str           # 표의 그룹/카테고리 이름
+    ticker: str
+    name: str            # 표에 표시할 이름
+    price_date: str
+    price: float
+    day_change: float
+    rsi_14: float
+    avg_20: float
+    avg_60: float
+    mdd: float
+    mdd_20: float
+    ytd: float
+    avg_mdd: float
+
+
+RECORD_FIELDS = [f.name for f in fields(IndicatorRecord)]
+NUMERIC_FIELDS = RECORD_FIELDS[RECORD_FIELDS.index('price'):]
+
+
+def is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def build_records(ind, entries, report):
+    """compute_indicators 결과에서 (그룹, 티커, 표시명) 순서대로 레코드 생성 (가격 없는 티커는 제외)"""
+    import pandas as pd
+    records = []
+    for group, ticker, name in entries:
+        if ticker not in ind.index or pd.isna(ind.at[ticker, 'price']):
+            print(f"데이터가 없습니다: {ticker}")
+            continue
+        r = ind.loc[ticker]
+        records.append(IndicatorRecord(
+            report=report, group=group, ticker=ticker, name=name,
+            price_date=r['price_date'].strftime('%Y-%m-%d') if pd.notna(r['price_date']) else '',
+            **{field: float(r[field]) for field in NUMERIC_FIELDS},
+        ))
+    return records
+
+
+def to_rows(records):
+    """레코드 → dict 목록 (NaN 은 None 으로 바꿔 JSON/CSV/Arrow 모두 빈 값으로 기록)"""
+    return [{k: (None if is_missing(v) else v) for k, v in asdict(rec).items()} for rec in records]
+
+
+def export_records(records, path):
+    """확장자(.json / .csv / .arrow / .parquet)에 맞춰 레코드 저장"""
+    fmt = os.path.splitext(path)[1].lstrip('.').lower()
+    rows = to_rows(records)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if fmt == 'json':
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=1)
+    elif fmt == 'csv':
+        import csv
+        # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=RECORD_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    elif fmt in ('arrow', 'feather', 'parquet'):
+        import pyarrow as pa
+        schema = pa.schema([(name, pa.string() if name not in NUMERIC_FIELDS else pa.float64())
+                            for name in RECORD_FIELDS])
+        table = pa.Table.from_pylist(rows, schema=schema)
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table, path)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(table, path)  # Arrow IPC 파일
+    else:
+        raise ValueError(f"지원하지 않는 형식: {path}")
+    return path
+
+
+def export_daily(records, day, out_dir=RECORDS_DIR, formats=RECORD_FORMATS):
+    """그날의 레코드를 out_dir/indicators_YYYY-MM-DD.<형식> 으로 저장 → 저장한 경로 목록"""
+    base = os.path.join(out_dir, f"indicators_{day:%Y-%m-%d}")
+    return [export_records(records, f"{base}.{fmt}") for fmt in formats]
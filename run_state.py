@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+
+from trading_calendar import latest_sessions, market_of
+
+# ==========================================
+# [설정] 실행 상태 / 사전 점검
+# 마지막으로 성공한 리포트의 거래일, 저장소 일봉 날짜 지문, 스테이지별 입력 지문과 결과 이미지를 기록
+# 다음 실행은 거래일 달력과 저장소 메타만 보고(네트워크/pandas 없이) 바뀐 게 없으면 바로 끝냄
+# ==========================================
+STORE_DIR = os.getenv('STORE_DIR', 'data_store')     # ohlcv_store 와 같은 위치 (pandas 를 가져오지 않으려고 직접 읽음)
+RUN_STATE_FILE = os.path.join(STORE_DIR, 'run_state.json')
+OUTPUT_CACHE_DIR = os.path.join(STORE_DIR, 'report_cache')   # 재사용할 이미지 사본 (CI 캐시로 유지)
+FORCE_REPORT = os.getenv('FORCE_REPORT', '0') == '1'         # 사전 점검/재사용 없이 모두 새로 만듦
+# ==========================================
+
+
+def fingerprint(obj):
+    """JSON 으로 만들 수 있는 값(안 되는 값은 repr) → 짧은 해시"""
+    text = json.dumps(obj, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def source_fingerprint(root=None):
+    """리포트 코드(최상위 .py) 내용 해시 → 코드가 바뀌면 저장해 둔 이미지를 다시 쓰지 않음"""
+    root = root or os.path.dirname(os.path.abspath(__file__))
+    h = hashlib.sha1()
+    for name in sorted(os.listdir(root)):
+        if name.endswith('.py'):
+            with open(os.path.join(root, name), 'rb') as f:
+                h.update(name.encode() + f.read())
+    return h.hexdigest()[:16]
+
+
+def load_state(path=None):
+    try:
+        with open(path or RUN_STATE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state, path=None):
+    path = path or RUN_STATE_FILE
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f, indent=1, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def stored_bar_dates(tickers, store_dir=None):
+    """저장소 _meta.json 에 적힌 티커별 마지막 일봉 날짜 → {티커: 'YYYY-MM-DD' | None}"""
+    try:
+        with open(os.path.join(store_dir or STORE_DIR, '_meta.json'), 'r') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        meta = {}
+    return {ticker: meta.get(ticker, {}).get('last_date') for ticker in tickers}
+
+
+def complete_sessions(sessions, bars):
+    """거래소별로 그 거래일의 일봉이 저장소에 들어왔는지 → {거래소: 거래일 | None}
+
+    티커 하나라도 그 날짜까지 받았으면 데이터 소스가 그 거래일을 반영한 것으로 봄
+    (일부 티커만 늦거나 멈춘 경우에 매일 다시 돌지 않도록)
+    """
+    latest = {}
+    for ticker, day in bars.items():
+        if day:
+            market = market_of(ticker)
+            latest[market] = max(latest.get(market, day), day)
+    return {market: (day if latest.get(market, '') >= day else None) for market, day in sessions.items()}
+
+
+def preflight(tickers, state, now=None):
+    """새로 리포트를 만들 필요가 있는지 → (실행 여부, {'sessions', 'bars', 'reason'})
+
+    마지막 성공 이후 끝난 거래일이 없고 저장소 일봉도 그대로면 건너뜀
+    (마지막 실행 때 아직 반영되지 않았던 거래일은 기록하지 않았으므로 다시 시도하게 됨)
+    """
+    sessions = latest_sessions(now)
+    bars = fingerprint(stored_bar_dates(tickers))
+    info = {'sessions': sessions, 'bars': bars}
+    if not state.get('sessions'):
+        return True, dict(info, reason='이전 실행 기록 없음')
+    new = [f"{market} {day}" for market, day in sessions.items() if state['sessions'].get(market) != day]
+    if new:
+        return True, dict(info, reason=f"새 거래일: {', '.join(new)}")
+    if state.get('bars') != bars:
+        return True, dict(info, reason='저장소 일봉이 마지막 리포트 이후 바뀜')
+    last = ', '.join(f"{market} {day}" for market, day in sessions.items())
+    return False, dict(info, reason=f"마지막 리포트({state.get('completed_at', '?')}) 이후 새 거래일 없음 ({last})")
+
+
+class StageCache:
+    """스테이지 입력 지문이 지난번과 같으면 저장해 둔 결과 이미지를 다시 씀
+
+    결과(경로 또는 경로 목록)는 OUTPUT_CACHE_DIR 에 사본을 두고, 새 기록은 commit() 때 상태에 반영
+    code: 코드 지문 (다르면 입력이 같아도 새로 그림)
+    """
+
+    def __init__(self, state, code=None, cache_dir=None, enabled=True):
+        self.entries = state.setdefault('stages', {})
+        self.code = code
+        self.cache_dir = cache_dir or OUTPUT_CACHE_DIR
+        self.enabled = enabled
+        self.reused, self.rendered = [], []
+        self._updates = {}
+
+    def _cached_path(self, path):
+        return os.path.join(self.cache_dir, os.path.basename(path))
+
+    def reuse(self, name, key):
+        """같은 입력으로 만든 결과가 있으면 출력 위치에 복사해 돌려줌 (없으면 None)"""
+        entry = self.entries.get(name)
+        if not self.enabled or not entry or entry.get('key') != key or entry.get('code') != self.code:
+            return None
+        output = entry['output']
+        paths = output if isinstance(output, list) else [output]
+        if not all(os.path.exists(self._cached_path(p)) for p in paths):
+            return None
+        for path in paths:
+            shutil.copyfile(self._cached_path(path), path)
+        self.reused.append(name)
+        return output
+
+    def store(self, name, key, output):
+        """새로 만든 결과의 사본을 남기고 기록 예약"""
+        self.rendered.append(name)
+        if output is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        paths = output if isinstance(output, list) else [output]
+        if not all(paths):
+            return    # 일부 이미지를 못 만든 결과는 재사용하지 않음
+        for path in paths:
+            shutil.copyfile(path, self._cached_path(path))
+        self._updates[name] = {'key': key, 'code': self.code, 'output': output}
+
+    def wrap(self, name, fn, key_fn):
+        """스테이지 함수 fn 을 감싸 입력 지문(key_fn(inputs))이 같으면 재사용"""
+        def run(inputs):
+            key = key_fn(inputs)
+            output = self.reuse(name, key)
+            if output is not None:
+                print(f"[{name}] 입력 변화 없음 → 이전 결과 재사용")
+                return output
+            output = fn(inputs)
+            self.store(name, key, output)
+            return output
+        return run
+
+    def commit(self, names):
+        """성공한 스테이지의 새 기록만 상태에 반영"""
+        for name in names:
+            if name in self._updates:
+                self.entries[name] = self._updates[name]
+
+
+def mark_completed(state, info, bar_dates):
+    """리포트를 끝까지 만들어 보낸 실행을 기록 (다음 사전 점검의 기준)"""
+    state['sessions'] = complete_sessions(info['sessions'], bar_dates)
+    state['bars'] = fingerprint(bar_dates)
+    state['completed_at'] = datetime.now().isoformat(timespec='seconds')
@@ -0,0 +1,81 @@
+import os
+
+import pandas as pd
+
+from ohlcv_store import STORE_DIR
+
+# ==========================================
+# [설정] 시장 심리 시계열 (Fear & Greed 점수 + VIX 종가)
+# 날짜별 1행, 새로 받은 값만 덧붙이고(같은 날짜는 새 값으로 갱신) 지난 날짜는 지우지 않음
+# ==========================================
+HISTORY_FILE = os.path.join(STORE_DIR, 'sentiment_history.parquet')
+TREND_DAYS = 365      # 이미지 하단 추이 그래프 기간(일)
+HISTORY_COLUMNS = ['fg', 'fg_rating', 'vix']
+# ==========================================
+
+
+def empty_history():
+    return pd.DataFrame({'fg': pd.Series(dtype=float), 'fg_rating': pd.Series(dtype=object),
+                         'vix': pd.Series(dtype=float)}, index=pd.DatetimeIndex([], name='date'))
+
+
+def load_history(path=HISTORY_FILE):
+    """저장된 시계열 (없으면 빈 DataFrame)"""
+    if not os.path.exists(path):
+        return empty_history()
+    return pd.read_parquet(path)
+
+
+def fg_frame(data):
+    """CNN API 응답의 과거 시계열 + 현재 값 → 날짜별 DataFrame(fg, fg_rating)"""
+    points = list((data or {}).get('fear_and_greed_historical', {}).get('data', []))
+    current = (data or {}).get('fear_and_greed')
+    if current and current.get('timestamp'):
+        ts = current['timestamp']
+        # 현재 값의 timestamp 는 ISO 문자열일 수도 있음
+        x = pd.Timestamp(ts).value // 10**6 if isinstance(ts, str) else ts
+        points.append({'x': x, 'y': current['score'], 'rating': current.get('rating')})
+    if not points:
+        return empty_history()[['fg', 'fg_rating']]
+    df = pd.DataFrame(points)
+    # x: epoch ms (UTC) → 미국 장 기준 날짜
+    dates = pd.to_datetime(df['x'], unit='ms', utc=True).dt.tz_convert('America/New_York').dt.tz_localize(None)
+    ratings = df['rating'].to_numpy() if 'rating' in df else None
+    df = pd.DataFrame({'fg': df['y'].astype(float).round(2).to_numpy(), 'fg_rating': ratings},
+                      index=pd.DatetimeIndex(dates.dt.normalize(), name='date'))
+    return df[~df.index.duplicated(keep='last')]
+
+
+def merge_history(fg_data=None, vix_close=None, path=HISTORY_FILE):
+    """API 응답과 VIX 종가 시리즈를 저장된 시계열에 합쳐 저장 → 합친 DataFrame
+
+    같은 날짜는 새로 받은 값 우선 (새 값이 비어 있는 칸은 기존 값 유지)
+    """
+    stored = load_history(path)
+    new = fg_frame(fg_data)
+    if vix_close is not None and len(vix_close):
+        vix = vix_close.dropna().astype(float).round(2)
+        vix.index = pd.DatetimeIndex(vix.index).normalize()
+        new = new.join(vix.rename('vix').to_frame(), how='outer')
+    new = new.reindex(columns=HISTORY_COLUMNS)
+    merged = new.combine_first(stored)[HISTORY_COLUMNS].sort_index()
+    merged.index.name = 'date'
+
+    # 새 날짜가 생겼거나 기존 칸 값이 바뀐 경우에만 다시 씀
+    old = stored.reindex(merged.index)
+    changed = len(merged) != len(stored) or not ((merged == old) | (merged.isna() & old.isna())).all().all()
+    if changed:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = path + '.tmp'
+        merged.to_parquet(tmp)
+        os.replace(tmp, path)
+        print(f"심리 지표 시계열 저장: {len(stored)} → {len(merged)}행 ({path})")
+    return merged
+
+
+def trend_window(history, days=TREND_DAYS):
+    """최근 days 일 구간의 fg/vix 열만 (추이 그래프 입력)"""
+    if history.empty:
+        return history[['fg', 'vix']]
+    start = history.index[-1] - pd.Timedelta(days=days)
+    return history.loc[history.index >= start, ['fg', 'vix']]
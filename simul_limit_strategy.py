@@ -1,8 +1,13 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
 from datetime import timedelta
+import itertools
 import os
+import time
+from data_source import ticker_frame
+from ohlcv_store import OHLCVStore
 
 # ==========================================
 # [설정] 억만장자 전문가의 시뮬레이션 세팅
@@ -15,22 +20,60 @@ TOTAL_SEED = 10000         # 총 자본금 (SEQUENTIAL 모드용)
 # 시뮬레이션 모드 설정:
 # "SEQUENTIAL" -> 실제 매매처럼 한 사이클이 끝나면 다음 사이클 시작 (자산 변화 추적)
 # "ROLLING"    -> 기간 내 모든 거래일마다 각각 40일 사이클을 시작하여 통계 도출
+# "SWEEP"      -> SWEEP_GRID 의 파라미터 조합마다 SEQUENTIAL + ROLLING 을 여러 코어에서 돌려 순위표 작성
+# "UNIVERSE"   -> UNIVERSE 의 종목마다 SEQUENTIAL + ROLLING 을 여러 코어에서 돌려 리더보드 작성
 # MODE = "ROLLING" 
 MODE = "SEQUENTIAL" 
+
+# SWEEP 모드: 조합할 파라미터 값 (키는 StrategyParams 필드, 빠진 키는 기본값 고정)
+SWEEP_GRID = {
+    'splits': [30, 40, 50],
+    'profit_tiers': [(0.10, 0.07, 0.03), (0.12, 0.08, 0.04), (0.08, 0.05, 0.02)],
+    'tier_days': [(20, 30), (15, 25)],
+    'avg_buy_ratio': [0.3, 0.5, 0.7],
+    'soul_sell': [0.25, 0.5],
+}
+SWEEP_WORKERS = int(os.getenv('SWEEP_WORKERS', os.cpu_count() or 1))   # 1 이면 풀 없이 순차 실행
+
+# UNIVERSE 모드: 비교할 종목 (명령행 --tickers 로 덮어씀). 원화 종목(.KS/.KQ)은 KRX_SEED 로 시뮬레이션
+UNIVERSE = ["TQQQ", "SOXL", "UPRO", "TECL", "QLD", "TMF",
+            "122630.KS",   # KODEX 레버리지
+            "233740.KS"]   # KODEX 코스닥150레버리지
+KRX_SEED = 10_000_000      # 원화 종목 총 자본금
+UNIVERSE_WORKERS = int(os.getenv('UNIVERSE_WORKERS', os.cpu_count() or 1))   # 1 이면 풀 없이 순차 실행
 # ==========================================
 
-def get_prepared_data(ticker, start, end):
+
+@dataclass(frozen=True, slots=True)
+class StrategyParams:
+    """무한매수법 규칙 파라미터 (기본값 = V2.1)"""
+    splits: int = 40                           # 분할 일수: 하루 매수 예산 = 시드 / splits, 이 날수를 넘기면 소진모드
+    profit_tiers: tuple = (0.10, 0.07, 0.03)   # 목표 수익률: 기본 / tier_days[0]일 초과 / tier_days[1]일 초과
+    tier_days: tuple = (20, 30)
+    avg_buy_ratio: float = 0.5                 # 하루 예산 중 평단 이하일 때만 사는 몫 (나머지는 매일 매수)
+    soul_sell: float = 0.25                    # 소진모드에서 고가가 평단에 닿으면 파는 보유 수량 비율
+
+
+DEFAULT_PARAMS = StrategyParams()
+
+def get_prepared_universe(tickers, start, end):
+    """여러 종목 일봉을 저장소에서 한 번에 읽음 → {종목: DataFrame} (데이터 없는 종목은 빠짐)"""
     # 충분한 데이터를 가져오기 위해 앞쪽으로 버퍼를 둠
     fetch_start = pd.to_datetime(start) - timedelta(days=50)
     # ROLLING 모드에서 마지막 날짜가 40일을 채울 수 있도록 뒤쪽으로도 버퍼를 둠
     fetch_end = pd.to_datetime(end) + timedelta(days=100)
-    
-    df = yf.download(ticker, start=fetch_start, end=fetch_end, progress=False)
-    if df.empty: return None
-    
-    if isinstance(df.columns, pd.MultiIndex):
-        df.columns = df.columns.droplevel(1)
-    return df
+
+    # 로컬 저장소에서 읽음 (마지막 저장일 이후 구간만 새로 받음)
+    panel = OHLCVStore().panel(list(tickers), start=fetch_start, end=fetch_end)
+    frames = {}
+    for ticker in tickers:
+        df = ticker_frame(panel, ticker)
+        if not df.empty:
+            frames[ticker] = df
+    return frames
+
+def get_prepared_data(ticker, start, end):
+    return get_prepared_universe([ticker], start, end).get(ticker)
 
 def simulate_one_cycle(df, start_date, seed):
     """지정된 시작일로부터 하나의 무한매수법 사이클(최대 40일)을 수행"""
@@ -94,141 +137,529 @@ def simulate_one_cycle(df, start_date, seed):
         # Soul Mode 및 60일 가드는 ROLLING 모드(simulate_one_cycle)에서는 제거 (40일 하드 리밋에 통합)
     return None
 
-def run_sequential(df, start, end, seed):
-    """이전 코드와 동일한 방식의 연속 매매 시뮬레이션"""
-    df_sim = df[(df.index >= start) & (df.index <= end)]
-    
+def _sequential(close, high, lo, hi, seed, params=DEFAULT_PARAMS, index=None):
+    """offset lo ~ hi-1 구간의 연속 매매 → (현금, 보유 수량, 익절 사이클 목록, 일별 기록 | None)
+
+    index(DatetimeIndex)를 주면 run_sequential 의 일별 기록/사이클 표를 만들고, 없으면 수치만 계산 (스윕용)
+    close/high: 파이썬 float 목록
+    """
+    splits, soul_sell = params.splits, params.soul_sell
+    tier_1, tier_2 = params.tier_days
+    profit_0, profit_1, profit_2 = params.profit_tiers
+    record = index is not None
+
     cash = seed
     shares = 0
     invested_amount = 0
     avg_price = 0
     day_count = 0
     is_soul_mode = False
-    
-    history = []
+
+    history = [] if record else None
     cycles = []
-    current_cycle_start = df_sim.index[0]
-    daily_budget = seed / 40
+    current_cycle_start = index[lo] if record else lo
+    daily_budget = seed / splits
+    part_b = daily_budget * (1 - params.avg_buy_ratio)   # 매일 매수
+    part_a = daily_budget * params.avg_buy_ratio         # 평단 이하일 때만 매수
 
-    for date, row in df_sim.iterrows():
-        price = row['Close']
-        high = row['High']
+    for i in range(lo, hi):
+        price = close[i]
+        high_i = high[i]
         day_count += 1
-        
-        target_profit = 0.10
-        if day_count > 30: target_profit = 0.03
-        elif day_count > 20: target_profit = 0.07
-        
-        is_sold = False
+
+        target_profit = profit_0
+        if day_count > tier_2: target_profit = profit_2
+        elif day_count > tier_1: target_profit = profit_1
+
         if shares > 0:
             target_sell_price = avg_price * (1 + target_profit)
-            if high >= target_sell_price:
+            if high_i >= target_sell_price:
                 cash += shares * target_sell_price
                 profit = (shares * target_sell_price) - invested_amount
-                cycles.append({'Start': current_cycle_start.strftime('%Y-%m-%d'), 'End': date.strftime('%Y-%m-%d'), 'Days': day_count, 'Profit': round(profit, 2), 'Status': 'Success'})
+                if record:
+                    date = index[i]
+                    cycles.append({'Start': current_cycle_start.strftime('%Y-%m-%d'), 'End': date.strftime('%Y-%m-%d'),
+                                   'Days': day_count, 'Profit': round(profit, 2), 'Status': 'Success'})
+                    current_cycle_start = date + timedelta(days=1)
+                else:
+                    cycles.append((day_count, profit))
                 shares, invested_amount, avg_price, day_count = 0, 0, 0, 0
                 is_soul_mode = False
-                current_cycle_start = date + timedelta(days=1)
-                is_sold = True
-
-        if is_sold: continue
+                continue
 
-        if day_count <= 40 and not is_soul_mode:
+        if day_count <= splits and not is_soul_mode:
             if day_count == 1: buy_shares = int(daily_budget // price)
             else:
-                half = daily_budget / 2
-                shares_b = int(half // price)
-                shares_a = int(half // price) if price <= avg_price else 0
+                shares_b = int(part_b // price)
+                shares_a = int(part_a // price) if price <= avg_price else 0
                 buy_shares = shares_a + shares_b
-            
+
             buy_cost = buy_shares * price
             if cash >= buy_cost:
                 shares += buy_shares
                 cash -= buy_cost
                 invested_amount += buy_cost
                 avg_price = invested_amount / shares if shares > 0 else 0
-        
-        elif day_count > 40 or is_soul_mode:
+
+        elif day_count > splits or is_soul_mode:
             is_soul_mode = True
-            if high >= avg_price:
-                sell_soul_shares = int(shares * 0.25)
+            if high_i >= avg_price:
+                sell_soul_shares = int(shares * soul_sell)
                 cash += sell_soul_shares * avg_price
                 invested_amount -= sell_soul_shares * avg_price
                 shares -= sell_soul_shares
                 day_count, is_soul_mode = 1, False
 
-        total_equity = cash + (shares * price)
-        current_return = (shares * price / invested_amount - 1) * 100 if invested_amount > 0 else 0
-        history.append({
-            'Date': date.strftime('%Y-%m-%d'), 'Price': round(price, 2), 'AvgPrice': round(avg_price, 2),
-            'Shares': shares, 'Invested': round(invested_amount, 2), 'Cash': round(cash, 2),
-            'Total': round(total_equity, 2), 'Return(%)': round(current_return, 2), 'DayCount': day_count,
-            'Mode': 'Soul' if is_soul_mode else 'Normal'
-        })
+        if record:
+            total_equity = cash + (shares * price)
+            current_return = (shares * price / invested_amount - 1) * 100 if invested_amount > 0 else 0
+            history.append({
+                'Date': index[i].strftime('%Y-%m-%d'), 'Price': round(price, 2), 'AvgPrice': round(avg_price, 2),
+                'Shares': shares, 'Invested': round(invested_amount, 2), 'Cash': round(cash, 2),
+                'Total': round(total_equity, 2), 'Return(%)': round(current_return, 2), 'DayCount': day_count,
+                'Mode': 'Soul' if is_soul_mode else 'Normal'
+            })
+
+    return cash, shares, cycles, history
 
+def _range_offsets(index, start, end):
+    """start ~ end 에 드는 행의 offset 배열 (정렬된 일봉이므로 연속 구간)"""
+    return np.flatnonzero((index >= start) & (index <= end))
+
+def sequential_tables(index, close, high, offsets, seed, params=DEFAULT_PARAMS):
+    """배열 위에서 연속 매매 → (일별 기록 DataFrame, 익절 사이클 DataFrame)"""
+    _, _, cycles, history = _sequential(close, high, int(offsets[0]), int(offsets[-1]) + 1, seed, params,
+                                        index=index)
     return pd.DataFrame(history), pd.DataFrame(cycles)
 
-def run_rolling(df, start, end, seed):
-    """모든 시작 가능일에 대해 40일 사이클을 독립적으로 수행"""
-    df_range = df[(df.index >= start) & (df.index <= end)]
+def run_sequential(df, start, end, seed, params=DEFAULT_PARAMS):
+    """이전 코드와 동일한 방식의 연속 매매 시뮬레이션"""
+    arrays = ohlc_arrays(df)
+    return sequential_tables(df.index, arrays['close'].tolist(), arrays['high'].tolist(),
+                             _range_offsets(df.index, start, end), seed, params)
+
+# ── 배열 기반 ROLLING 엔진 ────────────────────────────────────
+def ohlc_arrays(df):
+    """일봉 DataFrame → 날짜 문자열 목록 + 연속된 float64 종가/고가 배열 (모든 사이클이 한 번 변환한 배열을 공유)"""
+    return {
+        'dates': df.index.strftime('%Y-%m-%d').tolist(),
+        'close': np.ascontiguousarray(df['Close'].to_numpy(dtype=np.float64)),
+        'high': np.ascontiguousarray(df['High'].to_numpy(dtype=np.float64)),
+    }
+
+def cycle_at(close, high, i0, seed, params=DEFAULT_PARAMS):
+    """offset i0 에서 시작하는 사이클 하나 → (끝 offset, 일수, 손익, 수익률, 상태) | None
+
+    기본 파라미터에서는 simulate_one_cycle 과 같은 계산을 같은 순서로 수행 (결과가 소수점까지 동일)
+    close/high: 파이썬 float 목록 (원소 하나씩 읽을 때는 NumPy 배열보다 목록이 훨씬 빠름)
+    """
+    splits = params.splits
+    tier_1, tier_2 = params.tier_days
+    profit_0, profit_1, profit_2 = params.profit_tiers
+    daily_budget = seed / splits
+    part_b = daily_budget * (1 - params.avg_buy_ratio)
+    part_a = daily_budget * params.avg_buy_ratio
+    shares = 0
+    invested_amount = 0
+    avg_price = 0
+
+    # 기존 코드의 60일 창(= 40일 + 여유 20일)을 분할 일수에 맞춰 늘림
+    for day_count, i in enumerate(range(i0, min(i0 + splits + 20, len(close))), 1):
+        price = close[i]
+
+        # [STEP 1] 매도 체크
+        if shares > 0:
+            target_profit = profit_0
+            if day_count > tier_2: target_profit = profit_2
+            elif day_count > tier_1: target_profit = profit_1
+            target_sell_price = avg_price * (1 + target_profit)
+            if high[i] >= target_sell_price:
+                profit = (shares * target_sell_price) - invested_amount
+                return i, day_count, round(profit, 2), round(target_profit * 100, 2), 'Success'
+
+        # [STEP 2] 매수 (분할 일수째에 매도가 안 되었으면 종료)
+        if day_count == 1:
+            buy_shares = int(daily_budget // price)
+        else:
+            shares_b = int(part_b // price)
+            shares_a = int(part_a // price) if price <= avg_price else 0
+            buy_shares = shares_a + shares_b
+
+        shares += buy_shares
+        invested_amount += buy_shares * price
+        avg_price = invested_amount / shares if shares > 0 else 0
+
+        if day_count == splits:
+            current_profit = (shares * price) - invested_amount
+            current_return = (shares * price / invested_amount - 1) * 100 if invested_amount > 0 else 0
+            return i, day_count, round(current_profit, 2), round(current_return, 2), f'Ended ({params.splits}d)'
+    return None
+
+def rolling_table(dates, close, high, offsets, seed, params=DEFAULT_PARAMS):
+    """offsets 의 시작일마다 사이클 하나 → 결과 DataFrame (dates: 날짜 문자열 목록)"""
     results = []
-    
-    print(f"ROLLING 모드: {len(df_range)}개의 시작일에 대해 시뮬레이션 중...")
-    
-    for start_date in df_range.index:
-        res = simulate_one_cycle(df, start_date, seed)
+    for i0 in offsets.tolist():
+        res = cycle_at(close, high, i0, seed, params)
         if res:
-            results.append(res)
-            
+            end_i, days, profit, ret, status = res
+            results.append({'Start': dates[i0], 'End': dates[end_i], 'Days': days,
+                            'Profit': profit, 'Return': ret, 'Status': status})
     return pd.DataFrame(results)
 
+def run_rolling(df, start, end, seed, params=DEFAULT_PARAMS):
+    """모든 시작 가능일에 대해 40일 사이클을 독립적으로 수행
+
+    일봉을 배열로 한 번만 바꾸고 시작일마다 정수 offset 으로 최대 60개 원소만 훑음
+    (시작일마다 전체 DataFrame 을 다시 거르고 iterrows 로 도는 simulate_one_cycle 과 결과 동일)
+    """
+    arrays = ohlc_arrays(df)
+    offsets = _range_offsets(df.index, start, end)
+    print(f"ROLLING 모드: {len(offsets)}개의 시작일에 대해 시뮬레이션 중...")
+    return rolling_table(arrays['dates'], arrays['close'].tolist(), arrays['high'].tolist(), offsets, seed, params)
+
+def sequential_summary(history_df, cycles_df, seed):
+    total = history_df['Total']
+    return {
+        'FinalEquity': total.iloc[-1],
+        'Return(%)': round((total.iloc[-1] / seed - 1) * 100, 2),
+        'MDD(%)': round((total / total.cummax() - 1).min() * 100, 2),
+        'Cycles': len(cycles_df),
+    }
+
+def rolling_summary(results_df):
+    tests = len(results_df)
+    wins = int((results_df['Status'] == 'Success').sum()) if tests else 0
+    return {
+        'RollingTests': tests,
+        'WinRate(%)': round(wins / tests * 100, 2) if tests else 0.0,
+        'AvgReturn(%)': round(results_df['Return'].mean(), 2) if tests else 0.0,
+        'AvgDays': round(results_df['Days'].mean(), 1) if tests else 0.0,
+    }
+
+def save_sequential_csv(path, ticker, start, end, seed, history_df):
+    final = history_df['Total'].iloc[-1]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"# [ 무한매수법 V2.1 시뮬레이션 요약 - SEQUENTIAL ]\n")
+        f.write(f"# 종목: {ticker} | 기간: {start} ~ {end}\n")
+        f.write(f"# 최종 자산: ${final:,.2f} | 총 수익률: {((final / seed) - 1) * 100:.2f}%\n\n")
+    history_df.to_csv(path, mode='a', index=False)
+
+def save_rolling_csv(path, ticker, start, end, results_df):
+    tests = len(results_df)
+    win_rate = (results_df['Status'] == 'Success').sum() / tests * 100 if tests else 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"# [ 무한매수법 V2.1 시뮬레이션 요약 - ROLLING ]\n")
+        f.write(f"# 종목: {ticker} | 기간: {start} ~ {end}\n")
+        f.write(f"# 테스트 건수: {tests} | 승률: {win_rate:.2f}% | 평균 수익률: {results_df['Return'].mean():.2f}%\n\n")
+    results_df.to_csv(path, mode='a', index=False)
+
+# ── 공유 메모리 프로세스 풀 (SWEEP / UNIVERSE) ───────────────────
+_shared = None   # 워커 프로세스: {'shm', 'block', 'spans', 'series'}
+
+def _attach_shared(name, n, spans):
+    """워커 시작 시 한 번: 부모가 만든 공유 메모리 블록을 붙임 (DataFrame 을 pickle 로 넘기지 않음)"""
+    global _shared
+    from multiprocessing import shared_memory
+    # spawn 워커는 부모의 자원 추적기를 함께 쓰므로 해제(unlink)는 만든 부모가 한 번만 함
+    shm = shared_memory.SharedMemory(name=name)
+    _shared = {'shm': shm, 'block': np.ndarray((3, n), dtype=np.float64, buffer=shm.buf),
+               'spans': spans, 'series': {}}
+
+def _shared_series(key):
+    """워커: 키의 (날짜 인덱스, 종가 목록, 고가 목록)
+
+    사이클 루프는 원소를 하나씩 읽으므로 처음 쓸 때 한 번만 파이썬 목록으로 바꿔 둠
+    """
+    series = _shared['series']
+    if key not in series:
+        a, b = _shared['spans'][key]
+        block = _shared['block']
+        index = pd.DatetimeIndex(block[0, a:b].astype(np.int64).astype('datetime64[D]'))
+        series[key] = (index, block[1, a:b].tolist(), block[2, a:b].tolist())
+    return series[key]
+
+@contextmanager
+def _shared_pool(frames, workers):
+    """{키: 일봉} 을 공유 메모리 블록 하나(행: 날짜(epoch 일수)/종가/고가, 키마다 열 구간)에 올리고
+    그 블록을 붙인 spawn 프로세스 풀을 돌려줌 (블록은 풀이 끝나면 해제)"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    spans, n = {}, 0
+    for key, df in frames.items():
+        spans[key] = (n, n + len(df))
+        n += len(df)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, 3 * n * 8))
+    try:
+        block = np.ndarray((3, n), dtype=np.float64, buffer=shm.buf)
+        for key, df in frames.items():
+            a, b = spans[key]
+            block[0, a:b] = df.index.values.astype('datetime64[D]').astype(np.int64)
+            block[1, a:b] = df['Close'].to_numpy(dtype=np.float64)
+            block[2, a:b] = df['High'].to_numpy(dtype=np.float64)
+        del block
+        # 조회 스레드가 없는 스크립트지만 render_pool 과 같이 spawn 으로 통일
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_attach_shared, initargs=(shm.name, n, spans)) as executor:
+            yield executor
+    finally:
+        shm.close()
+        shm.unlink()
+
+# ── 파라미터 스윕 ──────────────────────────────────────────
+def param_grid(grid):
+    """{필드: [값들]} → 모든 조합의 StrategyParams 목록"""
+    keys = list(grid)
+    return [StrategyParams(**dict(zip(keys, values))) for values in itertools.product(*(grid[k] for k in keys))]
+
+def evaluate(close, high, lo, hi, seed, params):
+    """한 파라미터 조합의 SEQUENTIAL(최종 자산) + ROLLING(승률, 평균 소요일) 요약"""
+    cash, shares, cycles, _ = _sequential(close, high, lo, hi, seed, params)
+    final_equity = cash + shares * close[hi - 1]
+    rolling = [res for res in (cycle_at(close, high, i0, seed, params) for i0 in range(lo, hi)) if res]
+    wins = sum(res[4] == 'Success' for res in rolling)
+    return {
+        'FinalEquity': round(final_equity, 2),
+        'Return(%)': round((final_equity / seed - 1) * 100, 2),
+        'Cycles': len(cycles),
+        'WinRate(%)': round(wins / len(rolling) * 100, 2) if rolling else 0.0,
+        'AvgDays': round(sum(res[1] for res in rolling) / len(rolling), 1) if rolling else 0.0,
+        'RollingTests': len(rolling),
+    }
+
+def _sweep_task(params, lo, hi, seed):
+    _, close, high = _shared_series('sweep')
+    return evaluate(close, high, lo, hi, seed, params)
+
+def _print_progress(done, total, t0, workers):
+    elapsed = time.perf_counter() - t0
+    rate = done / elapsed if elapsed > 0 else 0.0
+    eta = (total - done) / rate if rate else 0.0
+    print(f"[스윕] {done}/{total} ({done / total * 100:.0f}%) {rate:.1f} runs/s, 남은 시간 약 {eta:.0f}s (워커 {workers}개)")
+
+def run_sweep(df, start, end, seed, grid=None, workers=None, progress_every=1.0):
+    """파라미터 조합마다 evaluate 를 여러 프로세스에서 실행 → 최종 자산 순 순위표
+
+    OHLC 는 공유 메모리에 한 번만 올려 모든 워커가 같이 읽고, 작업마다 넘기는 것은 파라미터와 구간 offset 뿐
+    """
+    grid = grid or SWEEP_GRID
+    workers = workers or SWEEP_WORKERS
+    params_list = param_grid(grid)
+    offsets = _range_offsets(df.index, start, end)
+    if len(offsets) == 0:
+        print(f"SWEEP 모드: {start} ~ {end} 기간에 거래일이 없습니다.")
+        return pd.DataFrame()
+    lo, hi = int(offsets[0]), int(offsets[-1]) + 1
+    total = len(params_list)
+    print(f"SWEEP 모드: 파라미터 조합 {total}개 x (SEQUENTIAL + ROLLING {hi - lo}개 시작일), 워커 {workers}개")
+
+    t0 = time.perf_counter()
+    last = t0
+    rows = []
+    with ExitStack() as stack:
+        if workers <= 1:
+            arrays = ohlc_arrays(df)
+            close, high = arrays['close'].tolist(), arrays['high'].tolist()
+            results = (evaluate(close, high, lo, hi, seed, params) for params in params_list)
+        else:
+            executor = stack.enter_context(_shared_pool({'sweep': df}, workers))
+            # 조합 수가 많을수록 결과를 몇 개씩 묶어 돌려받아 프로세스 간 왕복을 줄임
+            results = executor.map(_sweep_task, params_list, itertools.repeat(lo), itertools.repeat(hi),
+                                   itertools.repeat(seed), chunksize=max(1, total // (workers * 8)))
+        for row in results:
+            rows.append(row)
+            if time.perf_counter() - last >= progress_every:
+                last = time.perf_counter()
+                _print_progress(len(rows), total, t0, workers)
+
+    elapsed = time.perf_counter() - t0
+    print(f"[스윕] {total}개 조합 완료: {elapsed:.2f}s, {total / elapsed:.1f} runs/s (워커 {workers}개)")
+
+    table = pd.DataFrame([{
+        'splits': p.splits,
+        'profit_tiers': '/'.join(f"{t * 100:g}" for t in p.profit_tiers),
+        'tier_days': '/'.join(str(d) for d in p.tier_days),
+        'avg_buy_ratio': p.avg_buy_ratio,
+        'soul_sell': p.soul_sell,
+        **row,
+    } for p, row in zip(params_list, rows)])
+    table = table.sort_values(['FinalEquity', 'WinRate(%)'], ascending=False, kind='stable').reset_index(drop=True)
+    table.insert(0, 'Rank', range(1, len(table) + 1))
+    return table
+
+# ── 여러 종목 (UNIVERSE) ─────────────────────────────────────
+# 리더보드 열 (기간 안에 데이터가 없는 종목도 같은 열에 빈 값으로 한 줄)
+LEADERBOARD_COLUMNS = ['Ticker', 'Seed', 'First', 'Last', 'TradingDays', 'FinalEquity', 'Return(%)', 'MDD(%)',
+                       'Cycles', 'BuyHold(%)', 'RollingTests', 'WinRate(%)', 'AvgReturn(%)', 'AvgDays', 'Sec']
+
+def seed_for(ticker):
+    """종목 통화에 맞는 시드 (원화 종목에 달러 시드를 쓰면 하루 예산으로 1주도 못 삼)"""
+    return KRX_SEED if ticker.endswith(('.KS', '.KQ')) else TOTAL_SEED
+
+def backtest_ticker(ticker, index, close, high, start, end, params, output_dir):
+    """한 종목의 SEQUENTIAL + ROLLING → 상세 CSV 2개 저장 후 리더보드 한 줄"""
+    t0 = time.perf_counter()
+    offsets = _range_offsets(index, start, end)
+    if len(offsets) == 0:
+        return {'Ticker': ticker, 'TradingDays': 0}
+    seed = seed_for(ticker)
+    lo, hi = int(offsets[0]), int(offsets[-1]) + 1
+    history_df, cycles_df = sequential_tables(index, close, high, offsets, seed, params)
+    results_df = rolling_table(index.strftime('%Y-%m-%d').tolist(), close, high, offsets, seed, params)
+
+    save_sequential_csv(os.path.join(output_dir, f"simul_sequential_{ticker}_{start}_{end}.csv"),
+                        ticker, start, end, seed, history_df)
+    save_rolling_csv(os.path.join(output_dir, f"simul_rolling_{ticker}_{start}_{end}.csv"),
+                     ticker, start, end, results_df)
+    return {
+        'Ticker': ticker, 'Seed': seed,
+        'First': index[lo].strftime('%Y-%m-%d'), 'Last': index[hi - 1].strftime('%Y-%m-%d'), 'TradingDays': hi - lo,
+        **sequential_summary(history_df, cycles_df, seed),
+        'BuyHold(%)': round((close[hi - 1] / close[lo] - 1) * 100, 2),
+        **rolling_summary(results_df),
+        'Sec': round(time.perf_counter() - t0, 3),
+    }
+
+def _universe_task(ticker, start, end, params, output_dir):
+    index, close, high = _shared_series(ticker)
+    return backtest_ticker(ticker, index, close, high, start, end, params, output_dir)
+
+def run_universe(tickers=None, start=START_DATE, end=END_DATE, params=DEFAULT_PARAMS, workers=None,
+                 output_dir=None, frames=None):
+    """여러 종목을 한 번에 로드해 종목마다 SEQUENTIAL + ROLLING 을 병렬로 돌림 → 리더보드 DataFrame
+
+    output_dir 에 leaderboard.csv 와 종목별 상세 CSV 를 저장 (frames: 이미 로드한 {종목: 일봉})
+    """
+    tickers = list(dict.fromkeys(tickers or UNIVERSE))
+    frames = frames if frames is not None else get_prepared_universe(tickers, start, end)
+    missing = [t for t in tickers if t not in frames]
+    if missing:
+        print(f"[유니버스] 데이터 없음 → 제외: {', '.join(missing)}")
+    output_dir = output_dir or os.path.join("result", f"universe_{start}_{end}")
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(1, min(workers or UNIVERSE_WORKERS, len(frames)))
+    print(f"UNIVERSE 모드: 종목 {len(frames)}개, 기간 {start} ~ {end}, 워커 {workers}개")
+
+    t0 = time.perf_counter()
+    rows = []
+    if workers <= 1:
+        for ticker, df in frames.items():
+            arrays = ohlc_arrays(df)
+            rows.append(backtest_ticker(ticker, df.index, arrays['close'].tolist(), arrays['high'].tolist(),
+                                        start, end, params, output_dir))
+            print(f"[유니버스] {ticker} 완료 ({len(rows)}/{len(frames)}, {rows[-1].get('Sec', 0):.2f}s)")
+    else:
+        from concurrent.futures import as_completed
+        with _shared_pool(frames, workers) as executor:
+            futures = {executor.submit(_universe_task, ticker, start, end, params, output_dir): ticker
+                       for ticker in frames}
+            for future in as_completed(futures):
+                try:
+                    rows.append(future.result())
+                except Exception as e:
+                    print(f"[유니버스] {futures[future]} 실패: {e}")
+                    continue
+                print(f"[유니버스] {futures[future]} 완료 ({len(rows)}/{len(frames)}, {rows[-1].get('Sec', 0):.2f}s)")
+
+    elapsed = time.perf_counter() - t0
+    serial = sum(row.get('Sec', 0) for row in rows)
+    print(f"[유니버스] 전체 {elapsed:.2f}s (종목별 합계 {serial:.2f}s, 워커 {workers}개)")
+
+    board = pd.DataFrame(rows).reindex(columns=LEADERBOARD_COLUMNS)
+    if board.empty:
+        return board
+    board = board.sort_values('Return(%)', ascending=False, kind='stable', na_position='last').reset_index(drop=True)
+    board.insert(0, 'Rank', range(1, len(board) + 1))
+    path = os.path.join(output_dir, "leaderboard.csv")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"# [ 무한매수법 종목별 리더보드 - SEQUENTIAL 총 수익률 순 ]\n")
+        f.write(f"# 기간: {start} ~ {end} | 종목: {len(board)}개 | 시드: 달러 {TOTAL_SEED:,} / 원화 {KRX_SEED:,}\n")
+        f.write(f"# 승률/평균 수익률/평균 소요 기간은 ROLLING(모든 시작일) 기준, 상세는 같은 폴더의 종목별 CSV\n\n")
+    board.drop(columns=['Sec'], errors='ignore').to_csv(path, mode='a', index=False)   # 소요 시간은 실행마다 달라 파일에서 뺌
+    print(f"[알림] 리더보드가 '{path}'로 저장되었습니다.")
+    return board
+
 # --- 메인 실행 로직 ---
-raw_df = get_prepared_data(TICKER, START_DATE, END_DATE)
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='무한매수법 V2.1 백테스트 (기본값은 파일 상단 설정)')
+    parser.add_argument('--mode', choices=['SEQUENTIAL', 'ROLLING', 'SWEEP', 'UNIVERSE'], default=MODE)
+    parser.add_argument('--tickers', nargs='+', help='종목 (UNIVERSE 는 전부, 나머지 모드는 첫 종목만)')
+    parser.add_argument('--start', default=START_DATE)
+    parser.add_argument('--end', default=END_DATE)
+    args = parser.parse_args(argv)
+    mode, start, end = args.mode, args.start, args.end
+
+    if mode == "UNIVERSE":
+        board = run_universe(args.tickers or UNIVERSE, start, end)
+        if not board.empty:
+            print(f"\n=== 무한매수법 V2.1 종목별 리더보드 ({start} ~ {end}) ===")
+            print(board.drop(columns=['Sec'], errors='ignore').to_string(index=False))
+        return
+
+    ticker = args.tickers[0] if args.tickers else TICKER
+    raw_df = get_prepared_data(ticker, start, end)
+    if raw_df is None:
+        print("데이터를 불러올 수 없습니다.")
+        return
+    if len(_range_offsets(raw_df.index, start, end)) == 0:
+        # 기간 오타, 휴장일만 있는 기간, 기간 뒤에 상장한 종목 등
+        print(f"{ticker}: {start} ~ {end} 기간에 거래일이 없습니다.")
+        return
 
-if raw_df is not None:
     output_dir = "result"
     os.makedirs(output_dir, exist_ok=True)
 
-    if MODE == "SEQUENTIAL":
-        history_df, cycles_df = run_sequential(raw_df, START_DATE, END_DATE, TOTAL_SEED)
-        print(f"=== {TICKER} 무한매수법 V2.1 시뮬레이션 결과 (SEQUENTIAL) ===")
+    if mode == "SEQUENTIAL":
+        history_df, cycles_df = run_sequential(raw_df, start, end, TOTAL_SEED)
+        print(f"=== {ticker} 무한매수법 V2.1 시뮬레이션 결과 (SEQUENTIAL) ===")
         print(f"최종 자산: ${history_df['Total'].iloc[-1]:,.2f}")
         print(f"총 수익률: {((history_df['Total'].iloc[-1] / TOTAL_SEED) - 1) * 100:.2f}%")
         print(f"총 사이클 횟수: {len(cycles_df)}회")
-        
-        csv_filename = os.path.join(output_dir, f"simul_sequential_{TICKER}_{START_DATE}_{END_DATE}.csv")
-        with open(csv_filename, 'w', encoding='utf-8') as f:
-            f.write(f"# [ 무한매수법 V2.1 시뮬레이션 요약 - SEQUENTIAL ]\n")
-            f.write(f"# 종목: {TICKER} | 기간: {START_DATE} ~ {END_DATE}\n")
-            f.write(f"# 최종 자산: ${history_df['Total'].iloc[-1]:,.2f} | 총 수익률: {((history_df['Total'].iloc[-1] / TOTAL_SEED) - 1) * 100:.2f}%\n\n")
-        
-        history_df.to_csv(csv_filename, mode='a', index=False)
+
+        csv_filename = os.path.join(output_dir, f"simul_sequential_{ticker}_{start}_{end}.csv")
+        save_sequential_csv(csv_filename, ticker, start, end, TOTAL_SEED, history_df)
         print(f"\n[알림] 상세 진행 과정이 '{csv_filename}'로 저장되었습니다.")
         print("\n--- 최근 15일 진행 상황 ---")
         print(history_df.tail(15).to_string(index=False))
 
-    elif MODE == "ROLLING":
-        results_df = run_rolling(raw_df, START_DATE, END_DATE, TOTAL_SEED)
-        print(f"\n=== {TICKER} 무한매수법 V2.1 시뮬레이션 결과 (ROLLING) ===")
+    elif mode == "ROLLING":
+        results_df = run_rolling(raw_df, start, end, TOTAL_SEED)
+        print(f"\n=== {ticker} 무한매수법 V2.1 시뮬레이션 결과 (ROLLING) ===")
         print(f"총 테스트 건수: {len(results_df)}건")
-        
+
         success_df = results_df[results_df['Status'] == 'Success']
         win_rate = (len(success_df) / len(results_df)) * 100 if len(results_df) > 0 else 0
-        
+
         print(f"성공(익절) 횟수: {len(success_df)}회")
         print(f"승률: {win_rate:.2f}%")
         print(f"평균 수익률: {results_df['Return'].mean():.2f}%")
         print(f"평균 소요 기간: {results_df['Days'].mean():.1f}일")
-        
-        csv_filename = os.path.join(output_dir, f"simul_rolling_{TICKER}_{START_DATE}_{END_DATE}.csv")
-        with open(csv_filename, 'w', encoding='utf-8') as f:
-            f.write(f"# [ 무한매수법 V2.1 시뮬레이션 요약 - ROLLING ]\n")
-            f.write(f"# 종목: {TICKER} | 기간: {START_DATE} ~ {END_DATE}\n")
-            f.write(f"# 테스트 건수: {len(results_df)} | 승률: {win_rate:.2f}% | 평균 수익률: {results_df['Return'].mean():.2f}%\n\n")
-            
-        results_df.to_csv(csv_filename, mode='a', index=False)
+
+        csv_filename = os.path.join(output_dir, f"simul_rolling_{ticker}_{start}_{end}.csv")
+        save_rolling_csv(csv_filename, ticker, start, end, results_df)
         print(f"\n[알림] 모든 사이클 결과가 '{csv_filename}'로 저장되었습니다.")
         print("\n--- 최근 15개 사이클 결과 ---")
         print(results_df.tail(15).to_string(index=False))
-else:
-    print("데이터를 불러올 수 없습니다.")
\ No newline at end of file
+
+    elif mode == "SWEEP":
+        table = run_sweep(raw_df, start, end, TOTAL_SEED)
+        best = table.iloc[0]
+        print(f"\n=== {ticker} 무한매수법 파라미터 스윕 결과 ({len(table)}개 조합) ===")
+        print(f"1위: 최종 자산 ${best['FinalEquity']:,.2f} ({best['Return(%)']:.2f}%), "
+              f"승률 {best['WinRate(%)']:.2f}%, 평균 소요 기간 {best['AvgDays']:.1f}일")
+
+        csv_filename = os.path.join(output_dir, f"simul_sweep_{ticker}_{start}_{end}.csv")
+        with open(csv_filename, 'w', encoding='utf-8') as f:
+            f.write(f"# [ 무한매수법 파라미터 스윕 - SEQUENTIAL 최종 자산 순 ]\n")
+            f.write(f"# 종목: {ticker} | 기간: {start} ~ {end} | 조합: {len(table)}개\n")
+            f.write(f"# 승률/평균 소요 기간은 ROLLING(모든 시작일) 기준\n\n")
+        table.to_csv(csv_filename, mode='a', index=False)
+        print(f"\n[알림] 전체 순위표가 '{csv_filename}'로 저장되었습니다.")
+        print("\n--- 상위 15개 조합 ---")
+        print(table.head(15).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
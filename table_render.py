@@ -0,0 +1,160 @@
+import os
+
+from plot_style import setup_fonts, figure_to_png, pil_font, pt_to_px
+
+# ==========================================
+# [설정] 표 이미지 렌더러
+# ==========================================
+# 'pillow': 셀을 직접 그림 (빠름) / 'matplotlib': ax.table 로 그림 (기존 방식)
+TABLE_BACKEND = os.environ.get('TABLE_BACKEND', 'pillow')
+IMAGE_SIZE = 1080          # 출력 이미지 한 변(px)
+BG_COLOR = '#f8f9fa'
+EDGE_COLOR = '#ddd'
+HEADER_BG = '#444444'
+CAPTION_HEIGHT = 0.07      # 조회기준일시 행 높이 (데이터 행 대비 비율 계산용)
+ROW_HEIGHT = 0.09          # 칼럼명/데이터 행 높이
+FONT_SIZE = 11             # 데이터 행 글자 크기(pt), 칼럼명/조회기준일시는 10pt
+# ==========================================
+
+BOLD_WEIGHTS = {'bold', 'heavy', 'black', '900'}
+
+
+def cell_style(bg='#ffffff', color='#222', weight='normal', ha='center'):
+    """셀 하나의 스타일 (배경색, 글자색, 굵기, 가로 정렬)"""
+    return {'bg': bg, 'color': color, 'weight': weight, 'ha': ha}
+
+
+class TableSpec:
+    """표 이미지 한 장을 그리는 데 필요한 값
+
+    rows 는 표시할 문자열, styles 는 rows 와 같은 모양의 cell_style 행렬로 미리 계산해서 넘김
+    (렌더러는 텍스트를 다시 숫자로 해석하거나 옆 셀을 참조하지 않음)
+    col_widths: 열별 상대 너비 (None 이면 모두 같은 너비)
+    """
+
+    def __init__(self, columns, rows, styles, caption='', col_widths=None):
+        self.columns = list(columns)
+        self.rows = rows
+        self.styles = styles
+        self.caption = caption
+        self.col_widths = col_widths or [1.0] * len(self.columns)
+
+
+# ── matplotlib 렌더러 ──────────────────────────────────────
+def render_matplotlib(spec):
+    from matplotlib.figure import Figure
+    setup_fonts()
+
+    # pyplot 전역 상태를 쓰지 않는 Figure 객체로 그려 다른 스테이지와 동시에 실행해도 안전
+    fig = Figure(figsize=(IMAGE_SIZE / 100, IMAGE_SIZE / 100), dpi=100)
+    ax = fig.subplots()
+    fig.patch.set_facecolor(BG_COLOR)
+    ax.axis('off')
+
+    ncols = len(spec.columns)
+    caption_row = [''] * (ncols - 1) + [spec.caption]
+    table = ax.table(cellText=[caption_row, spec.columns] + spec.rows, colLabels=None,
+                     loc='center', cellLoc='center', bbox=[0.01, 0.01, 0.99, 0.99])
+    table.auto_set_font_size(False)
+    table.set_fontsize(FONT_SIZE)
+
+    total_width = sum(spec.col_widths)
+    for (row, col), cell in table.get_celld().items():
+        cell.set_width(spec.col_widths[col] / total_width)
+        if row == 0:
+            # 생성날짜 행: 테두리 없이 맨 오른쪽 셀에만 조회기준일시 표시
+            cell.set_edgecolor('none')
+            cell.set_facecolor('#fff')
+            cell.set_text_props(ha='right', va='center', color='blue', fontsize=10, weight='black')
+            cell.set_height(CAPTION_HEIGHT)
+        elif row == 1:
+            cell.set_facecolor(HEADER_BG)
+            cell.set_fontsize(10)
+            cell.set_text_props(weight='black', color='#fff', ha='center')
+            cell.set_edgecolor(EDGE_COLOR)
+            cell.set_height(ROW_HEIGHT)
+        else:
+            style = spec.styles[row - 2][col]
+            cell.set_facecolor(style['bg'])
+            cell.set_edgecolor(EDGE_COLOR)
+            cell.set_height(ROW_HEIGHT)
+            cell.set_text_props(color=style['color'], weight=style['weight'], ha=style['ha'])
+
+    # pad_inches=0으로 저장하여 여백 완전 제거
+    return figure_to_png(fig, bbox_inches='tight', pad_inches=0, dpi=100)
+
+
+# ── Pillow 렌더러 ──────────────────────────────────────────
+def render_pillow(spec):
+    """Pillow 로 셀 배경/테두리/텍스트를 직접 그려 1080x1080 PNG 바이트로 반환"""
+    import io
+    from PIL import Image, ImageDraw
+
+    img = Image.new('RGB', (IMAGE_SIZE, IMAGE_SIZE), BG_COLOR)
+    draw = ImageDraw.Draw(img)
+
+    # matplotlib 렌더러와 같은 비율로 행 높이/열 너비 배분 (표가 이미지를 꽉 채움)
+    margin = round(IMAGE_SIZE * 0.01)
+    width = height = IMAGE_SIZE - 2 * margin
+    units = CAPTION_HEIGHT + ROW_HEIGHT * (len(spec.rows) + 1)
+    caption_h = height * CAPTION_HEIGHT / units
+    row_h = height * ROW_HEIGHT / units
+    total_width = sum(spec.col_widths)
+    xs = [margin]
+    for w in spec.col_widths:
+        xs.append(xs[-1] + width * w / total_width)
+
+    # 행이 많아 칸이 작아지면 글자도 칸 안에 들어가도록 줄임
+    body_size = min(pt_to_px(FONT_SIZE), max(1, int(row_h * 0.75)))
+    header_size = min(pt_to_px(10), max(1, int(row_h * 0.75)))
+    pad = 0.1  # matplotlib Cell.PAD 와 같은 좌우 여백 비율
+
+    def put_text(x0, x1, y0, y1, text, color, size, bold, ha):
+        if not text:
+            return
+        cy = (y0 + y1) / 2
+        if ha == 'right':
+            x, anchor = x1 - (x1 - x0) * pad, 'rm'
+        elif ha == 'left':
+            x, anchor = x0 + (x1 - x0) * pad, 'lm'
+        else:
+            x, anchor = (x0 + x1) / 2, 'mm'
+        draw.text((x, cy), text, fill=color, font=pil_font(size, bold), anchor=anchor)
+
+    # 조회기준일시 행 (맨 오른쪽 열 기준 우측 정렬)
+    y = margin
+    draw.rectangle([margin, y, margin + width, y + caption_h], fill='#ffffff')
+    put_text(xs[-2], xs[-1], y, y + caption_h, spec.caption, 'blue', header_size, True, 'right')
+    y += caption_h
+
+    # 칼럼명 행
+    for col, name in enumerate(spec.columns):
+        draw.rectangle([xs[col], y, xs[col + 1], y + row_h], fill=HEADER_BG, outline=EDGE_COLOR)
+        put_text(xs[col], xs[col + 1], y, y + row_h, name, '#ffffff', header_size, True, 'center')
+    y += row_h
+
+    # 데이터 행: 미리 계산된 스타일 행렬을 그대로 적용
+    for texts, styles in zip(spec.rows, spec.styles):
+        for col, (text, style) in enumerate(zip(texts, styles)):
+            draw.rectangle([xs[col], y, xs[col + 1], y + row_h], fill=style['bg'], outline=EDGE_COLOR)
+            put_text(xs[col], xs[col + 1], y, y + row_h, text, style['color'], body_size,
+                     style['weight'] in BOLD_WEIGHTS, style['ha'])
+        y += row_h
+
+    buf = io.BytesIO()
+    img.save(buf, format='PNG')
+    return buf.getvalue()
+
+
+BACKENDS = {
+    'matplotlib': render_matplotlib,
+    'pillow': render_pillow,
+}
+
+
+def render_table(spec, backend=None):
+    """TableSpec 을 지정한 백엔드(기본 TABLE_BACKEND)로 그려 PNG 바이트로 반환"""
+    backend = backend or TABLE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 표 렌더러: {backend} (가능: {', '.join(BACKENDS)})")
+    return BACKENDS[backend](spec)
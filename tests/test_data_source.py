@@ -0,0 +1,73 @@
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_source import DataSourceError, YFinanceSource
+from tools.synthetic import make_ohlcv
+
+
+def yf_frame(tickers, empty=()):
+    """yf.download(group_by='column') 모양 (필드, 티커) 표, empty 티커는 모든 값이 NaN"""
+    frames = {t: make_ohlcv(t, '2024-01-01', '2024-01-31').astype(float) for t in tickers}
+    for t in empty:
+        frames[t][:] = np.nan
+    return pd.concat(frames, axis=1).swaplevel(0, 1, axis=1)
+
+
+def fake_yfinance(monkeypatch, download, per_call_ctx=False):
+    """yfinance 대신 쓸 모듈 (per_call_ctx: 호출별 결과를 따로 모으는 1.x 처럼 multi._DownloadCtx 를 가짐)"""
+    yf = types.ModuleType('yfinance')
+    yf.download = download
+    if per_call_ctx:
+        yf.multi = types.SimpleNamespace(_DownloadCtx=object)
+    monkeypatch.setitem(sys.modules, 'yfinance', yf)
+
+
+def test_ticker_without_data_is_dropped_from_partial_response(monkeypatch, capsys):
+    fake_yfinance(monkeypatch, lambda tickers, **kwargs: yf_frame(['AAPL', 'MSFT'], empty=['MSFT']))
+
+    panel = YFinanceSource().download(['AAPL', 'MSFT', 'NOPE'], period='1mo')
+
+    assert panel['Close']['AAPL'].notna().all()
+    assert panel['Close'][['MSFT', 'NOPE']].isna().all().all()
+    assert '데이터를 받지 못한 티커: MSFT, NOPE' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('response', [pd.DataFrame(), yf_frame(['AAPL'], empty=['AAPL'])])
+def test_empty_response_raises_retryable_error(monkeypatch, response):
+    fake_yfinance(monkeypatch, lambda tickers, **kwargs: response)
+
+    with pytest.raises(DataSourceError) as exc:
+        YFinanceSource().download(['AAPL'], period='1mo')
+
+    assert exc.value.status == 503
+
+
+@pytest.mark.parametrize('per_call_ctx, expected', [(False, 1), (True, 3)])
+def test_concurrent_downloads_serialized_only_without_per_call_context(monkeypatch, per_call_ctx, expected):
+    """모듈 전역으로 결과를 모으는 옛 yfinance 에서는 동시에 한 번만 호출"""
+    lock, running, peak = threading.Lock(), [0], [0]
+
+    def download(tickers, **kwargs):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.1)
+        with lock:
+            running[0] -= 1
+        return yf_frame(tickers)
+
+    fake_yfinance(monkeypatch, download, per_call_ctx)
+    source = YFinanceSource()
+    threads = [threading.Thread(target=source.download, args=([t],)) for t in ['AAPL', 'MSFT', 'NVDA']]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] == expected
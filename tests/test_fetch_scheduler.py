@@ -0,0 +1,81 @@
+import threading
+import time
+
+import pytest
+
+from data_source import DataSourceError
+from fetch_scheduler import FetchScheduler
+
+
+@pytest.fixture
+def release():
+    """멈춘 작업을 흉내내는 Event (테스트가 끝나면 풀어서 스레드를 정리)"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def scheduler(**kwargs):
+    return FetchScheduler(**{'rate': 1000, 'burst': 1000, 'backoff': 0.01, **kwargs})
+
+
+def test_results_and_errors_are_reported_per_task():
+    def fail():
+        raise ValueError('bad ticker')
+
+    results, report = scheduler().run({'a': lambda: 1, 'b': fail}, tickers_of={'b': ['B1', 'B2']})
+
+    assert results == {'a': 1}
+    assert report.entries['a']['status'] == 'ok'
+    assert report.entries['b']['status'] == 'error'
+    assert report.entries['b']['attempts'] == 1   # 재시도 대상이 아닌 오류는 바로 포기
+    assert report.tickers_with('error') == ['B1', 'B2']
+
+
+def test_rate_limited_task_is_retried_with_backoff():
+    calls = []
+
+    def flaky():
+        calls.append(time.monotonic())
+        if len(calls) < 3:
+            raise DataSourceError('Too Many Requests', status=429)
+        return 'ok'
+
+    results, report = scheduler().run({'a': flaky})
+
+    assert results == {'a': 'ok'}
+    assert report.entries['a']['attempts'] == 3
+    assert calls[2] - calls[1] >= calls[1] - calls[0] >= 0.01
+
+
+def test_retries_stop_after_max_retries():
+    def unavailable():
+        raise DataSourceError('빈 응답', status=503)
+
+    _, report = scheduler(max_retries=2).run({'a': unavailable})
+
+    assert report.entries['a']['status'] == 'error'
+    assert report.entries['a']['attempts'] == 3
+
+
+def test_hung_task_times_out_without_waiting_for_it(release):
+    started = time.monotonic()
+
+    results, report = scheduler(deadline=0.2).run({'hung': release.wait, 'ok': lambda: 1})
+
+    assert results == {'ok': 1}
+    assert report.entries['hung']['status'] == 'timeout'
+    assert time.monotonic() - started < 1
+
+
+def test_run_budget_gives_up_on_tasks_queued_behind_hung_workers(release):
+    """워커가 모두 멈춰 대기열 작업이 시작조차 못 해도 전체 예산에서 끝남"""
+    tasks = {'hung': release.wait, 'queued': lambda: 1}
+
+    results, report = scheduler(max_workers=1, deadline=60, budget=0.3).run(tasks)
+
+    assert results == {}
+    assert report.tickers_with('timeout') == ['hung', 'queued']
+    assert report.entries['queued']['attempts'] == 0
+    assert '시작하지 않음' in report.entries['queued']['error']
+    assert report.elapsed < 1
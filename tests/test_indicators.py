@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicators import compute_indicators
+from tools.synthetic import make_ohlcv
+
+NOW = datetime(2024, 12, 31)
+
+
+def baseline_rsi(series, period=14):
+    """기준 공식: 종가 변화량 period 개의 단순 평균 (첫 봉은 변화량이 없으므로 NaN 그대로)"""
+    delta = series.diff()
+    avg_gain = delta.clip(lower=0).rolling(period, min_periods=period).mean()
+    avg_loss = (-delta).clip(lower=0).rolling(period, min_periods=period).mean()
+    return (100 - 100 / (1 + avg_gain / avg_loss)).iloc[-1]
+
+
+def close_panel(bars):
+    """티커마다 최근 bars[티커] 개 봉만 있는 종가 패널 (짧은 이력 티커는 앞쪽이 NaN)"""
+    close = make_ohlcv('AAPL', '2024-01-01', NOW)['Close']
+    return pd.DataFrame({f'T{n}': close.where(np.arange(len(close)) >= len(close) - n) for n in bars})
+
+
+@pytest.mark.parametrize('bars', [13, 14, 15, 16, 250])
+def test_rsi_matches_baseline_at_boundary_bar_counts(bars):
+    close = close_panel([bars])
+    expected = baseline_rsi(close.iloc[:, 0].dropna())
+
+    rsi = compute_indicators(close, now=NOW)['rsi_14'].iloc[0]
+
+    if bars <= 14:
+        assert np.isnan(rsi) and np.isnan(expected)
+    else:
+        assert rsi == pytest.approx(expected)
+
+
+def test_short_history_does_not_shift_other_tickers():
+    """이력이 짧은 티커가 섞여도 티커마다 자기 최근 봉으로 계산"""
+    close = close_panel([14, 15, 250])
+
+    result = compute_indicators(close, now=NOW)
+
+    assert np.isnan(result.loc['T14', 'rsi_14'])
+    for ticker in ['T15', 'T250']:
+        assert result.loc[ticker, 'rsi_14'] == pytest.approx(baseline_rsi(close[ticker].dropna()))
+    assert result.loc['T15', 'price'] == close['T15'].iloc[-1]
+
+
+def test_indicators_match_per_ticker_pandas_with_mixed_calendars():
+    """미국/KRX 휴장일이 섞인 패널에서도 티커별로 따로 계산한 값과 같음"""
+    close = pd.concat({t: make_ohlcv(t, '2022-01-01', NOW)['Close'] for t in ['AAPL', '005930.KS']}, axis=1)
+
+    result = compute_indicators(close, now=NOW)
+
+    for ticker in close.columns:
+        series = close[ticker].dropna()
+        recent = series[series.index >= pd.Timestamp('2023-12-31')]
+        row = result.loc[ticker]
+        assert row['price'] == recent.iloc[-1]
+        assert row['day_change'] == pytest.approx((recent.iloc[-1] / recent.iloc[-2] - 1) * 100)
+        assert row['avg_20'] == pytest.approx(recent.tail(20).mean())
+        assert row['avg_60'] == pytest.approx(recent.tail(60).mean())
+        assert row['mdd'] == pytest.approx((recent.iloc[-1] / recent.max() - 1) * 100)
+        assert row['rsi_14'] == pytest.approx(baseline_rsi(recent))
@@ -0,0 +1,41 @@
+import pytest
+
+import notifier
+import outbox
+from tools.bench_notify import synthetic_images
+from tools.telegram_stub import TelegramStub
+
+
+@pytest.fixture
+def telegram(tmp_path, monkeypatch):
+    """텔레그램만 켜고 로컬 스텁 서버 + 임시 대기열로 보내는 notifier"""
+    monkeypatch.setenv('TELEGRAM_BOT_TOKEN', 'TEST:TOKEN')
+    monkeypatch.setenv('TELEGRAM_CHAT_ID', 'A,B')
+    monkeypatch.setattr(notifier, 'ENABLE_TELEGRAM', True)
+    monkeypatch.setattr(notifier, 'ENABLE_EMAIL', False)
+    monkeypatch.setattr(notifier, 'USE_OUTBOX', True)
+    monkeypatch.setattr(notifier, 'SEND_RETRIES', 0)
+    monkeypatch.setattr(outbox, 'OUTBOX_FILE', str(tmp_path / 'outbox.sqlite'))
+    with TelegramStub(fail_after={'A': 1}) as stub:
+        monkeypatch.setattr(notifier, 'TELEGRAM_API_URL', stub.url)
+        yield stub, synthetic_images(str(tmp_path), notifier.MEDIA_GROUP_SIZE + 2, size=80)
+
+
+def test_partial_album_failure_resumes_from_failed_album(telegram):
+    """첫 채팅방이 두 번째 앨범에서 실패해도 첫 앨범 file_id 는 유지되고, flush 는 실패한 앨범부터 이어 보냄"""
+    stub, paths = telegram
+
+    assert notifier.notify(paths, 'subject', 'body') == {'telegram': False}
+    first = [(c['chat_id'], c['photos'], c['uploads'], c['status']) for c in stub.calls]
+    # A: 앨범1 업로드 → 앨범2 거절 / B: 앨범1은 file_id 재사용, 앨범2만 업로드
+    assert first == [('A', 10, 10, 200), ('A', 2, 2, 403), ('B', 10, 0, 200), ('B', 2, 2, 200)]
+
+    del stub.fail_after['A']
+    calls = len(stub.calls)
+    assert notifier.flush() == {'telegram': True}
+    resumed = [(c['chat_id'], c['photos'], c['uploads'], c['status']) for c in stub.calls[calls:]]
+    assert resumed == [('A', 2, 0, 200)]
+
+    box = outbox.Outbox()
+    assert box.summary() == {'sent': 2}
+    box.close()
@@ -0,0 +1,91 @@
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from data_source import FixtureSource
+from ohlcv_store import OHLCVStore
+from tools.synthetic import make_ohlcv
+
+TICKERS = ['AAPL', 'MSFT']
+FIRST_RUN = datetime(2024, 6, 28, 18)
+
+
+class RecordingSource(FixtureSource):
+    """fixture 소스 + download 인자 기록"""
+
+    def __init__(self, fixture_dir):
+        super().__init__(fixture_dir)
+        self.requests = []
+
+    def download(self, tickers, period=None, start=None, end=None):
+        self.requests.append((tuple(tickers), period, start))
+        return super().download(tickers, period=period, start=start, end=end)
+
+
+def write_fixture(fixture_dir, ticker, end, scale=1.0):
+    """같은 티커는 같은 난수열이라 end 를 늘리면 앞 구간은 그대로이고 뒤에 봉만 붙음"""
+    df = make_ohlcv(ticker, '2023-01-01', end)
+    df[['Open', 'High', 'Low', 'Close']] *= scale
+    df.to_csv(os.path.join(fixture_dir, f"{ticker}.csv"))
+    return df
+
+
+def stored_close(store_dir, ticker):
+    return pd.read_parquet(os.path.join(store_dir, f"{ticker}.parquet"))['Close']
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    fixture_dir, store_dir = tmp_path / 'fx', tmp_path / 'store'
+    fixture_dir.mkdir()
+    for ticker in TICKERS:
+        write_fixture(fixture_dir, ticker, '2024-06-28')
+    OHLCVStore(str(store_dir), RecordingSource(str(fixture_dir))).refresh(TICKERS, now=FIRST_RUN)
+    return str(fixture_dir), str(store_dir)
+
+
+def test_first_refresh_downloads_full_history(dirs):
+    fixture_dir, store_dir = dirs
+    for ticker in TICKERS:
+        expected = pd.read_csv(os.path.join(fixture_dir, f"{ticker}.csv"), index_col=0, parse_dates=True)['Close']
+        pd.testing.assert_series_equal(stored_close(store_dir, ticker), expected, check_names=False, check_freq=False)
+
+
+def test_refresh_within_interval_does_not_download(dirs):
+    fixture_dir, store_dir = dirs
+    source = RecordingSource(fixture_dir)
+
+    assert OHLCVStore(store_dir, source).refresh(TICKERS, now=FIRST_RUN + timedelta(minutes=5)) == []
+    assert source.requests == []
+
+
+def test_later_refresh_downloads_only_the_delta(dirs):
+    fixture_dir, store_dir = dirs
+    expected = {ticker: write_fixture(fixture_dir, ticker, '2024-07-12') for ticker in TICKERS}
+    source = RecordingSource(fixture_dir)
+
+    updated = OHLCVStore(store_dir, source).refresh(TICKERS, now=datetime(2024, 7, 12, 18))
+
+    assert sorted(updated) == TICKERS
+    # 마지막 저장일(6/28) - OVERLAP_DAYS 부터 한 번에 묶어 증분 조회, 전체 재다운로드 없음
+    assert source.requests == [(tuple(TICKERS), None, '2024-06-21')]
+    for ticker in TICKERS:
+        pd.testing.assert_series_equal(stored_close(store_dir, ticker), expected[ticker]['Close'],
+                                       check_names=False, check_freq=False, check_index_type=False)
+
+
+def test_adjusted_price_change_triggers_full_reload(dirs):
+    """분할로 과거 수정주가가 모두 바뀌면 겹치는 구간 비교로 감지해 그 티커만 전체 재다운로드"""
+    fixture_dir, store_dir = dirs
+    split = write_fixture(fixture_dir, 'AAPL', '2024-07-12', scale=0.5)
+    write_fixture(fixture_dir, 'MSFT', '2024-07-12')
+    source = RecordingSource(fixture_dir)
+
+    updated = OHLCVStore(store_dir, source).refresh(TICKERS, now=datetime(2024, 7, 12, 18))
+
+    assert sorted(updated) == TICKERS
+    assert source.requests[-1] == (('AAPL',), 'max', None)
+    pd.testing.assert_series_equal(stored_close(store_dir, 'AAPL'), split['Close'],
+                                   check_names=False, check_freq=False, check_index_type=False)
@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+from outbox import MAX_ATTEMPTS, Outbox
+
+PNG = b'\x89PNG fake'
+IMAGES = {'telegram': [('a.png', PNG, 'image/png')], 'email': [('a.png', PNG, 'image/png')]}
+RECIPIENTS = {'telegram': ['A', 'B'], 'email': ['me@example.com']}
+
+
+@pytest.fixture
+def box(tmp_path):
+    box = Outbox(str(tmp_path / 'outbox.sqlite'))
+    yield box
+    box.close()
+
+
+def age(box, report_id, hours):
+    box._write([('UPDATE reports SET created_at = ? WHERE report_id = ?', (time.time() - hours * 3600, report_id))])
+
+
+def test_enqueue_creates_pending_deliveries_and_shares_blobs(box):
+    rid = box.enqueue('subject', 'body', IMAGES, RECIPIENTS)
+
+    assert box.pending() == [(rid, 'email', ['me@example.com']), (rid, 'telegram', ['A', 'B'])]
+    assert box.images(rid, 'telegram') == [('a.png', PNG, 'image/png')]
+    assert box._read('SELECT COUNT(*) FROM blobs') == [(1,)]
+
+
+def test_success_is_sent_and_same_content_is_not_requeued(box):
+    rid = box.enqueue('subject', 'body', IMAGES, RECIPIENTS)
+    box.mark(rid, 'telegram', {'A': None, 'B': 'timeout'})
+
+    assert box.enqueue('subject', 'body', IMAGES, RECIPIENTS) == rid
+    assert box.pending(rid) == [(rid, 'email', ['me@example.com']), (rid, 'telegram', ['B'])]
+    assert box.summary() == {'pending': 2, 'sent': 1}
+
+
+def test_failures_stay_pending_until_max_attempts(box):
+    rid = box.enqueue('subject', 'body', IMAGES, {'telegram': ['A']})
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        assert box.summary() == {'pending': 1}
+        box.mark(rid, 'telegram', {'A': f'403 #{attempt}'})
+
+    assert box.summary() == {'failed': 1}
+    assert box.pending() == []
+    assert box._read('SELECT attempts, last_error FROM deliveries') == [(MAX_ATTEMPTS, f'403 #{MAX_ATTEMPTS}')]
+
+
+def test_old_pending_deliveries_expire_but_sent_stay_sent(box):
+    rid = box.enqueue('subject', 'body', IMAGES, RECIPIENTS)
+    box.mark(rid, 'email', {'me@example.com': None})
+    fresh = box.enqueue('new subject', 'body', IMAGES, {'telegram': ['A']})
+    age(box, rid, 25)
+
+    assert box.expire(max_age_hours=24) == 2
+    assert box.pending() == [(fresh, 'telegram', ['A'])]
+    assert box.summary() == {'expired': 2, 'pending': 1, 'sent': 1}
+
+
+def test_prune_removes_old_reports_and_unreferenced_blobs(box):
+    old = box.enqueue('old', 'body', {'telegram': [('old.png', b'old', 'image/png')]}, {'telegram': ['A']})
+    kept = box.enqueue('new', 'body', IMAGES, {'telegram': ['A']})
+    box.set_meta(kept, 'telegram_file_ids', ['f1'])
+    age(box, old, 24 * 8)
+
+    assert box.prune(keep_days=7) == 1
+    assert box.pending() == [(kept, 'telegram', ['A'])]
+    assert box.report(kept) == ('new', 'body', {'telegram_file_ids': ['f1']})
+    assert box._read('SELECT COUNT(*) FROM blobs') == [(1,)]
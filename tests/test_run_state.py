@@ -0,0 +1,104 @@
+import os
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import run_state
+from data_source import FixtureSource
+from ohlcv_store import OHLCVStore
+from run_state import mark_completed, preflight, stored_bar_dates
+from tools.synthetic import make_ohlcv
+from trading_calendar import last_session, market_of
+
+KST = ZoneInfo('Asia/Seoul')
+TICKERS = ['AAPL', 'MSFT', '005930.KS']
+
+
+@pytest.mark.parametrize('market, now, expected', [
+    # 마감 + 반영 여유(30분) 전이면 전 거래일
+    ('KRX', datetime(2026, 3, 9, 15, 50, tzinfo=KST), date(2026, 3, 6)),
+    ('KRX', datetime(2026, 3, 9, 16, 0, tzinfo=KST), date(2026, 3, 9)),
+    # KST 아침 = 뉴욕 전날 장 마감 후
+    ('NYSE', datetime(2026, 3, 10, 7, 0, tzinfo=KST), date(2026, 3, 9)),
+    ('NYSE', datetime(2026, 3, 10, 5, 20, tzinfo=KST), date(2026, 3, 6)),
+    # 주말/휴장일은 건너뜀 (NYSE 2/16 Presidents Day, KRX 2/16~18 설 연휴)
+    ('NYSE', datetime(2026, 2, 17, 9, 0, tzinfo=KST), date(2026, 2, 13)),
+    ('KRX', datetime(2026, 2, 18, 20, 0, tzinfo=KST), date(2026, 2, 13)),
+])
+def test_last_session_waits_for_settle_and_skips_holidays(market, now, expected):
+    assert last_session(market, now) == expected
+
+
+def test_market_of():
+    assert [market_of(t) for t in ['005930.KS', '035720.KQ', '^KS11', 'AAPL', '^GSPC', 'NQ=F']] == \
+        ['KRX', 'KRX', 'KRX', 'NYSE', 'NYSE', 'NYSE']
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """FixtureSource 로 채우는 임시 저장소 → update(end, late): fixture 를 end(late 티커는 late[티커])까지 늘리고 갱신"""
+    fixture_dir, store_dir = tmp_path / 'fx', tmp_path / 'store'
+    fixture_dir.mkdir()
+    monkeypatch.setattr(run_state, 'STORE_DIR', str(store_dir))
+    clock = [datetime(2026, 3, 10)]
+
+    def update(end, late=None):
+        for ticker in TICKERS:
+            # 두 거래소 모두 평일 달력 그대로 (휴장일로 빠지는 날 없이 end 까지 봉이 있도록)
+            last = (late or {}).get(ticker, end)
+            make_ohlcv(ticker.split('.')[0], '2026-01-01', last).to_csv(os.path.join(fixture_dir, f"{ticker}.csv"))
+        clock[0] += timedelta(hours=1)   # 매번 최소 갱신 간격이 지난 것으로
+        OHLCVStore(str(store_dir), FixtureSource(str(fixture_dir))).refresh(TICKERS, now=clock[0])
+        return stored_bar_dates(TICKERS)
+
+    return update
+
+
+def test_preflight_skips_until_a_new_session_lands(store):
+    state = {}
+    bars = store('2026-03-06')
+    saturday = datetime(2026, 3, 7, 12, 0, tzinfo=KST)
+
+    go, info = preflight(TICKERS, state, now=saturday)
+    assert go and info['reason'] == '이전 실행 기록 없음'
+    mark_completed(state, info, bars)
+    assert state['sessions'] == {'NYSE': '2026-03-06', 'KRX': '2026-03-06'}
+
+    go, info = preflight(TICKERS, state, now=datetime(2026, 3, 8, 12, 0, tzinfo=KST))
+    assert not go and '새 거래일 없음' in info['reason']
+
+    go, info = preflight(TICKERS, state, now=datetime(2026, 3, 9, 16, 0, tzinfo=KST))
+    assert go and info['reason'] == '새 거래일: KRX 2026-03-09'
+
+
+def test_session_without_stored_bar_is_retried_next_run(store):
+    """거래일은 끝났지만 데이터 소스에 아직 일봉이 없던 실행은 그 거래일을 기록하지 않음"""
+    state = {}
+    store('2026-03-06')
+    monday = datetime(2026, 3, 9, 16, 0, tzinfo=KST)
+
+    go, info = preflight(TICKERS, state, now=monday)
+    mark_completed(state, info, stored_bar_dates(TICKERS))
+    assert state['sessions'] == {'NYSE': '2026-03-06', 'KRX': None}
+
+    go, info = preflight(TICKERS, state, now=monday)
+    assert go and info['reason'] == '새 거래일: KRX 2026-03-09'
+
+    mark_completed(state, info, store('2026-03-09'))
+    assert state['sessions']['KRX'] == '2026-03-09'
+    assert not preflight(TICKERS, state, now=monday)[0]
+
+
+def test_late_ticker_catching_up_triggers_run_without_new_session(store):
+    """티커 하나라도 받았으면 그 거래일은 끝난 것으로 기록하고, 늦은 티커가 따라오면 저장소 변화로 다시 실행"""
+    state = {}
+    saturday = datetime(2026, 3, 7, 12, 0, tzinfo=KST)
+    go, info = preflight(TICKERS, state, now=saturday)
+    mark_completed(state, info, store('2026-03-06', late={'AAPL': '2026-03-05'}))
+    assert state['sessions'] == {'NYSE': '2026-03-06', 'KRX': '2026-03-06'}
+
+    store('2026-03-06')
+    go, info = preflight(TICKERS, state, now=saturday)
+
+    assert go and info['reason'] == '저장소 일봉이 마지막 리포트 이후 바뀜'
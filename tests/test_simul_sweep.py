@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from simul_limit_strategy import StrategyParams, TOTAL_SEED, run_rolling, run_sweep
+from tools.synthetic import make_ohlcv
+
+
+def falling_ohlcv(days=120):
+    """매일 1%씩 내려 익절 없이 분할 일수를 모두 채우는 일봉"""
+    index = pd.bdate_range('2024-01-01', periods=days)
+    close = 100 * 0.99 ** np.arange(days)
+    return pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close, 'Volume': 1}, index=index)
+
+
+def test_sweep_without_trading_days_in_range():
+    df = make_ohlcv('TQQQ', '2020-01-01', '2020-12-31')
+
+    table = run_sweep(df, '2023-01-01', '2023-12-31', TOTAL_SEED, {'splits': [30, 40]}, workers=1)
+
+    assert table.empty
+
+
+def test_rolling_status_uses_split_days():
+    df = falling_ohlcv()
+
+    for splits in (30, 40):
+        results = run_rolling(df, '2024-01-01', '2024-01-31', TOTAL_SEED, StrategyParams(splits=splits))
+        assert set(results['Status']) == {f'Ended ({splits}d)'}
+        assert (results['Days'] == splits).all()
@@ -0,0 +1,21 @@
+import os
+
+import pandas as pd
+
+from simul_limit_strategy import LEADERBOARD_COLUMNS, run_universe
+from tools.synthetic import make_ohlcv
+
+
+def test_universe_without_data_in_range(tmp_path):
+    """모든 종목이 요청 기간에 일봉이 없으면 빈 값 행으로 리더보드를 만들고 죽지 않음"""
+    frames = {ticker: make_ohlcv(ticker, '2020-01-01', '2020-12-31') for ticker in ['TQQQ', 'SOXL', '122630.KS']}
+
+    board = run_universe(list(frames), '2023-01-01', '2023-12-31', workers=1, output_dir=str(tmp_path), frames=frames)
+
+    assert list(board.columns) == ['Rank'] + LEADERBOARD_COLUMNS
+    assert sorted(board['Ticker']) == ['122630.KS', 'SOXL', 'TQQQ']
+    assert (board['TradingDays'] == 0).all()
+    assert board['Return(%)'].isna().all()
+    assert os.listdir(tmp_path) == ['leaderboard.csv']
+    saved = pd.read_csv(tmp_path / 'leaderboard.csv', comment='#')
+    assert 'Sec' not in saved.columns and len(saved) == 3
@@ -0,0 +1,59 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import data_source
+import ticker_meta
+from tools.synthetic import make_meta, write_fixtures
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    """임시 캐시 파일 + info 조회를 기록하는 FixtureSource 하나를 공유"""
+    fixture_source = data_source.FixtureSource(write_fixtures(str(tmp_path / 'fx'), ['AAPL'], '2024-01-01', '2024-01-31'))
+    fixture_source.lookups = []
+    info = fixture_source.info
+    monkeypatch.setattr(fixture_source, 'info', lambda ticker: fixture_source.lookups.append(ticker) or info(ticker))
+    monkeypatch.setattr(data_source, 'get_data_source', lambda: fixture_source)
+    monkeypatch.setattr(ticker_meta, 'META_CACHE_FILE', str(tmp_path / 'store' / 'ticker_meta.json'))
+    monkeypatch.setattr(ticker_meta, '_cache', None)
+    return fixture_source
+
+
+def age_entry(ticker, days):
+    with open(ticker_meta.META_CACHE_FILE, 'r', encoding='utf-8') as f:
+        cache = json.load(f)
+    cache[ticker]['fetched_at'] = (datetime.now() - timedelta(days=days)).isoformat(timespec='seconds')
+    with open(ticker_meta.META_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    ticker_meta._cache = None
+
+
+def test_fresh_cache_is_served_without_lookup(source):
+    first = ticker_meta.get_ticker_meta('AAPL')
+    ticker_meta._cache = None   # 다음 실행처럼 디스크 캐시에서 다시 읽음
+
+    assert ticker_meta.get_ticker_meta('AAPL') == first
+    assert ticker_meta.display_name('AAPL') == make_meta('AAPL')['shortName']
+    assert source.lookups == ['AAPL']
+
+
+def test_expired_entry_is_fetched_again(source):
+    ticker_meta.get_ticker_meta('AAPL')
+    age_entry('AAPL', ticker_meta.META_TTL_DAYS + 1)
+
+    assert not ticker_meta.is_cached('AAPL')
+    ticker_meta.get_ticker_meta('AAPL')
+    assert source.lookups == ['AAPL', 'AAPL']
+    assert ticker_meta.is_cached('AAPL')
+
+
+def test_failed_lookup_falls_back_to_expired_entry(source):
+    stale = ticker_meta.get_ticker_meta('AAPL')
+    age_entry('AAPL', ticker_meta.META_TTL_DAYS + 1)
+    source._meta = {}   # 조회 실패 (DataSourceError)
+
+    assert ticker_meta.get_ticker_meta('AAPL')['shortName'] == stale['shortName']
+    assert ticker_meta.get_ticker_meta('MSFT') == {}
+    assert ticker_meta.display_name('MSFT') == 'MSFT'
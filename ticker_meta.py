@@ -0,0 +1,92 @@
+import os
+import json
+import threading
+from datetime import datetime, timedelta
+
+from ohlcv_store import STORE_DIR
+
+# ==========================================
+# [설정] 티커 메타데이터(yfinance info) 캐시
+# ==========================================
+META_CACHE_FILE = os.path.join(STORE_DIR, 'ticker_meta.json')
+META_TTL_DAYS = 30   # 종목명 등은 거의 바뀌지 않으므로 길게 유지
+META_FIELDS = ['shortName', 'longName', 'currency', 'exchange', 'sharesOutstanding', 'marketCap']
+# ==========================================
+
+_lock = threading.Lock()
+_cache = None
+
+
+def _load_cache():
+    global _cache
+    if _cache is None:
+        try:
+            with open(META_CACHE_FILE, 'r', encoding='utf-8') as f:
+                _cache = json.load(f)
+        except (OSError, ValueError):
+            _cache = {}
+    return _cache
+
+
+def _save_cache():
+    os.makedirs(os.path.dirname(META_CACHE_FILE) or '.', exist_ok=True)
+    tmp = META_CACHE_FILE + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(_cache, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, META_CACHE_FILE)
+
+
+def _is_fresh(entry, now):
+    # 필드가 추가되기 전에 저장된 항목은 다시 조회
+    if any(k not in entry for k in META_FIELDS):
+        return False
+    fetched_at = datetime.fromisoformat(entry['fetched_at'])
+    return now - fetched_at < timedelta(days=META_TTL_DAYS)
+
+
+def is_cached(ticker):
+    """TTL 안의 캐시가 있어 조회 없이 바로 쓸 수 있는지"""
+    with _lock:
+        entry = _load_cache().get(ticker)
+    return bool(entry) and _is_fresh(entry, datetime.now())
+
+
+def cached_meta(ticker):
+    """조회 없이 캐시 항목만 (TTL이 지났어도 그대로, 없으면 {})"""
+    with _lock:
+        return _load_cache().get(ticker) or {}
+
+
+def fetch_ticker_meta(ticker, source=None):
+    """데이터 소스(기본 yf.Ticker(ticker).info)를 조회해 캐시에 저장 (실패는 예외 그대로 → 스케줄러가 재시도/백오프)"""
+    from data_source import get_data_source
+    info = (source or get_data_source()).info(ticker)
+    entry = {k: info.get(k) for k in META_FIELDS}
+    entry['fetched_at'] = datetime.now().isoformat(timespec='seconds')
+    with _lock:
+        _load_cache()[ticker] = entry
+        _save_cache()
+    return entry
+
+
+def get_ticker_meta(ticker):
+    """캐시에 있으면 그대로, TTL이 지났거나 없을 때만 yf.Ticker(ticker).info 조회"""
+    now = datetime.now()
+    with _lock:
+        entry = _load_cache().get(ticker)
+        if entry and _is_fresh(entry, now):
+            return entry
+
+    try:
+        return fetch_ticker_meta(ticker)
+    except Exception as e:
+        print(f"{ticker} 메타데이터 조회 실패: {e}")
+        # 만료된 캐시라도 있으면 그대로 사용
+        return entry or {}
+
+
+def display_name(ticker, name=None):
+    """표시명이 이미 있으면 그대로 쓰고, 비어 있을 때만 캐시된 shortName 으로 보충"""
+    if name:
+        return name
+    return get_ticker_meta(ticker).get('shortName') or ticker
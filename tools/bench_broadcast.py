@@ -0,0 +1,94 @@
+"""
+방송(여러 수신처) 전송 비교 (로컬 텔레그램/SMTP 스텁 서버, 오프라인)
+
+    python -m tools.bench_broadcast [--chats 50] [--emails 20] [--images 4] [--latency 0.05]
+
+  텔레그램: 채팅방마다 다시 업로드 vs 첫 채팅방에만 업로드 + file_id 재사용(요청 한도 스케줄러)
+  이메일:   수신자마다 SMTP 연결 vs 연결 하나로 전원
+요청/연결 수, 업로드 전송량, 소요 시간, 처리량, 1초 구간 최대 메시지 수(텔레그램 한도 확인)를 출력
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import notifier
+from tools.bench_notify import synthetic_images
+from tools.smtp_stub import SMTPStub
+from tools.telegram_stub import TelegramStub
+
+
+def peak_per_second(calls):
+    """요청 시각 기준 1초 구간 안의 최대 메시지(사진) 수"""
+    times = sorted((c['at'], c['photos']) for c in calls if c['status'] == 200)
+    peak, start, window = 0, 0, 0
+    for at, photos in times:
+        window += photos
+        while times[start][0] < at - 1.0:
+            window -= times[start][1]
+            start += 1
+        peak = max(peak, window)
+    return peak
+
+
+def run_telegram(mode, chat_ids, paths, latency):
+    with TelegramStub(latency=latency) as stub, contextlib.redirect_stdout(io.StringIO()):
+        notifier.TELEGRAM_API_URL = stub.url
+        notifier._session = None   # 방식마다 새 연결부터 시작
+        t0 = time.perf_counter()
+        if mode == 'reupload':
+            ok = all([notifier.send_image_via_telegram(paths, 'caption', [c]) for c in chat_ids])
+        else:
+            ok = notifier.send_image_via_telegram(paths, 'caption', chat_ids)
+        elapsed = time.perf_counter() - t0
+    return {'ok': ok, 'sec': elapsed, 'requests': len(stub.calls), 'conns': stub.connections,
+            'kb': sum(c['bytes'] for c in stub.calls) / 1024, 'peak': peak_per_second(stub.calls)}
+
+
+def run_email(mode, recipients, paths):
+    with SMTPStub() as stub, contextlib.redirect_stdout(io.StringIO()):
+        notifier.SMTP_HOST, notifier.SMTP_PORT = '127.0.0.1', stub.port
+        t0 = time.perf_counter()
+        if mode == 'per_recipient':
+            ok = all([notifier.send_image_via_gmail(paths, 'subject', 'body', [r]) for r in recipients])
+        else:
+            ok = notifier.send_image_via_gmail(paths, 'subject', 'body', recipients)
+        elapsed = time.perf_counter() - t0
+    return {'ok': ok and len(stub.messages) == len(recipients), 'sec': elapsed, 'requests': len(stub.messages),
+            'conns': stub.connections, 'kb': sum(m['bytes'] for m in stub.messages) / 1024, 'peak': None}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--chats', type=int, default=50)
+    parser.add_argument('--emails', type=int, default=20)
+    parser.add_argument('--images', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.05, help='텔레그램 스텁 요청당 지연(초)')
+    args = parser.parse_args()
+
+    os.environ.update({'TELEGRAM_BOT_TOKEN': 'TEST:TOKEN', 'SENDER_EMAIL': 'bot@example.com',
+                       'APP_PASSWORD': 'secret'})
+    chat_ids = [str(1000 + i) for i in range(args.chats)]
+    recipients = [f'user{i}@example.com' for i in range(args.emails)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = synthetic_images(tmp, args.images)
+        rows = [
+            ('텔레그램 재업로드', len(chat_ids), run_telegram('reupload', chat_ids, paths, args.latency)),
+            ('텔레그램 file_id', len(chat_ids), run_telegram('broadcast', chat_ids, paths, args.latency)),
+            ('이메일 수신자별 연결', len(recipients), run_email('per_recipient', recipients, paths)),
+            ('이메일 연결 1개', len(recipients), run_email('broadcast', recipients, paths)),
+        ]
+
+    print(f"{'방식':<16}{'성공':>5}{'시간(s)':>9}{'처리량(곳/s)':>13}{'요청':>6}{'연결':>6}{'전송(KB)':>10}{'초당 최대 메시지':>16}")
+    for name, count, r in rows:
+        peak = '-' if r['peak'] is None else str(r['peak'])
+        print(f"{name:<16}{str(r['ok']):>5}{r['sec']:>9.2f}{count / r['sec']:>13.1f}{r['requests']:>6}"
+              f"{r['conns']:>6}{r['kb']:>10.0f}{peak:>16}")
+    print(f"텔레그램 한도: 초당 {notifier.TELEGRAM_MSGS_PER_SEC} 메시지 (앨범 사진 1장 = 1 메시지)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+"""
+Fear & Greed 조회 방식 비교 (로컬 CNN 모형 서버, 오프라인)
+
+    python -m tools.bench_fear_greed [--latency 0.2] [--page-kb 300] [--history 250]
+
+모형 서버는 CNN 페이지(쿠키 발급)와 API(쿠키 필요, ETag/304 지원)를 흉내 냄.
+실행 한 번 = 새 클라이언트(상태 파일에서 쿠키/응답 복원)로 보고 아래 순서로 요청 수/전송량/시간을 비교
+  기존 방식 (매번 새 세션 + 페이지 방문) / 첫 실행 / TTL 안 재실행 / TTL 지난 뒤(304) /
+  데이터 갱신 후(200) / 서버가 쿠키를 거절한 뒤(403 → 세션 재발급)
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fear_greed import FearGreedClient, BROWSER_HEADERS
+from monitor_sentiment import _parse_fg_response
+
+
+class StandIn:
+    """모형 서버 상태 (응답 본문, 유효한 쿠키, 요청 통계)"""
+
+    def __init__(self, latency, page_kb, history):
+        self.latency = latency
+        self.page = b'<html>' + b'x' * (page_kb * 1024) + b'</html>'
+        self.cookie = 'fg_session=s1'
+        self.hits = []
+        self.sent = 0
+        self.set_score(62.3, history)
+
+    def set_score(self, score, history=None):
+        history = history or len(self.data['fear_and_greed_historical']['data'])
+        now_ms = int(time.time() * 1000)
+        self.data = {
+            'fear_and_greed': {'score': score, 'rating': 'greed', 'timestamp': now_ms},
+            'fear_and_greed_historical': {'data': [
+                {'x': now_ms - (history - i) * 86400000, 'y': 40 + i % 30, 'rating': 'fear'}
+                for i in range(history)]},
+        }
+        self.body = json.dumps(self.data).encode()
+        self.etag = f'"{hash(self.body) & 0xffffffff:x}"'
+
+    def take(self):
+        hits, sent = self.hits, self.sent
+        self.hits, self.sent = [], 0
+        return hits, sent
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, status, body=b'', headers=()):
+            self.send_response(status)
+            for k, v in headers:
+                self.send_header(k, v)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            state.sent += len(body)
+
+        def do_GET(self):
+            time.sleep(state.latency)
+            if self.path == '/page':
+                state.hits.append('page')
+                return self._reply(200, state.page, [('Content-Type', 'text/html'),
+                                                     ('Set-Cookie', f'{state.cookie}; Path=/')])
+            if self.path == '/api':
+                if state.cookie not in (self.headers.get('Cookie') or ''):
+                    state.hits.append('api:403')
+                    return self._reply(403)
+                if self.headers.get('If-None-Match') == state.etag:
+                    state.hits.append('api:304')
+                    return self._reply(304, headers=[('ETag', state.etag)])
+                state.hits.append('api:200')
+                return self._reply(200, state.body, [('Content-Type', 'application/json'), ('ETag', state.etag)])
+            self._reply(404)
+
+    return Handler
+
+
+def legacy_fetch(page_url, api_url):
+    """기존 방식: 시도마다 새 세션 → 페이지 방문 → API 호출"""
+    import requests
+    session = requests.Session()
+    session.get(page_url, headers=BROWSER_HEADERS, timeout=10)
+    headers = dict(BROWSER_HEADERS, Accept='application/json, text/plain, */*', Referer=page_url)
+    r = session.get(api_url, headers=headers, timeout=10)
+    return r.json()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.2, help='요청마다 서버 지연(초)')
+    parser.add_argument('--page-kb', type=int, default=300, help='CNN 페이지 크기(KB)')
+    parser.add_argument('--history', type=int, default=250, help='API 응답의 과거 데이터 개수')
+    args = parser.parse_args()
+
+    state = StandIn(args.latency, args.page_kb, args.history)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}'
+    page_url, api_url = f'{base}/page', f'{base}/api'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = os.path.join(tmp, 'fear_greed.json')
+
+        def run(ttl_minutes=60):
+            client = FearGreedClient(api_url, page_url, state_path, ttl_minutes)
+            return _parse_fg_response(client.fetch())
+
+        scenarios = [
+            ('기존 방식', lambda: _parse_fg_response(legacy_fetch(page_url, api_url))),
+            ('첫 실행', run),
+            ('TTL 안 재실행', run),
+            ('TTL 지난 뒤', lambda: run(ttl_minutes=0)),
+            ('데이터 갱신 후', lambda: (state.set_score(48.0), run(ttl_minutes=0))[1]),
+            ('쿠키 거절 후', lambda: (setattr(state, 'cookie', 'fg_session=s2'), run(ttl_minutes=0))[1]),
+        ]
+        print(f"{'실행':<14}{'시간(s)':>8}{'전송(KB)':>10}  요청")
+        for name, func in scenarios:
+            t0 = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - t0
+            hits, sent = state.take()
+            assert result['score'] == state.data['fear_and_greed']['score'], (name, result)
+            print(f"{name:<14}{elapsed:>8.2f}{sent / 1024:>10.1f}  {', '.join(hits) or '-'}")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+티커별 개별 조회 vs 일괄 다운로드(fetch_panel) 비교 벤치마크 (오프라인)
+
+    python -m tools.bench_fetch [--latency 0.2]
+
+FixtureSource 가 요청 1회마다 latency 초를 기다리므로
+요청 횟수 차이가 그대로 소요 시간 차이로 드러남
+"""
+import argparse
+import tempfile
+import time
+
+from data_source import FixtureSource, fetch_panel, ticker_frame
+from tools.synthetic import write_fixtures
+from monitor_stock import ticker_groups
+from monitor_index import category_map
+
+
+def per_ticker(source, tickers, latency):
+    """기존 방식: 티커마다 info + 1y + max 세 번 요청"""
+    for ticker in tickers:
+        time.sleep(latency)  # stock.info
+        source.request_count += 1
+        ticker_frame(source.download([ticker], period='1y'), ticker)
+        ticker_frame(source.download([ticker], period='max'), ticker)
+
+
+def batched(source, tickers, latency):
+    fetch_panel(tickers, period='1y', source=source)
+    fetch_panel(tickers, period='max', source=source)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency', type=float, default=0.2, help='요청 1회당 왕복 지연(초)')
+    args = parser.parse_args()
+
+    tickers = [t for g in ticker_groups for t in g['tickers']]
+    tickers += [t for _, pairs in category_map for t, _ in pairs]
+    tickers = list(dict.fromkeys(tickers))
+
+    with tempfile.TemporaryDirectory() as fixture_dir:
+        write_fixtures(fixture_dir, tickers)
+        print(f"티커 {len(tickers)}개, 요청당 지연 {args.latency:.2f}s")
+        for label, fn in [('티커별 조회', per_ticker), ('일괄 다운로드', batched)]:
+            source = FixtureSource(fixture_dir, latency=args.latency)
+            t0 = time.perf_counter()
+            fn(source, tickers, args.latency)
+            elapsed = time.perf_counter() - t0
+            print(f"{label:<10} 요청 {source.request_count:>4}회  {elapsed:7.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+시장 맵 캡처 대기 방식 비교 벤치마크 (고정 sleep vs 캔버스 준비 신호)
+
+    python -m tools.bench_map_capture [--paint-delay 1.0] [--legacy-sleep 15 3] [--tabs 4]
+
+Finviz 맵을 흉내 낸 로컬 HTML(지연 후 캔버스를 여러 프레임에 걸쳐 그리고, 중간에 모달을 띄움)을
+두 방식으로 캡처해 소요 시간과 캡처 결과(픽셀 동일 여부)를 비교
+--tabs N: 맵 N개를 맵마다 브라우저를 띄워 캡처 vs 브라우저 하나의 탭 N개에서 동시에 캡처 비교
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+
+from monitor_map import capture_map_screenshot, capture_maps, REMOVE_OVERLAYS_JS
+
+STANDIN_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><style>
+body { margin: 0; background: #161C22; }
+#map-canvas-container { position: relative; width: 1200px; height: 700px; margin: 40px; }
+.modal { position: fixed; inset: 0; z-index: 1000; background: rgba(0, 0, 0, .7); color: #fff; font: 40px sans-serif; }
+</style></head><body>
+<div id="map-canvas-container"><canvas id="map-canvas" width="1200" height="700"></canvas></div>
+<script>
+const PAINT_DELAY = %(paint_delay)d, FRAMES = %(frames)d;
+// 모달: 맵보다 먼저 뜸
+setTimeout(() => {
+    const m = document.createElement('div');
+    m.className = 'modal'; m.textContent = 'Subscribe!';
+    document.body.appendChild(m);
+}, %(modal_delay)d);
+// 데이터 로딩 후 타일을 여러 프레임에 걸쳐 그림 (색은 시드 고정 난수)
+setTimeout(() => {
+    const ctx = document.getElementById('map-canvas').getContext('2d');
+    let seed = 42, frame = 0;
+    const rand = () => (seed = (seed * 16807) %% 2147483647) / 2147483647;
+    const cols = 24, rows = 14, w = 1200 / cols, h = 700 / rows, perFrame = Math.ceil(cols * rows / FRAMES);
+    let i = 0;
+    const step = () => {
+        for (let k = 0; k < perFrame && i < cols * rows; k++, i++) {
+            const v = rand() * 2 - 1;
+            ctx.fillStyle = v < 0 ? `rgb(${Math.round(-v * 220)},40,50)` : `rgb(40,${Math.round(v * 200)},70)`;
+            ctx.fillRect((i %% cols) * w + 1, Math.floor(i / cols) * h + 1, w - 2, h - 2);
+        }
+        if (i < cols * rows) requestAnimationFrame(step);
+    };
+    requestAnimationFrame(step);
+}, PAINT_DELAY);
+</script></body></html>"""
+
+
+def legacy_capture(url, first_sleep, second_sleep):
+    """기존 방식: goto 후 고정 sleep → 오버레이 제거 → 고정 sleep → 캡처"""
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page(viewport={'width': 1280, 'height': 800})
+        try:
+            page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            time.sleep(first_sleep)
+            page.evaluate(REMOVE_OVERLAYS_JS)
+            time.sleep(second_sleep)
+            return page.locator("canvas#map-canvas").first.screenshot()
+        finally:
+            browser.close()
+
+
+def same_pixels(a, b):
+    from PIL import Image, ImageChops
+    if a is None or b is None:
+        return False
+    img_a, img_b = Image.open(io.BytesIO(a)).convert('RGB'), Image.open(io.BytesIO(b)).convert('RGB')
+    return img_a.size == img_b.size and ImageChops.difference(img_a, img_b).getbbox() is None
+
+
+def compare_tabs(url, n):
+    specs = [{'name': f'map{i}', 'url': url} for i in range(n)]
+
+    t0 = time.perf_counter()
+    for spec in specs:
+        capture_maps([spec])
+    separate_sec = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    shots, timings = capture_maps(specs)
+    tabs_sec = time.perf_counter() - t0
+
+    print(f"맵 {n}개 - 맵마다 브라우저 {separate_sec:.2f}s / 브라우저 하나 탭 {n}개 {tabs_sec:.2f}s "
+          f"(기동 {timings['launch']:.2f}s + 탭 작업 {timings['pages']:.2f}s), "
+          f"성공 {sum(1 for png in shots.values() if png)}/{n}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--paint-delay', type=float, default=1.0, help='캔버스를 그리기 시작할 때까지 지연(초)')
+    parser.add_argument('--frames', type=int, default=60, help='맵을 나눠 그리는 프레임 수')
+    parser.add_argument('--legacy-sleep', type=float, nargs=2, default=[15, 3], metavar=('FIRST', 'SECOND'))
+    parser.add_argument('--tabs', type=int, default=0, help='다중 탭 비교에 쓸 맵 개수 (0이면 생략)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'map.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(STANDIN_HTML % {'paint_delay': args.paint_delay * 1000, 'frames': args.frames,
+                                    'modal_delay': args.paint_delay * 500})
+        url = 'file://' + path
+
+        t0 = time.perf_counter()
+        event_png = capture_map_screenshot(url)
+        event_sec = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        legacy_png = legacy_capture(url, *args.legacy_sleep)
+        legacy_sec = time.perf_counter() - t0
+
+        if args.tabs:
+            compare_tabs(url, args.tabs)
+
+    print(f"{'방식':<16}{'소요(s)':>10}")
+    print(f"{'고정 sleep':<16}{legacy_sec:>10.2f}")
+    print(f"{'준비 신호 대기':<16}{event_sec:>10.2f}")
+    print(f"캡처 결과 동일: {'예' if same_pixels(event_png, legacy_png) else '아니오'}"
+          f" ({legacy_sec / event_sec:.1f}배 빠름)")
+
+
+if __name__ == '__main__':
+    main()
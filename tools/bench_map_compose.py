@@ -0,0 +1,126 @@
+"""
+시장 맵 재가공 비교 벤치마크 (임시 파일 + matplotlib vs 메모리 내 Pillow 합성)
+
+    python -m tools.bench_map_compose [--repeat 5] [--width 1200 --height 700]
+
+합성 히트맵 스크린샷(PNG)을 만든 뒤, 방식마다 새 프로세스에서
+소요 시간(중앙값)과 최대 메모리 증가량(ru_maxrss, import 이후 기준)을 측정
+"""
+import argparse
+import io
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from monitor_map import render_market_map_png
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METHODS = ['tempfile_matplotlib', 'memory_pillow']
+
+
+def tempfile_matplotlib(screenshot, title='S&P 500 Market Heatmap'):
+    """기존 방식: 스크린샷을 temp_map.png 로 저장 → mpimg.imread → Figure.imshow → savefig → 임시 파일 삭제"""
+    from datetime import datetime
+    from matplotlib.figure import Figure
+    import matplotlib.image as mpimg
+    from plot_style import setup_fonts, figure_to_png
+    setup_fonts()
+
+    temp_path = os.path.join(tempfile.gettempdir(), 'temp_map.png')
+    with open(temp_path, 'wb') as f:
+        f.write(screenshot)
+
+    fig = Figure(figsize=(10.8, 10.8), dpi=100)
+    ax = fig.subplots()
+    fig.patch.set_facecolor('#161C22')
+    ax.set_facecolor('#161C22')
+    ax.set_xlim(0, 100)
+    ax.set_ylim(0, 100)
+    ax.axis('off')
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M')
+    ax.text(50, 96, title, ha='center', va='center', fontsize=26, fontweight='black', color='#FFFFFF')
+    ax.text(96, 96, f'조회 기준: {now_str}', ha='right', va='center', fontsize=10, fontweight='bold', color='#AAAAAA')
+
+    img = mpimg.imread(temp_path)
+    img_h, img_w = img.shape[:2]
+    target_h = 98 * img_h / img_w
+    y_start = (92 - target_h) / 2 + 2
+    ax.imshow(img, extent=[1, 99, y_start, y_start + target_h], aspect='auto', zorder=2)
+    png = figure_to_png(fig, bbox_inches='tight', pad_inches=0, facecolor=fig.get_facecolor())
+    os.remove(temp_path)
+    return png
+
+
+def synthetic_screenshot(width, height, seed=42):
+    """히트맵처럼 보이는 타일 이미지 PNG 바이트"""
+    import numpy as np
+    from PIL import Image
+    rng = np.random.default_rng(seed)
+    tile = 50
+    values = rng.uniform(-1, 1, (height // tile + 1, width // tile + 1))
+    v = np.kron(values, np.ones((tile, tile)))[:height, :width]
+    rgb = np.zeros((height, width, 3), dtype=np.uint8)
+    rgb[..., 0] = np.where(v < 0, -v * 220, 40)
+    rgb[..., 1] = np.where(v < 0, 40, v * 200)
+    rgb[..., 2] = np.where(v < 0, 50, 70)
+    rgb[::tile, :] = rgb[:, ::tile] = 22
+    buf = io.BytesIO()
+    Image.fromarray(rgb).save(buf, format='PNG')
+    return buf.getvalue()
+
+
+def child(method, shot_path, repeat):
+    """새 프로세스에서 한 방식만 측정 → JSON 출력"""
+    func = tempfile_matplotlib if method == 'tempfile_matplotlib' else render_market_map_png
+    with open(shot_path, 'rb') as f:
+        screenshot = f.read()
+    # 라이브러리 import 는 측정에서 제외
+    import matplotlib.figure, matplotlib.image, PIL.Image, PIL.ImageDraw  # noqa: F401
+    base_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        png = func(screenshot)
+        samples.append(time.perf_counter() - t0)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'sec': statistics.median(samples), 'first_sec': samples[0],
+                      'peak_mb': (peak_kb - base_kb) / 1024, 'png_kb': len(png) / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--width', type=int, default=1200)
+    parser.add_argument('--height', type=int, default=700)
+    parser.add_argument('--child', choices=METHODS, help=argparse.SUPPRESS)
+    parser.add_argument('--shot', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child, args.shot, args.repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shot_path = os.path.join(tmp, 'shot.png')
+        with open(shot_path, 'wb') as f:
+            f.write(synthetic_screenshot(args.width, args.height))
+
+        print(f"{'방식':<22}{'중앙값(s)':>10}{'첫 실행(s)':>11}{'메모리 증가(MB)':>16}{'PNG(KB)':>9}")
+        result = {}
+        for method in METHODS:
+            proc = subprocess.run([sys.executable, '-m', 'tools.bench_map_compose', '--child', method,
+                                   '--shot', shot_path, '--repeat', str(args.repeat)],
+                                  cwd=ROOT, capture_output=True, text=True, check=True)
+            r = result[method] = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(f"{method:<22}{r['sec']:>10.3f}{r['first_sec']:>11.3f}{r['peak_mb']:>16.1f}{r['png_kb']:>9.0f}")
+
+    old, new = result['tempfile_matplotlib'], result['memory_pillow']
+    print(f"메모리 내 합성: {old['sec'] / new['sec']:.1f}배 빠름, 최대 메모리 증가 "
+          f"{old['peak_mb']:.1f}MB → {new['peak_mb']:.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+텔레그램 전송 방식 비교 (사진마다 sendPhoto vs 세션 재사용 + sendMediaGroup, 로컬 스텁 서버)
+
+    python -m tools.bench_notify [--images 4] [--latency 0.1] [--rate-limit 1]
+
+스텁 서버가 기록한 요청 수, 새 TCP 연결 수, 채팅 메시지 수, 소요 시간을 비교
+--rate-limit N: 새 방식의 처음 N개 요청을 429(retry_after=1)로 거절해 재시도 동작 확인
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import notifier
+from tools.telegram_stub import TelegramStub
+
+
+def synthetic_images(folder, count, size=1080):
+    from PIL import Image
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f'report_{i}.png')
+        tiles = rng.integers(0, 255, (size // 40, size // 40, 3), dtype=np.uint8)
+        Image.fromarray(np.kron(tiles, np.ones((40, 40, 1), dtype=np.uint8))).save(path)
+        paths.append(path)
+    return paths
+
+
+def legacy_send(base_url, token, chat_id, image_paths, caption):
+    """기존 방식: 사진마다 세션 없이 requests.post(sendPhoto)"""
+    import requests
+    url = f"{base_url}/bot{token}/sendPhoto"
+    for image_path in image_paths:
+        with open(image_path, 'rb') as image_file:
+            requests.post(url, files={'photo': image_file}, data={'chat_id': chat_id, 'caption': caption})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--images', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.1, help='스텁 서버 요청당 지연(초)')
+    parser.add_argument('--rate-limit', type=int, default=0)
+    args = parser.parse_args()
+
+    token, chat_id = 'TEST:TOKEN', '1234'
+    os.environ.update({'TELEGRAM_BOT_TOKEN': token, 'TELEGRAM_CHAT_ID': chat_id})
+    notifier.ENABLE_EMAIL, notifier.ENABLE_TELEGRAM = False, True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        notifier.USE_OUTBOX = False   # 같은 합성 이미지를 매번 보내므로 대기열의 중복 방지를 끔
+        paths = synthetic_images(tmp, args.images)
+        rows = []
+        for name in ('legacy', 'media_group'):
+            with TelegramStub(rate_limit=args.rate_limit if name == 'media_group' else 0,
+                              latency=args.latency) as stub:
+                t0 = time.perf_counter()
+                if name == 'legacy':
+                    legacy_send(stub.url, token, chat_id, paths, 'caption')
+                else:
+                    notifier.TELEGRAM_API_URL = stub.url
+                    notifier.notify(paths, subject='caption')
+                elapsed = time.perf_counter() - t0
+            ok = [c for c in stub.calls if c['status'] == 200]
+            rows.append((name, elapsed, len(stub.calls), stub.connections, len(ok),
+                         sum(c['photos'] for c in ok), sum(c['bytes'] for c in stub.calls) / 1024,
+                         ', '.join(f"{c['method']}:{c['status']}" for c in stub.calls)))
+
+    print(f"\n{'방식':<13}{'시간(s)':>8}{'요청':>6}{'연결':>6}{'메시지':>7}{'사진':>6}{'전송(KB)':>10}  요청 기록")
+    for name, elapsed, calls, conns, msgs, photos, kb, log in rows:
+        print(f"{name:<13}{elapsed:>8.2f}{calls:>6}{conns:>6}{msgs:>7}{photos:>6}{kb:>10.0f}  {log}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+전송 대기열(outbox) 동작 확인 (로컬 텔레그램/SMTP 스텁 서버, 오프라인)
+
+    python -m tools.bench_outbox [--chats 5] [--emails 3] [--images 4] [--fail 2]
+
+  ① notify: 텔레그램 채팅방 --fail 곳과 SMTP 서버가 죽은 상태로 전송 → 일부만 성공, 나머지는 대기
+  ② flush: 장애가 풀린 뒤 대기 항목만 재전송 (렌더링 없음, 텔레그램은 저장된 file_id 로 업로드 없이)
+  ③ 같은 리포트를 다시 notify / flush → 이미 보낸 곳에는 요청 0건 (내용 해시로 중복 방지)
+단계마다 요청 수, 업로드 전송량, 소요 시간, 대기열 상태를 출력
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import notifier
+import outbox
+from tools.bench_notify import synthetic_images
+from tools.smtp_stub import SMTPStub
+from tools.telegram_stub import TelegramStub
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--chats', type=int, default=5)
+    parser.add_argument('--emails', type=int, default=3)
+    parser.add_argument('--images', type=int, default=4)
+    parser.add_argument('--fail', type=int, default=2, help='처음에 403 으로 거절할 채팅방 수')
+    args = parser.parse_args()
+
+    chat_ids = [str(1000 + i) for i in range(args.chats)]
+    recipients = [f'user{i}@example.com' for i in range(args.emails)]
+    os.environ.update({'TELEGRAM_BOT_TOKEN': 'TEST:TOKEN', 'TELEGRAM_CHAT_ID': ','.join(chat_ids),
+                       'SENDER_EMAIL': 'bot@example.com', 'APP_PASSWORD': 'secret',
+                       'RECEIVER_EMAIL': ','.join(recipients)})
+    notifier.ENABLE_TELEGRAM = notifier.ENABLE_EMAIL = True
+    notifier.SEND_RETRIES = 0
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp, TelegramStub(fail_chats=chat_ids[:args.fail]) as stub:
+        outbox.OUTBOX_FILE = os.path.join(tmp, 'outbox.sqlite')
+        notifier.TELEGRAM_API_URL = stub.url
+        paths = synthetic_images(tmp, args.images)
+        smtp = SMTPStub().__enter__()
+        dead_port = smtp.port
+        smtp.__exit__()   # 닫힌 포트 → 이메일 연결 실패
+
+        def step(name, run):
+            calls, mails = len(stub.calls), len(smtp.messages)
+            notifier.SMTP_HOST, notifier.SMTP_PORT = '127.0.0.1', port
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = run()
+            elapsed = time.perf_counter() - t0
+            new = stub.calls[calls:]
+            box = outbox.Outbox()
+            rows.append((name, result, elapsed, len(new), sum(c['uploads'] for c in new),
+                         sum(c['bytes'] for c in new) / 1024, len(smtp.messages) - mails, box.summary()))
+            box.close()
+
+        port = dead_port
+        step('① notify (장애 중)', lambda: notifier.notify(paths, 'caption', 'body'))
+        stub.fail_chats.clear()
+        smtp = SMTPStub().__enter__()
+        port = smtp.port
+        step('② flush (복구 후)', lambda: notifier.flush())
+        step('③ 같은 리포트 notify', lambda: notifier.notify(paths, 'caption', 'body'))
+        step('③ flush 다시', lambda: notifier.flush())
+        smtp.__exit__()
+
+    print(f"{'단계':<20}{'시간(s)':>8}{'텔레그램 요청':>12}{'업로드':>7}{'전송(KB)':>10}{'메일':>6}  결과 / 대기열 상태")
+    for name, result, elapsed, calls, uploads, kb, mails, summary in rows:
+        print(f"{name:<20}{elapsed:>8.2f}{calls:>12}{uploads:>7}{kb:>10.0f}{mails:>6}  {result} / {summary}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+ROLLING 백테스트 엔진 비교 (합성 일봉, 오프라인)
+
+    python -m tools.bench_rolling [--years 1 5 15] [--vol 0.04] [--legacy-max 15]
+
+  legacy: 시작일마다 simulate_one_cycle (전체 DataFrame 재필터링 + iterrows)
+  array : run_rolling (배열 한 번 변환 + 정수 offset)
+두 결과(Start/End/Days/Profit/Return/Status)가 완전히 같은지 확인하고 소요 시간과 배속을 출력
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import pandas as pd
+
+from simul_limit_strategy import TOTAL_SEED, run_rolling, simulate_one_cycle
+from tools.synthetic import make_ohlcv
+
+
+def legacy_rolling(df, start, end, seed):
+    """기존 run_rolling: 시작일마다 simulate_one_cycle"""
+    df_range = df[(df.index >= start) & (df.index <= end)]
+    results = [simulate_one_cycle(df, start_date, seed) for start_date in df_range.index]
+    return pd.DataFrame([res for res in results if res])
+
+
+def leveraged_ohlcv(years, vol, seed=0):
+    """3배 레버리지 ETF 정도의 변동성을 가진 합성 일봉 (뒤쪽에 사이클이 끝날 여유 100일)"""
+    end = pd.Timestamp('2024-12-31')
+    start = end - pd.DateOffset(years=years)
+    df = make_ohlcv('TQQQ', start, end + pd.Timedelta(days=100), seed=seed)
+    ret = df['Close'].pct_change().fillna(0) * (vol / 0.02)
+    scale = (1 + ret).cumprod() / (df['Close'] / df['Close'].iloc[0])
+    return df.mul(scale, axis=0).assign(Volume=df['Volume']), start, end
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--years', type=int, nargs='+', default=[1, 5, 15])
+    parser.add_argument('--vol', type=float, default=0.04, help='일간 변동성')
+    parser.add_argument('--legacy-max', type=int, default=15, help='이보다 긴 기간은 legacy 를 건너뜀')
+    args = parser.parse_args()
+
+    print(f"{'기간':>5}{'시작일':>8}{'legacy(s)':>11}{'array(s)':>10}{'배속':>8}  결과 동일")
+    for years in args.years:
+        df, start, end = leveraged_ohlcv(years, args.vol)
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            new = run_rolling(df, start, end, TOTAL_SEED)
+            t_new = time.perf_counter() - t0
+            if years <= args.legacy_max:
+                t0 = time.perf_counter()
+                old = legacy_rolling(df, start, end, TOTAL_SEED)
+                t_old = time.perf_counter() - t0
+        starts = int(((df.index >= start) & (df.index <= end)).sum())
+        if years > args.legacy_max:
+            print(f"{years:>4}y{starts:>8}{'-':>11}{t_new:>10.3f}{'-':>8}  -")
+            continue
+        same = old.equals(new) and list(old.columns) == list(new.columns)
+        print(f"{years:>4}y{starts:>8}{t_old:>11.2f}{t_new:>10.3f}{t_old / t_new:>7.0f}x  {same} "
+              f"({len(new)}건, 익절 {int((new['Status'] == 'Success').sum())}건)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+시장 심리 이미지 렌더링 벤치마크 (매번 전체 그리기 vs 캐시된 정적 배경 + 동적 레이어)
+
+    python -m tools.bench_sentiment [--repeat 10] [--trend]
+
+같은 값으로 두 방식의 소요 시간(중앙값)을 비교하고, 두 결과 PNG 의 픽셀 차이를 출력
+--trend: 하단 1년 추이 그래프까지 포함 (두 방식 모두 매번 그리는 부분)
+"""
+import argparse
+import io
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+import monitor_sentiment
+from monitor_sentiment import render_sentiment_png
+
+FG = {'score': 62.3, 'rating': 'greed', 'prev_score': 58.1, 'prev_rating': 'greed', 'cached': False}
+VIX = {'current': 17.2, 'change': -0.5, 'pct': -2.8}
+
+
+def synthetic_trend(days=250, seed=0):
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=days)
+    return pd.DataFrame({'fg': np.clip(50 + np.cumsum(rng.normal(0, 3, days)), 2, 98),
+                         'vix': np.clip(17 + np.cumsum(rng.normal(0, 0.6, days)), 10, 45)}, index=index)
+
+
+def timed(repeat, **kw):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        png = render_sentiment_png(FG, VIX, **kw)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples), png
+
+
+def pixels(png):
+    from PIL import Image
+    return np.asarray(Image.open(io.BytesIO(png)).convert('RGB')).astype(int)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--trend', action='store_true')
+    args = parser.parse_args()
+    trend = synthetic_trend() if args.trend else None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        monitor_sentiment.TEMPLATE_DIR = tmp
+        render_sentiment_png(FG, VIX, trend, template=False)  # 글꼴 로딩 등 첫 실행 비용 제외
+
+        full_sec, full_png = timed(args.repeat, trend=trend, template=False)
+        t0 = time.perf_counter()
+        monitor_sentiment.static_background(monitor_sentiment.TREND_SPACE if args.trend else 0, True, True)
+        build_sec = time.perf_counter() - t0
+        monitor_sentiment._templates.clear()
+        t0 = time.perf_counter()
+        render_sentiment_png(FG, VIX, trend, template=True)  # 디스크 캐시에서 읽어 오는 첫 실행
+        disk_sec = time.perf_counter() - t0
+        cached_sec, cached_png = timed(args.repeat, trend=trend, template=True)
+
+    a, b = pixels(full_png), pixels(cached_png)
+    diff = np.abs(a - b)
+    print(f"{'방식':<26}{'시간(s)':>9}")
+    print(f"{'전체 그리기':<26}{full_sec:>9.3f}")
+    print(f"{'배경 템플릿 생성(1회)':<26}{build_sec:>9.3f}")
+    print(f"{'템플릿 사용(디스크 캐시)':<26}{disk_sec:>9.3f}")
+    print(f"{'템플릿 사용(메모리 캐시)':<26}{cached_sec:>9.3f}")
+    print(f"템플릿 사용 시 {full_sec / cached_sec:.1f}배 빠름 / 크기 {a.shape[1]}x{a.shape[0]} vs {b.shape[1]}x{b.shape[0]}, "
+          f"픽셀 차이 평균 {diff.mean():.3f} 최대 {diff.max()} (차이 나는 픽셀 {(diff.max(axis=2) > 8).mean() * 100:.2f}%)")
+
+
+if __name__ == '__main__':
+    main()
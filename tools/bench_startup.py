@@ -0,0 +1,105 @@
+"""
+리포트 진입점 import 시간 벤치마크 (python -X importtime 기반)
+
+    python -m tools.bench_startup                       # 측정만
+    python -m tools.bench_startup --save startup.json   # 기준값 저장
+    python -m tools.bench_startup --compare startup.json [--tolerance 0.3]
+
+cold: 저장소의 __pycache__ 를 지운 직후 첫 실행 (바이트코드 재컴파일 포함)
+warm: 이어서 --runs 회 반복 실행한 값의 중앙값
+--compare 시 warm 값이 기준보다 tolerance 비율 이상 느려지면 종료코드 1
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+
+ENTRY_POINTS = ['monitor_stock', 'monitor_index', 'monitor_sentiment', 'monitor_map',
+                'report_pipeline', 'notifier']
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def clear_pycache():
+    for dirpath, dirnames, _ in os.walk(ROOT):
+        if '__pycache__' in dirnames:
+            shutil.rmtree(os.path.join(dirpath, '__pycache__'), ignore_errors=True)
+            dirnames.remove('__pycache__')
+
+
+def import_time(module):
+    """모듈 하나를 새 인터프리터에서 import → (전체 ms, [(누적 ms, 모듈명)])"""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative) / 1000, name.rstrip()))
+    # importtime 은 자식 모듈을 부모보다 먼저 출력하고, 깊이마다 2칸씩 들여씀
+    # → 마지막 줄이 대상 모듈, 그 직전 최상위 줄 이후의 깊이 1 줄들이 직접 import 한 모듈
+    total = rows[-1][0]
+    children = []
+    for ms, name in reversed(rows[:-1]):
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append((ms, name.strip()))
+    return total, sorted(children, reverse=True)
+
+
+def measure(runs):
+    result = {}
+    for module in ENTRY_POINTS:
+        clear_pycache()
+        cold, _ = import_time(module)
+        samples = [import_time(module) for _ in range(runs)]
+        warm = statistics.median(total for total, _ in samples)
+        heavy = [f"{name}({ms:.0f})" for ms, name in samples[-1][1][:3]]
+        result[module] = {'cold_ms': round(cold, 1), 'warm_ms': round(warm, 1), 'heaviest': heavy}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--save')
+    parser.add_argument('--compare')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='허용 증가 비율 (0.3 = 30%%)')
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    print(f"{'모듈':<20}{'cold(ms)':>10}{'warm(ms)':>10}{'기준(ms)':>10}  무거운 import")
+    regressed = []
+    for module, r in result.items():
+        base = baseline.get(module, {}).get('warm_ms')
+        mark = ''
+        # 수 ms 수준의 흔들림은 무시
+        if base is not None and r['warm_ms'] > max(base * (1 + args.tolerance), base + 5):
+            regressed.append(module)
+            mark = ' ▲'
+        base_str = f"{base:.1f}" if base is not None else '-'
+        print(f"{module:<20}{r['cold_ms']:>10.1f}{r['warm_ms']:>10.1f}{base_str:>10}  {', '.join(r['heaviest'])}{mark}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(result, f, indent=1)
+        print(f"기준값 저장: {args.save}")
+    if regressed:
+        print(f"import 시간 증가: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+파라미터 스윕 처리량 비교 (합성 일봉, 오프라인)
+
+    python -m tools.bench_sweep [--years 5] [--workers 1 2 4] [--grid full|small]
+
+같은 격자를 워커 수만 바꿔 실행하고 runs/s, 배속, 결과 동일 여부, 상위 5개 조합을 출력
+기본 파라미터 조합의 승률이 run_rolling 결과와 같은지도 확인
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+
+from simul_limit_strategy import DEFAULT_PARAMS, SWEEP_GRID, TOTAL_SEED, run_rolling, run_sweep
+from tools.bench_rolling import leveraged_ohlcv
+
+SMALL_GRID = {'splits': [30, 40], 'avg_buy_ratio': [0.3, 0.5, 0.7], 'soul_sell': [0.25, 0.5]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--vol', type=float, default=0.04)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, os.cpu_count() or 1])
+    parser.add_argument('--grid', choices=['full', 'small'], default='full')
+    args = parser.parse_args()
+
+    grid = SWEEP_GRID if args.grid == 'full' else SMALL_GRID
+    df, start, end = leveraged_ohlcv(args.years, args.vol)
+    rows, tables = [], []
+    for workers in dict.fromkeys(args.workers):
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            table = run_sweep(df, start, end, TOTAL_SEED, grid, workers=workers)
+            elapsed = time.perf_counter() - t0
+        tables.append(table)
+        rows.append((workers, elapsed, len(table) / elapsed))
+
+    base = rows[0][1]
+    print(f"CPU {os.cpu_count()}개, {args.years}년, 조합 {len(tables[0])}개")
+    print(f"{'워커':>4}{'시간(s)':>9}{'runs/s':>9}{'배속':>7}  결과 동일")
+    for (workers, elapsed, rate), table in zip(rows, tables):
+        print(f"{workers:>4}{elapsed:>9.2f}{rate:>9.1f}{base / elapsed:>6.1f}x  {table.equals(tables[0])}")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        rolling = run_rolling(df, start, end, TOTAL_SEED)
+    default = tables[0]
+    default = default[(default['splits'] == DEFAULT_PARAMS.splits) & (default['profit_tiers'] == '10/7/3')
+                      & (default['tier_days'] == '20/30') & (default['avg_buy_ratio'] == DEFAULT_PARAMS.avg_buy_ratio)
+                      & (default['soul_sell'] == DEFAULT_PARAMS.soul_sell)]
+    if len(default):
+        win_rate = round((rolling['Status'] == 'Success').mean() * 100, 2)
+        print(f"기본 파라미터 승률: 스윕 {default['WinRate(%)'].iloc[0]}% / run_rolling {win_rate}% "
+              f"(순위 {default['Rank'].iloc[0]})")
+    print("\n--- 상위 5개 조합 ---")
+    print(tables[0].head(5).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+표 이미지 렌더러 비교 벤치마크 (matplotlib ax.table vs Pillow 직접 그리기)
+
+    python -m tools.bench_table [--rows 30 300] [--repeat 3] [--out bench_out]
+
+무작위 지표로 종목 레코드/표(TableSpec)를 만든 뒤, 같은 표를 두 백엔드로 그린 시간(중앙값)을 비교
+--out 을 주면 크기/백엔드별 결과 이미지를 저장
+"""
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from indicators import INDICATOR_COLUMNS
+from monitor_stock import build_stock_table, stock_records
+from plot_style import write_png
+from table_render import BACKENDS, render_table
+
+
+def synthetic_indicators(n, seed=0):
+    """티커 n개짜리 무작위 지표 결과 (compute_indicators 와 같은 컬럼)"""
+    rng = np.random.default_rng(seed)
+    price = rng.uniform(10, 2000, n)
+    ind = pd.DataFrame({
+        'price': price,
+        'price_date': pd.Timestamp.now().normalize(),
+        'day_change': rng.normal(0, 2, n),
+        'rsi_14': rng.uniform(10, 90, n),
+        'avg_20': price * rng.uniform(0.9, 1.1, n),
+        'avg_60': price * rng.uniform(0.85, 1.15, n),
+        'mdd': -rng.uniform(0, 60, n),
+        'mdd_20': -rng.uniform(0, 20, n),
+        'ytd': rng.normal(5, 30, n),
+        'avg_mdd': -rng.uniform(5, 50, n),
+    }, index=[f"T{i:03d}" for i in range(n)])
+    return ind[INDICATOR_COLUMNS]
+
+
+def synthetic_groups(tickers):
+    colors = ["#E6F4FA", "#E9F9F0", "#FFF4E6"]
+    chunk = -(-len(tickers) // len(colors))
+    return [{'name': f'그룹{i}', 'tickers': tickers[i * chunk:(i + 1) * chunk], 'color': color}
+            for i, color in enumerate(colors)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, nargs='+', default=[30, 300])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', help='결과 이미지를 저장할 디렉토리')
+    args = parser.parse_args()
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    print(f"{'행 수':>6}  {'백엔드':<12}{'중앙값(s)':>10}{'PNG(KB)':>10}")
+    for n in args.rows:
+        ind = synthetic_indicators(n)
+        groups = synthetic_groups(list(ind.index))
+        with contextlib.redirect_stdout(io.StringIO()):  # 마크다운 표 출력 생략
+            spec = build_stock_table(stock_records(ind, groups), groups)
+
+        medians = {}
+        for backend in BACKENDS:
+            render_table(spec, backend)  # 글꼴 로딩 등 첫 실행 비용 제외
+            samples = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                png = render_table(spec, backend)
+                samples.append(time.perf_counter() - t0)
+            medians[backend] = statistics.median(samples)
+            print(f"{n:>6}  {backend:<12}{medians[backend]:>10.3f}{len(png) / 1024:>10.0f}")
+            if args.out:
+                write_png(png, os.path.join(args.out, f"table_{n}_{backend}.png"))
+        print(f"{n:>6}  pillow 가 matplotlib 대비 {medians['matplotlib'] / medians['pillow']:.1f}배 빠름")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+브라우저 없이 그리는 섹터 히트맵 벤치마크 (캐시된 데이터 기준, 오프라인)
+
+    python -m tools.bench_treemap [--repeat 5] [--out treemap.png]
+
+구성종목 CSV 의 티커로 합성 종가/시가총액을 만든 뒤
+수익률 계산 → squarified 레이아웃 → 색 매핑 → 1080x1080 PNG 까지의 시간을 측정
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from market_treemap import load_constituents, treemap_data, render_treemap_png, squarify, return_colors
+from plot_style import write_png
+
+
+def synthetic_inputs(constituents, days=30, seed=0):
+    rng = np.random.default_rng(seed)
+    tickers = list(constituents['ticker'])
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=days)
+    steps = rng.normal(0, 0.015, (days, len(tickers)))
+    close = pd.DataFrame(100 * np.exp(np.cumsum(steps, axis=0)), index=index, columns=tickers)
+    caps = pd.Series(rng.lognormal(mean=25, sigma=1.0, size=len(tickers)), index=tickers)
+    return close, caps
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--out', help='결과 이미지 저장 경로')
+    args = parser.parse_args()
+
+    constituents = load_constituents()
+    close, caps = synthetic_inputs(constituents)
+    render_treemap_png(treemap_data(close, constituents, 1, caps))  # 글꼴 로딩 등 첫 실행 비용 제외
+
+    steps = {'수익률/입력': [], '레이아웃': [], '색 매핑': [], '전체(PNG)': []}
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        data = treemap_data(close, constituents, 1, caps)
+        t1 = time.perf_counter()
+        squarify(sorted(data['cap'], reverse=True), 0, 0, 1072, 990)
+        t2 = time.perf_counter()
+        return_colors(data['ret'].to_numpy())
+        t3 = time.perf_counter()
+        png = render_treemap_png(data)
+        t4 = time.perf_counter()
+        steps['수익률/입력'].append(t1 - t0)
+        steps['레이아웃'].append(t2 - t1)
+        steps['색 매핑'].append(t3 - t2)
+        steps['전체(PNG)'].append(t4 - t3 + t1 - t0)
+
+    print(f"종목 {len(data)}개, 섹터 {data['sector'].nunique()}개")
+    for name, samples in steps.items():
+        print(f"  {name:<10} {statistics.median(samples) * 1000:8.1f} ms")
+    if args.out:
+        write_png(png, args.out)
+        print(f"이미지 저장: {args.out}")
+
+
+if __name__ == '__main__':
+    main()
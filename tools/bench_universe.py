@@ -0,0 +1,69 @@
+"""
+여러 종목 백테스트(UNIVERSE) 처리량 비교 (합성 일봉, 오프라인)
+
+    python -m tools.bench_universe [--years 10] [--tickers 8] [--workers 1 2 4]
+
+종목 수만큼 합성 일봉을 만들어 같은 리더보드를 워커 수만 바꿔 실행하고
+소요 시간, 배속, 병렬 효율(종목별 소요 합계 / (전체 시간 x 워커)), 리더보드/상세 CSV 동일 여부를 출력
+"""
+import argparse
+import contextlib
+import filecmp
+import io
+import os
+import tempfile
+import time
+
+from simul_limit_strategy import UNIVERSE, run_universe
+from tools.bench_rolling import leveraged_ohlcv
+
+
+def universe_frames(years, vol, count):
+    """UNIVERSE 앞쪽 종목 이름으로 종목마다 다른 합성 일봉 (원화 종목은 가격 x 1000)"""
+    tickers = (UNIVERSE * (count // len(UNIVERSE) + 1))[:count]
+    tickers = [t if i < len(UNIVERSE) else f"{t}_{i}" for i, t in enumerate(tickers)]
+    frames = {}
+    for i, ticker in enumerate(tickers):
+        df, start, end = leveraged_ohlcv(years, vol, seed=i)
+        if '.KS' in ticker:
+            df = df.mul(1000).assign(Volume=df['Volume'])
+        frames[ticker] = df
+    return frames, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--vol', type=float, default=0.04)
+    parser.add_argument('--tickers', type=int, default=len(UNIVERSE), help='종목 수')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    frames, start, end = universe_frames(args.years, args.vol, args.tickers)
+    with tempfile.TemporaryDirectory() as tmp:
+        rows, boards, dirs = [], [], []
+        for workers in dict.fromkeys(args.workers):
+            output_dir = os.path.join(tmp, f"w{workers}")
+            with contextlib.redirect_stdout(io.StringIO()):
+                t0 = time.perf_counter()
+                board = run_universe(list(frames), start, end, workers=workers, output_dir=output_dir, frames=frames)
+                elapsed = time.perf_counter() - t0
+            boards.append(board.drop(columns=['Sec']))
+            dirs.append(output_dir)
+            rows.append((workers, elapsed, board['Sec'].sum()))
+
+        files = sorted(os.listdir(dirs[0]))
+        base = rows[0][1]
+        print(f"CPU {os.cpu_count()}개, {args.years}년, 종목 {len(frames)}개")
+        print(f"{'워커':>4}{'시간(s)':>9}{'배속':>7}{'효율':>7}  결과 동일")
+        for (workers, elapsed, serial), board, output_dir in zip(rows, boards, dirs):
+            _, mismatch, errors = filecmp.cmpfiles(dirs[0], output_dir, files, shallow=False)
+            same = board.equals(boards[0]) and not mismatch and not errors
+            print(f"{workers:>4}{elapsed:>9.2f}{base / elapsed:>6.1f}x{serial / (elapsed * workers) * 100:>6.0f}%  {same}")
+
+    print("\n--- 리더보드 ---")
+    print(boards[0].to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
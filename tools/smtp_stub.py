@@ -0,0 +1,87 @@
+"""
+최소 SMTP 로컬 스텁 서버 (요청 기록용, 오프라인, STARTTLS 없음)
+
+    with SMTPStub() as stub:
+        notifier.SMTP_HOST, notifier.SMTP_PORT = '127.0.0.1', stub.port
+        ...
+        stub.connections  # 새로 맺어진 연결 수
+        stub.messages     # [{'conn', 'from', 'to', 'bytes'}]
+"""
+import base64
+import socketserver
+import threading
+
+
+class SMTPStub:
+    def __init__(self):
+        self.connections = 0
+        self.logins = 0
+        self.messages = []
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def __enter__(self):
+        self._server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(line.encode() + b'\r\n')
+
+            def handle(self):
+                with stub._lock:
+                    stub.connections += 1
+                    conn = stub.connections
+                self.reply('220 stub ESMTP')
+                sender, rcpts = None, []
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        return
+                    cmd = line.decode(errors='replace').strip()
+                    verb = cmd.split(' ', 1)[0].upper()
+                    if verb in ('EHLO', 'HELO'):
+                        self.wfile.write(b'250-stub\r\n250-AUTH PLAIN\r\n250 SIZE 52428800\r\n')
+                    elif verb == 'AUTH':
+                        base64.b64decode(cmd.split()[-1])
+                        with stub._lock:
+                            stub.logins += 1
+                        self.reply('235 2.7.0 Accepted')
+                    elif verb == 'MAIL':
+                        sender, rcpts = cmd.split(':', 1)[1].strip(' <>'), []
+                        self.reply('250 OK')
+                    elif verb == 'RCPT':
+                        rcpts.append(cmd.split(':', 1)[1].strip(' <>'))
+                        self.reply('250 OK')
+                    elif verb == 'DATA':
+                        self.reply('354 End data with <CR><LF>.<CR><LF>')
+                        size = 0
+                        for data in iter(self.rfile.readline, b''):
+                            if data == b'.\r\n':
+                                break
+                            size += len(data)
+                        with stub._lock:
+                            stub.messages.append({'conn': conn, 'from': sender, 'to': rcpts, 'bytes': size})
+                        self.reply('250 OK queued')
+                    elif verb in ('RSET', 'NOOP'):
+                        self.reply('250 OK')
+                    elif verb == 'QUIT':
+                        self.reply('221 Bye')
+                        return
+                    else:
+                        self.reply('502 Command not implemented')
+
+        return Handler
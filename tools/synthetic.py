@@ -0,0 +1,45 @@
+"""
+오프라인 벤치마크용 가짜 OHLCV fixture 생성기
+- 미국 티커: 평일 달력, .KS 티커: 평일에서 일부 날짜를 빼서 KRX 휴장일을 흉내
+"""
+import json
+import os
+import zlib
+import numpy as np
+import pandas as pd
+
+
+def make_ohlcv(ticker, start='2000-01-01', end=None, seed=None):
+    """랜덤워크 기반의 재현 가능한 일봉 데이터 생성"""
+    end = end or pd.Timestamp.now().normalize()
+    dates = pd.bdate_range(start, end)
+    rng = np.random.default_rng(zlib.crc32(ticker.encode()) if seed is None else seed)
+    if ticker.endswith('.KS'):
+        dates = dates[rng.random(len(dates)) > 0.04]
+
+    ret = rng.normal(0.0004, 0.02, len(dates))
+    close = 100 * np.exp(np.cumsum(ret))
+    open_ = close * (1 + rng.normal(0, 0.005, len(dates)))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, len(dates))))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, len(dates))))
+    volume = rng.integers(1_000_000, 50_000_000, len(dates))
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low,
+                         'Close': close, 'Volume': volume}, index=dates.rename('Date'))
+
+
+def make_meta(ticker):
+    """ticker_meta 필드 모양의 재현 가능한 가짜 메타데이터 (시가총액 맵용 상장주식수 포함)"""
+    rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+    shares = int(rng.lognormal(mean=20.5, sigma=1.0))
+    return {'shortName': ticker, 'longName': ticker, 'currency': 'KRW' if ticker.endswith('.KS') else 'USD',
+            'exchange': 'KSC' if ticker.endswith('.KS') else 'NMS', 'sharesOutstanding': shares, 'marketCap': None}
+
+
+def write_fixtures(fixture_dir, tickers, start='2000-01-01', end=None):
+    """티커마다 fixture_dir/<티커>.csv 생성 + fixture_dir/ticker_meta.json (FixtureSource.info 용)"""
+    os.makedirs(fixture_dir, exist_ok=True)
+    for ticker in tickers:
+        make_ohlcv(ticker, start, end).to_csv(os.path.join(fixture_dir, f"{ticker}.csv"))
+    with open(os.path.join(fixture_dir, 'ticker_meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({ticker: make_meta(ticker) for ticker in tickers}, f, indent=1)
+    return fixture_dir
@@ -0,0 +1,144 @@
+"""
+텔레그램 Bot API 로컬 스텁 서버 (요청 기록용, 오프라인)
+
+    with TelegramStub(rate_limit=1, retry_after=1) as stub:
+        notifier.TELEGRAM_API_URL = stub.url
+        ...
+        stub.calls        # [{'method', 'chat_id', 'photos', 'uploads', 'bytes', 'conn', ...}]
+        stub.connections  # 새로 맺어진 TCP 연결 수 (연결 재사용 확인용)
+
+sendPhoto / sendMediaGroup / sendMessage 만 흉내 내며, 업로드한 사진마다 file_id 를 발급해 응답에 담음
+"""
+import itertools
+import json
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class TelegramStub:
+    """rate_limit: 처음 N개 요청은 429 + retry_after 로 거절 / latency: 요청마다 지연(초)
+    fail_chats: 이 채팅방으로 가는 요청은 403 으로 거절 (실행 중에 비우면 다시 성공)
+    fail_after: {채팅방: n} - 그 채팅방은 처음 n개 요청만 받고 이후는 403 (앨범 중간 실패 흉내, 키를 지우면 다시 성공)
+    """
+
+    def __init__(self, rate_limit=0, retry_after=1, latency=0.0, fail_chats=(), fail_after=None):
+        self.rate_limit = rate_limit
+        self.fail_chats = set(fail_chats)
+        self.fail_after = dict(fail_after or {})
+        self.retry_after = retry_after
+        self.latency = latency
+        self.calls = []
+        self.connections = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self._server.server_port}'
+
+    def __enter__(self):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def methods(self):
+        return [c['method'] for c in self.calls]
+
+    # ── 요청 처리 ────────────────────────────────────────────
+    def _parse_form(self, content_type, body):
+        """multipart/form-data 또는 urlencoded 본문 → (필드 dict, 업로드 파일 dict)"""
+        fields, uploads = {}, {}
+        if content_type.startswith('multipart/'):
+            msg = BytesParser(policy=default_policy).parsebytes(
+                f'Content-Type: {content_type}\r\n\r\n'.encode() + body)
+            for part in msg.iter_parts():
+                name = part.get_param('name', header='content-disposition')
+                if part.get_filename():
+                    uploads[name] = part.get_payload(decode=True)
+                else:
+                    fields[name] = part.get_content()
+        else:
+            from urllib.parse import parse_qsl
+            fields = dict(parse_qsl(body.decode()))
+        return fields, uploads
+
+    def _photo_message(self, chat_id, photo, uploads):
+        """photo 가 attach:// 업로드면 새 file_id 발급, 아니면 보낸 file_id 를 그대로 돌려줌"""
+        name = photo[len('attach://'):] if photo.startswith('attach://') else photo
+        file_id = f'file{next(self._ids)}' if name in uploads else photo
+        return {'message_id': next(self._ids), 'chat': {'id': chat_id},
+                'photo': [{'file_id': file_id, 'file_size': len(uploads.get(name, b''))}]}
+
+    def _respond(self, method, fields, uploads):
+        chat_id = fields.get('chat_id')
+        if method == 'sendPhoto':
+            photo = 'attach://photo' if 'photo' in uploads else fields.get('photo', '')
+            return self._photo_message(chat_id, photo, uploads)
+        if method == 'sendMediaGroup':
+            return [self._photo_message(chat_id, m['media'], uploads) for m in json.loads(fields['media'])]
+        if method == 'sendMessage':
+            return {'message_id': next(self._ids), 'chat': {'id': chat_id}, 'text': fields.get('text')}
+        return None
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'   # keep-alive: 세션이 연결을 재사용하는지 확인할 수 있게
+
+            def log_message(self, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                time.sleep(stub.latency)
+                method = self.path.rsplit('/', 1)[-1]
+                fields, uploads = stub._parse_form(self.headers.get('Content-Type', ''), body)
+                with stub._lock:
+                    limited = stub.rate_limit > 0
+                    if limited:
+                        stub.rate_limit -= 1
+                    chat_id = fields.get('chat_id')
+                    blocked = not limited and chat_id in stub.fail_chats
+                    if not limited and chat_id in stub.fail_after:
+                        blocked = blocked or stub.fail_after[chat_id] <= 0
+                        stub.fail_after[chat_id] -= 1
+                    call = {'method': method, 'chat_id': fields.get('chat_id'), 'fields': fields,
+                            'uploads': len(uploads), 'bytes': len(body), 'conn': id(self.connection),
+                            'status': 429 if limited else 403 if blocked else 200, 'at': time.perf_counter()}
+                    call['photos'] = len(json.loads(fields['media'])) if 'media' in fields else int(method == 'sendPhoto')
+                    stub.calls.append(call)
+                    result = None if limited or blocked else stub._respond(method, fields, uploads)
+                if blocked:
+                    return self._reply(403, {'ok': False, 'error_code': 403,
+                                             'description': 'Forbidden: bot was blocked by the user'})
+                if limited:
+                    return self._reply(429, {'ok': False, 'error_code': 429,
+                                             'description': 'Too Many Requests: retry later',
+                                             'parameters': {'retry_after': stub.retry_after}})
+                if result is None:
+                    return self._reply(404, {'ok': False, 'error_code': 404, 'description': 'Not Found'})
+                self._reply(200, {'ok': True, 'result': result})
+
+        return Handler
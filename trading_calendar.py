@@ -0,0 +1,80 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+# ==========================================
+# [설정] 거래소 휴장일 (네트워크 없이 판단하도록 저장소에 포함)
+# 주말은 따로 처리하므로 평일 휴장일만 적음 / 매년 말 다음 해 휴장일을 추가할 것
+# 목록이 없는 해는 평일을 모두 거래일로 봄 (리포트를 놓치지 않는 쪽으로)
+# ==========================================
+NYSE_HOLIDAYS = frozenset([
+    # 2025
+    '2025-01-01', '2025-01-09', '2025-01-20', '2025-02-17', '2025-04-18', '2025-05-26',
+    '2025-06-19', '2025-07-04', '2025-09-01', '2025-11-27', '2025-12-25',
+    # 2026
+    '2026-01-01', '2026-01-19', '2026-02-16', '2026-04-03', '2026-05-25', '2026-06-19',
+    '2026-07-03', '2026-09-07', '2026-11-26', '2026-12-25',
+    # 2027
+    '2027-01-01', '2027-01-18', '2027-02-15', '2027-03-26', '2027-05-31', '2027-06-18',
+    '2027-07-05', '2027-09-06', '2027-11-25', '2027-12-24',
+])
+
+KRX_HOLIDAYS = frozenset([
+    # 2025 (1/27 임시공휴일, 6/3 대통령 선거, 12/31 연말 휴장)
+    '2025-01-01', '2025-01-27', '2025-01-28', '2025-01-29', '2025-01-30', '2025-03-03',
+    '2025-05-01', '2025-05-05', '2025-05-06', '2025-06-03', '2025-06-06', '2025-08-15',
+    '2025-10-03', '2025-10-06', '2025-10-07', '2025-10-08', '2025-10-09', '2025-12-25',
+    '2025-12-31',
+    # 2026 (6/3 지방 선거)
+    '2026-01-01', '2026-02-16', '2026-02-17', '2026-02-18', '2026-03-02', '2026-05-01',
+    '2026-05-05', '2026-05-25', '2026-06-03', '2026-08-17', '2026-09-24', '2026-09-25',
+    '2026-09-28', '2026-10-05', '2026-10-09', '2026-12-25', '2026-12-31',
+    # 2027
+    '2027-01-01', '2027-02-08', '2027-02-09', '2027-03-01', '2027-05-05', '2027-05-13',
+    '2027-08-16', '2027-09-14', '2027-09-15', '2027-09-16', '2027-10-04', '2027-10-11',
+    '2027-12-27', '2027-12-31',
+])
+
+# 정규장 마감 시각 (조기 폐장일은 더 일찍 끝나므로 정규 마감 기준으로 봐도 늦게 판단할 뿐 틀리지 않음)
+MARKETS = {
+    'NYSE': {'tz': 'America/New_York', 'close': time(16, 0), 'holidays': NYSE_HOLIDAYS},
+    'KRX': {'tz': 'Asia/Seoul', 'close': time(15, 30), 'holidays': KRX_HOLIDAYS},
+}
+SETTLE_MINUTES = 30       # 장 마감 후 일봉이 데이터 소스에 반영될 때까지 기다리는 시간
+# ==========================================
+
+_COVERED_YEARS = {market: {int(d[:4]) for d in spec['holidays']} for market, spec in MARKETS.items()}
+_warned = set()
+
+
+def market_of(ticker):
+    """티커 → 거래소 ('KRX' | 'NYSE') - 한국 상장 종목/지수만 KRX, 나머지(미국 주식/지수/선물)는 NYSE 달력"""
+    return 'KRX' if ticker.endswith(('.KS', '.KQ')) or ticker in ('^KS11', '^KQ11') else 'NYSE'
+
+
+def is_trading_day(market, day):
+    if day.weekday() >= 5:
+        return False
+    if day.year not in _COVERED_YEARS[market] and (market, day.year) not in _warned:
+        _warned.add((market, day.year))
+        print(f"[거래일] {market} {day.year}년 휴장일 목록이 없습니다 → 평일은 모두 거래일로 봄 (trading_calendar.py 갱신 필요)")
+    return day.isoformat() not in MARKETS[market]['holidays']
+
+
+def last_session(market, now=None):
+    """now 시점에 마감(+반영 여유)까지 끝난 가장 최근 거래일"""
+    spec = MARKETS[market]
+    tz = ZoneInfo(spec['tz'])
+    now = (now or datetime.now(tz)).astimezone(tz)
+    day = now.date()
+    ready = (datetime.combine(day, spec['close'], tz) + timedelta(minutes=SETTLE_MINUTES)) <= now
+    if not ready:
+        day -= timedelta(days=1)
+    while not is_trading_day(market, day):
+        day -= timedelta(days=1)
+    return day
+
+
+def latest_sessions(now=None):
+    """→ {거래소: 'YYYY-MM-DD'} (마지막으로 끝난 거래일)"""
+    return {market: last_session(market, now).isoformat() for market in MARKETS}
+